@@ -0,0 +1,66 @@
+"""
+Benchmark: Candle Validation Throughput
+Compares the vectorized array validator with the per-candle dict loop it replaced,
+on a synthetic M5 backfill with a sprinkling of bad rows.
+
+Run: PYTHONPATH=. python benchmarks/bench_candle_validator.py [candles]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.validation.data_validator import DataValidator
+
+
+def make_candles(n, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 1.08 + np.cumsum(rng.normal(0, 1e-4, n))
+    open_ = np.r_[close[0], close[:-1]]
+    wick = np.abs(rng.normal(0, 5e-5, (2, n)))
+    high, low = np.maximum(open_, close) + wick[0], np.minimum(open_, close) - wick[1]
+    time_ = np.datetime64("2020-01-06T00:00") + np.arange(n) * np.timedelta64(5, "m")
+    bad = rng.choice(n, size=max(n // 10_000, 1), replace=False)
+    high[bad] = low[bad] - 1e-4
+    return open_, high, low, close, time_
+
+
+def loop_validate(o, h, l, c):
+    """The previous algorithm, without the early return (collect every bad row)."""
+    bad = []
+    for i in range(len(o)):
+        oi, hi, li, ci = o[i], h[i], l[i], c[i]
+        if not (li <= oi <= hi and li <= ci <= hi) or min(oi, hi, li, ci) <= 0:
+            bad.append(i)
+    return bad
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    o, h, l, c, t = make_candles(n)
+    print(f"Candles: {n:,}")
+
+    started = time.perf_counter()
+    mask, reasons = DataValidator.validate_candle_arrays(o, h, l, c, time=t, granularity="M5")
+    vec = time.perf_counter() - started
+    print(f"  Vectorized (all checks): {vec * 1000:8.1f} ms  {n / vec / 1e6:6.1f} M candles/s  "
+          f"({int(mask.sum())} bad rows)")
+
+    sample = min(n, 200_000)
+    ol, hl, ll, cl = (a[:sample].tolist() for a in (o, h, l, c))
+    started = time.perf_counter()
+    loop_bad = loop_validate(ol, hl, ll, cl)
+    loop = (time.perf_counter() - started) * n / sample
+    print(f"  Python loop (OHLC only): {loop * 1000:8.1f} ms  {n / loop / 1e6:6.1f} M candles/s  "
+          f"(extrapolated from {sample:,})")
+
+    vec_ohlc = np.flatnonzero(DataValidator.validate_candle_arrays(ol, hl, ll, cl, max_jump=None)[0])
+    assert vec_ohlc.tolist() == loop_bad, "vectorized and loop results differ"
+    print(f"  Speedup: {loop / vec:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
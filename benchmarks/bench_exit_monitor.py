@@ -0,0 +1,95 @@
+"""
+Benchmark: Exit Monitor Sweep with 10k Open Trades
+Compares the bulk close pipeline (column query + vectorized P&L + one executemany
+UPDATE) with the previous per-object ORM loop, on an SQLite database.
+
+Run: PYTHONPATH=. python benchmarks/bench_exit_monitor.py [open_trades] [closed_fraction]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from src.database import models
+from src.database.models import Trade, Base
+from src.monitoring.exit_monitor import TradeExitMonitor
+
+
+class FakeOandaClient:
+    """Every trade whose ID is in `closed` is reported closed at TP."""
+
+    def __init__(self, all_ids, closed):
+        self.open_ids = {tid: {} for tid in all_ids if tid not in closed}
+        self.closed = closed
+
+    def get_open_trades(self):
+        return self.open_ids
+
+    def get_trades_by_ids(self, trade_ids):
+        return {tid: {"state": "CLOSED", "averageClosePrice": 1.0890, "realizedPL": None}
+                for tid in trade_ids}
+
+
+def seed(engine, count):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(Trade.__table__.insert(), [
+            {"pair": "EUR_USD", "action": "BUY" if i % 2 else "SELL", "entry_price": 1.0850,
+             "stop_loss": 1.0830, "take_profit": 1.0890, "lot_size": 0.1, "status": "OPEN",
+             "oanda_trade_id": str(100000 + i), "reasoning_trace": ["[Strategist]: ..."] * 5}
+            for i in range(count)
+        ])
+
+
+def orm_loop(client):
+    """Previous approach: load ORM objects, compute and mutate one by one, commit."""
+    monitor = TradeExitMonitor(client=client)
+    db = models.SessionLocal()
+    open_trades = db.query(Trade).filter(Trade.status == "OPEN").all()
+    open_ids = client.get_open_trades()
+    closed = [t for t in open_trades if t.oanda_trade_id not in open_ids]
+    details = client.get_trades_by_ids([t.oanda_trade_id for t in closed])
+    for trade in closed:
+        exit_price = details[trade.oanda_trade_id]["averageClosePrice"]
+        trade.status = "CLOSED"
+        trade.exit_price = exit_price
+        trade.pnl = monitor.calculate_pnl(trade, exit_price)
+    db.commit()
+    db.close()
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"  {label:<22} {elapsed:8.1f} ms")
+    return elapsed
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    closed_fraction = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_exit.db")
+    engine = create_engine(f"sqlite:///{path}")
+    models.set_engine(engine)
+
+    ids = [str(100000 + i) for i in range(count)]
+    closed = set(ids[:int(count * closed_fraction)])
+    client = FakeOandaClient(ids, closed)
+
+    print(f"=== EXIT MONITOR SWEEP: {count} open trades, {len(closed)} closed ===")
+    seed(engine, count)
+    baseline = timed("Per-object ORM loop", lambda: orm_loop(client))
+
+    seed(engine, count)
+    bulk = timed("Bulk close pipeline", lambda: TradeExitMonitor(client=client).check_and_update_exits())
+
+    db = models.SessionLocal()
+    print(f"  Closed rows after bulk sweep: {db.query(Trade).filter(Trade.status == 'CLOSED').count()}")
+    db.close()
+    print(f"  Speedup: {baseline / bulk:.1f}x")
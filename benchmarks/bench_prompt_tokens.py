@@ -0,0 +1,67 @@
+"""
+Benchmark: Prompt Size of technical_indicators Payloads
+Compares the old Python-repr serialization with the compact prompt codec.
+
+Run: PYTHONPATH=. python benchmarks/bench_prompt_tokens.py
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.nodes.prompt_codec import compact_indicators, estimate_tokens
+
+
+def make_candles(count: int, start: float = 1.0850):
+    """Synthetic OANDA-style candles with RFC3339 timestamps and float noise."""
+    candles, price = [], start
+    for i in range(count):
+        o = price
+        c = o + random.uniform(-0.0008, 0.0008)
+        candles.append({
+            "time": f"2024-01-26T{i % 24:02d}:00:00.000000000Z",
+            "close": c,
+            "high": max(o, c) + random.uniform(0, 0.0004),
+            "low": min(o, c) - random.uniform(0, 0.0004),
+            "open": o,
+            "volume": random.randint(500, 5000),
+        })
+        price = c
+    return candles
+
+
+def live_payload():
+    """Payload as built by main.fetch_live_market_data."""
+    return {
+        "Mode": "Lightweight_calculated",
+        "H1_Trend": "BULLISH",
+        "H1_Momentum": "UP",
+        "Current_Price": 1.0852300000000001,
+        "H1_Close": 1.08501,
+        "H1_Low": 1.0801099999999999,
+        "H1_High": 1.0903,
+    }
+
+
+def payload_with_candles(count: int):
+    payload = live_payload()
+    payload["5M_Technicals"] = {"RSI": 28.417391304347826, "Candles": make_candles(count)}
+    return payload
+
+
+def report(name: str, payload):
+    before = str(payload)
+    after = compact_indicators(payload)
+    t_before, t_after = estimate_tokens(before), estimate_tokens(after)
+    saved = (1 - t_after / t_before) * 100
+    print(f"{name:<28} repr: {t_before:>5} tok  compact: {t_after:>5} tok  saved: {saved:5.1f}%")
+
+
+if __name__ == "__main__":
+    random.seed(7)
+    print("=== PROMPT TOKEN BENCHMARK (≈4 chars/token) ===")
+    report("Live payload", live_payload())
+    report("Live + 20 M5 candles", payload_with_candles(20))
+    report("Live + 100 M5 candles", payload_with_candles(100))
+    print("\nSample compact payload:\n" + compact_indicators(payload_with_candles(3)))
@@ -0,0 +1,75 @@
+"""
+Benchmark: Startup Import Time
+Runs `python -X importtime` for the agent and dashboard entry modules in a fresh
+interpreter and prints the total plus the heaviest top-level packages.
+
+Run: PYTHONPATH=. python benchmarks/bench_startup.py [module ...]
+"""
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+DEFAULT_TARGETS = [
+    "src.main",
+    "src.graph.graph",
+    "src.database.models",
+    "src.dashboard.auth",
+    "src.dashboard.dashboard",
+    "src.dashboard.views.admin",
+]
+
+TOP_N = 8
+
+
+def parse_importtime(stderr: str):
+    """
+    Parse `-X importtime` lines: 'import time: self [us] | cumulative | imported package'.
+    Returns {top_level_package: cumulative_us} measured at the package's own import line
+    (nested packages are included in their importer's figure, like importtime itself).
+    """
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cumulative = int(parts[1])
+        except ValueError:
+            continue
+        name = parts[2].strip()
+        if "." not in name:
+            totals[name] = max(totals.get(name, 0), cumulative)
+    return totals
+
+
+def measure(module: str):
+    """Import `module` in a fresh interpreter; return (wall_ms, per-package us, error)."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    error = None
+    if proc.returncode != 0:
+        error = (proc.stderr.strip().splitlines() or ["unknown error"])[-1]
+    return wall_ms, parse_importtime(proc.stderr), error
+
+
+if __name__ == "__main__":
+    targets = sys.argv[1:] or DEFAULT_TARGETS
+    print("=== STARTUP IMPORT-TIME BENCHMARK ===")
+    for module in targets:
+        wall_ms, packages, error = measure(module)
+        print(f"\n{module}: {wall_ms:.0f} ms wall (interpreter start + imports)")
+        if error:
+            print(f"  ! import failed: {error}")
+        shown = {k: v for k, v in packages.items() if k not in ("src", "site", "encodings")}
+        for name, us in sorted(shown.items(), key=lambda kv: kv[1], reverse=True)[:TOP_N]:
+            print(f"  {us / 1000:8.1f} ms  {name}")
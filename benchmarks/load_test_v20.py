@@ -0,0 +1,83 @@
+"""
+Load Test: OandaClient Against the Fake v20 Server
+Hammers the agent data fetch, order placement and exit-monitor reconciliation calls
+from many threads through one shared keep-alive client, entirely offline.
+
+Run: PYTHONPATH=. python benchmarks/load_test_v20.py [threads] [seconds] [latency_ms] [error_rate]
+"""
+import os
+import sys
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.execution.fake_v20_server import FakeV20Server
+
+
+def agent_cycle(client):
+    client.get_cycle_data("EUR_USD", granularities=("H1", "M15", "M5"), count=20)
+
+
+def executor(client):
+    units = 1000 if uuid.uuid4().int % 2 else -1000
+    price = client.get_current_price("EUR_USD")
+    if "error" in price:
+        return
+    sl, tp = (price["bid"] - 0.0010, price["ask"] + 0.0010) if units > 0 else (price["ask"] + 0.0010, price["bid"] - 0.0010)
+    client.place_market_order("EUR_USD", units, stop_loss=round(sl, 5), take_profit=round(tp, 5),
+                              client_order_id=f"fa-load-{uuid.uuid4().hex[:12]}")
+
+
+def exit_monitor(client):
+    open_ids = client.get_open_trades()
+    if open_ids is not None:
+        client.get_trades_by_ids(list(open_ids)[:50])
+
+
+WORKLOADS = [agent_cycle, executor, exit_monitor]
+
+
+def worker(client, workload, deadline, counts):
+    while time.perf_counter() < deadline:
+        try:
+            workload(client)
+        except Exception:
+            counts["exceptions"] += 1
+        counts[workload.__name__] += 1
+
+
+if __name__ == "__main__":
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    latency_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 20
+    error_rate = float(sys.argv[4]) if len(sys.argv) > 4 else 0.01
+
+    server = FakeV20Server(latency_ms=latency_ms, jitter_ms=latency_ms / 4, error_rate=error_rate).start()
+    os.environ.update(server.env())
+    from src.execution.oanda_client import get_oanda_client
+    client = get_oanda_client()
+
+    print(f"=== FAKE v20 LOAD TEST: {threads} threads, {seconds:.0f}s, "
+          f"{latency_ms:.0f} ms latency, {error_rate:.1%} errors ===")
+    counts = {w.__name__: 0 for w in WORKLOADS}
+    counts["exceptions"] = 0
+    deadline = time.perf_counter() + seconds
+    pool = [threading.Thread(target=worker, args=(client, WORKLOADS[i % len(WORKLOADS)], deadline, counts))
+            for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+
+    requests = server.state.requests
+    print(f"  Server requests: {requests} ({requests / seconds:.0f}/s)")
+    print(f"  Iterations: {counts}")
+    print(f"  Trades opened: {len(server.state.trades)}, "
+          f"closed by SL/TP: {len([t for t in server.state.trades.values() if t['state'] == 'CLOSED'])}")
+    print("  Client latency per endpoint:")
+    for endpoint, stats in sorted(client.get_latency_stats().items()):
+        print(f"    {endpoint:<22} calls={stats['calls']:>6} errors={stats['errors']:>4} "
+              f"avg={stats['avg_ms']:>7.1f} ms max={stats['max_ms']:>7.1f} ms")
+    server.stop()
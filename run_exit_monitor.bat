@@ -18,7 +18,7 @@ if exist ".venv\Scripts\python.exe" (
 )
 
 REM Run the exit monitor
-echo Starting exit monitor (checks every 2 minutes)...
+echo Starting exit monitor (adaptive: 5s near SL/TP, 2m base, 5m when flat)...
 %START_CMD% src/monitoring/exit_monitor.py
 
 if %errorlevel% neq 0 (
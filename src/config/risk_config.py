@@ -22,6 +22,17 @@ LOT_SIZE_STEP = 0.01  # Increment size
 MIN_SL_DISTANCE_PIPS = 10  # Minimum 10 pips
 MAX_SL_DISTANCE_PIPS = 100  # Maximum 100 pips
 
+# Pre-Screen Gate (checked before any LLM call)
+MAX_ENTRY_SPREAD_PIPS = 2.0  # Skip the cycle if spread is wider than this
+MAX_DISTANCE_FROM_LEVEL_PIPS = 30  # Skip if price is further than this from every key level
+MARKET_CLOSE_UTC = (4, 21)  # Friday 21:00 UTC (weekday, hour)
+MARKET_OPEN_UTC = (6, 21)  # Sunday 21:00 UTC
+LLM_CALLS_PER_CYCLE = 3  # Strategist + Architect + Tactical
+
+# Resting Entry Orders (LIMIT/STOP at the Architect's key zone)
+ENTRY_ORDER_EXPIRY_MINUTES = 30  # GTD expiry - two M15 candles, then the zone is re-evaluated
+MIN_ENTRY_ORDER_DISTANCE_PIPS = 1.0  # Closer than this to price -> send a market order instead
+
 # Forex Specific
 PIP_VALUE_PER_LOT = {
     "EURUSD": 10,  # $10 per pip for 1 standard lot
@@ -0,0 +1,124 @@
+"""
+Dashboard Analytics - SQL-Side Aggregates for the Admin Deep Dive
+Metrics, P&L histogram and equity curve are computed by the database (aggregates
+and window functions) so each query returns a fixed-size result however many
+trades are stored.
+"""
+from typing import Any, Dict, List, Optional
+from sqlalchemy import Integer, and_, case, cast, func, select
+from src.database.models import Trade
+
+REAL_ACTIONS = ("BUY", "SELL")
+FILLED_STATUSES = ("OPEN", "CLOSED")  # REJECTED/CANCELLED never filled; PENDING/SUBMITTING not yet
+MAX_EQUITY_POINTS = 5000  # Upper bound on points the equity query returns (before chart LTTB)
+TRADE_TABLE_LIMIT = 200  # Rows shown in the Trade Analysis table
+
+_closed = and_(Trade.action.in_(REAL_ACTIONS), Trade.status == "CLOSED", Trade.pnl.isnot(None))
+
+
+def performance_summary(db) -> Dict[str, Any]:
+    """
+    Trade counts, win rate, total P&L and average win/loss in a single aggregate query.
+    total_trades counts filled (OPEN/CLOSED) trades; the rest use CLOSED trades only.
+    """
+    row = db.execute(
+        select(
+            func.count().label("total_trades"),
+            func.count(case((_closed, 1))).label("closed"),
+            func.count(case((and_(_closed, Trade.pnl > 0), 1))).label("wins"),
+            func.count(case((and_(_closed, Trade.pnl < 0), 1))).label("losses"),
+            func.sum(case((_closed, Trade.pnl))).label("total_pnl"),
+            func.avg(case((and_(_closed, Trade.pnl > 0), Trade.pnl))).label("avg_win"),
+            func.avg(case((and_(_closed, Trade.pnl < 0), Trade.pnl))).label("avg_loss"),
+        ).where(Trade.action.in_(REAL_ACTIONS), Trade.status.in_(FILLED_STATUSES))
+    ).one()
+
+    closed = row.closed or 0
+    return {
+        "total_trades": row.total_trades or 0,
+        "closed": closed,
+        "wins": row.wins or 0,
+        "losses": row.losses or 0,
+        "win_rate": (row.wins / closed * 100) if closed else 0.0,
+        "total_pnl": float(row.total_pnl or 0.0),
+        "avg_win": float(row.avg_win or 0.0),
+        "avg_loss": float(row.avg_loss or 0.0),
+    }
+
+
+def pnl_histogram(db, bins: int = 20) -> List[Dict[str, float]]:
+    """
+    Closed-trade P&L counts per equal-width bin, bucketed by the database.
+    Returns [{"start", "end", "count"}] for non-empty bins.
+    """
+    low, high = db.execute(select(func.min(Trade.pnl), func.max(Trade.pnl)).where(_closed)).one()
+    if low is None:
+        return []
+    width = (high - low) / bins or 1.0
+
+    raw_bucket = cast((Trade.pnl - low) / width, Integer)
+    bucket = case((raw_bucket >= bins, bins - 1), else_=raw_bucket).label("bucket")  # max value -> last bin
+    rows = db.execute(
+        select(bucket, func.count().label("count")).where(_closed).group_by(bucket).order_by(bucket)
+    ).all()
+    return [{"start": low + r.bucket * width, "end": low + (r.bucket + 1) * width, "count": r.count} for r in rows]
+
+
+def equity_curve(db, start_balance: float, max_points: int = MAX_EQUITY_POINTS) -> List[Dict[str, Any]]:
+    """
+    Running balance after each closed trade (SUM() OVER window). Long histories are
+    reduced in SQL to the min and max balance of max_points/2 equal-count buckets
+    (drawdowns and peaks survive); the latest point is always included.
+    """
+    total = db.execute(select(func.count()).where(_closed)).scalar() or 0
+    if total == 0:
+        return []
+    buckets = max(max_points // 2, 1)
+    step = -(-total // buckets)  # ceil
+
+    order = (Trade.timestamp, Trade.id)
+    rn = func.row_number().over(order_by=order)
+    running = (
+        select(
+            Trade.timestamp.label("timestamp"),
+            (start_balance + func.sum(Trade.pnl).over(order_by=order)).label("balance"),
+            rn.label("rn"),
+            ((rn - 1) // step).label("bucket"),
+        )
+        .where(_closed)
+        .subquery()
+    )
+    ranked = select(
+        running,
+        func.min(running.c.balance).over(partition_by=running.c.bucket).label("bucket_min"),
+        func.max(running.c.balance).over(partition_by=running.c.bucket).label("bucket_max"),
+    ).subquery()
+    rows = db.execute(
+        select(ranked.c.timestamp, ranked.c.balance)
+        .where((ranked.c.balance == ranked.c.bucket_min) | (ranked.c.balance == ranked.c.bucket_max)
+               | (ranked.c.rn == total))
+        .order_by(ranked.c.rn)
+    ).all()
+    return [{"Date": r.timestamp, "Balance": float(r.balance)} for r in rows]
+
+
+def recent_trades(db, status: Optional[str] = None, action: Optional[str] = None,
+                  sort_by: str = "Timestamp", limit: int = TRADE_TABLE_LIMIT) -> List[Trade]:
+    """Filtered, sorted trade rows for the analysis table (filtering and LIMIT done in SQL)."""
+    order = {"Timestamp": Trade.timestamp.desc(), "P&L": Trade.pnl.desc(), "Lot Size": Trade.lot_size.desc()}
+    query = db.query(Trade).filter(Trade.action.in_(REAL_ACTIONS))
+    if status:
+        query = query.filter(Trade.status == status)
+    if action:
+        query = query.filter(Trade.action == action)
+    return query.order_by(order.get(sort_by, Trade.timestamp.desc()), Trade.id.desc()).limit(limit).all()
+
+
+def measured_fills(db, limit: int = 1000) -> List[Any]:
+    """Latency/slippage columns of the most recent fills that recorded them."""
+    return db.execute(
+        select(Trade.timestamp, Trade.action, Trade.decision_latency_ms, Trade.fill_latency_ms, Trade.slippage_pips)
+        .where(Trade.action.in_(REAL_ACTIONS), Trade.fill_latency_ms.isnot(None))
+        .order_by(Trade.timestamp.desc())
+        .limit(limit)
+    ).all()
@@ -1,11 +1,15 @@
 import streamlit as st
 from src.dashboard.auth import check_password, logout
-from src.dashboard import dashboard as live_monitor
-from src.dashboard.views import settings, admin
 from src.database.models import init_db # Import for auto-setup
 
 # Ensure database tables exist (Critical for Cloud cold-starts)
-init_db()
+# Cached per process: Streamlit re-executes this script on every interaction
+@st.cache_resource
+def ensure_database():
+    init_db()
+    return True
+
+ensure_database()
 
 st.set_page_config(layout="wide", page_title="Premium FX Agent", page_icon="🦅")
 
@@ -22,7 +26,7 @@ if not check_password():
 
 # --- SIDEBAR NAVIGATION ---
 st.sidebar.title("🦅 Navigator")
-page = st.sidebar.radio("Go to", ["Live War Room", "Settings Manager", "Admin Deep Dive"])
+page = st.sidebar.radio("Go to", ["Live War Room", "Trade History", "Settings Manager", "Admin Deep Dive"])
 
 st.sidebar.markdown("---")
 st.sidebar.caption("Logged in as Super Admin")
@@ -31,9 +35,16 @@ if st.sidebar.button("Logout"):
     st.rerun()
 
 # --- ROUTING ---
+# Pages are imported on first visit (plotly/pandas/OANDA stay out of the login cold start)
 if page == "Live War Room":
+    from src.dashboard import dashboard as live_monitor
     live_monitor.app()
+elif page == "Trade History":
+    from src.dashboard.views import history
+    history.app()
 elif page == "Settings Manager":
+    from src.dashboard.views import settings
     settings.app()
 elif page == "Admin Deep Dive":
+    from src.dashboard.views import admin
     admin.app()
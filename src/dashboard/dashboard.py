@@ -1,102 +1,25 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime, timedelta
-from src.database.models import Trade, Heartbeat, SessionLocal
-from src.execution.oanda_client import OandaClient
-from src.safety.kill_switch import is_trading_enabled, enable_trading, disable_trading
-from src.safety.circuit_breaker import api_circuit_breaker
+from datetime import datetime
+from src.database.models import SessionLocal
+from src.dashboard import trade_history
+from src.dashboard.snapshot import get_snapshot_service
+from src.safety.kill_switch import enable_trading, disable_trading
 
-# Function Wrapper
-def app():
-    st.title("🦅 Live War Room")
-    st.caption("Premium Intelligent Adaptive Trading Agent | Active Session")
-    
-    # Premium CSS
-    st.markdown("""
-    <style>
-        .metric-container {
-            background: linear-gradient(135deg, #1E1E1E 0%, #2A2A2A 100%);
-            padding: 20px;
-            border-radius: 12px;
-            border: 1px solid #333;
-            text-align: center;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.3);
-            transition: transform 0.2s;
-        }
-        .metric-container:hover {
-            transform: translateY(-2px);
-            border-color: #4CAF50;
-        }
-        .metric-label {
-            font-size: 12px;
-            color: #888;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-            margin-bottom: 8px;
-        }
-        .metric-value {
-            font-size: 28px;
-            font-weight: bold;
-            color: #FFF;
-        }
-        .trade-log {
-            font-family: 'Courier New', monospace;
-            font-size: 12px;
-            background-color: #000;
-            padding: 15px;
-            border-radius: 8px;
-            height: 380px;
-            overflow-y: scroll;
-            border: 1px solid #333;
-            line-height: 1.6;
-        }
-        .status-badge {
-            display: inline-block;
-            padding: 5px 12px;
-            border-radius: 15px;
-            font-size: 11px;
-            font-weight: bold;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }
-        .status-active { background: #4CAF50; color: #000; }
-        .status-inactive { background: #FF5252; color: #FFF; }
-        .status-warning { background: #FFC107; color: #000; }
-    </style>
-    """, unsafe_allow_html=True)
+LIVE_UPDATE_SECONDS = 1  # Fragment refresh period; each tick only re-reads the in-memory snapshot
+WAR_ROOM_EXPORT_ROWS = 1000  # Quick Actions export; the Trade History page exports more, with filters
 
-    # --- DATA FETCHING ---
-    @st.cache_data(ttl=5)
-    def get_live_metrics():
-        try:
-            client = OandaClient()
-            price = client.get_current_price("EUR_USD")
-            summary = client.get_account_summary()
-            balance = float(summary.balance) if hasattr(summary, 'balance') else 100000.0
-            return price['bid'], price['ask'], balance
-        except:
-            return 0, 0, 0
 
-    @st.cache_data(ttl=5)
-    def get_daily_pnl():
-        """Calculate today's P&L."""
-        db = SessionLocal()
-        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_trades = db.query(Trade).filter(
-            Trade.timestamp >= today_start,
-            Trade.pnl != None
-        ).all()
-        db.close()
-        
-        total_pnl = sum(t.pnl for t in today_trades)
-        return total_pnl, len(today_trades)
+def _snapshot():
+    """Latest process-wide snapshot; only its refresher touches OANDA/DB."""
+    return get_snapshot_service().get()
 
-    bid, ask, balance = get_live_metrics()
-    daily_pnl, trades_today = get_daily_pnl()
 
-    # --- SYSTEM STATUS BANNER ---
-    trading_enabled = is_trading_enabled()
-    circuit_status = api_circuit_breaker.get_status()
+@st.fragment(run_every=LIVE_UPDATE_SECONDS)
+def _status_banner():
+    snapshot = _snapshot()
+    trading_enabled = snapshot["trading_enabled"]
+    open_breakers = [b for b in snapshot["breakers"] if b["is_open"]]
     
     col_status1, col_status2, col_status3 = st.columns(3)
     
@@ -106,20 +29,22 @@ def app():
         st.markdown(f'<span class="status-badge {status_class}">🔄 Trading: {status_text}</span>', unsafe_allow_html=True)
     
     with col_status2:
-        circuit_class = "status-active" if not circuit_status['is_open'] else "status-warning"
-        circuit_text = "HEALTHY" if not circuit_status['is_open'] else f"OPEN ({circuit_status['failure_count']}/5)"
+        circuit_class = "status-active" if not open_breakers else "status-warning"
+        circuit_text = "HEALTHY" if not open_breakers else ", ".join(f"{b['name']} {b['state']}" for b in open_breakers)
         st.markdown(f'<span class="status-badge {circuit_class}">⚡ Circuit: {circuit_text}</span>', unsafe_allow_html=True)
     
     with col_status3:
-        db = SessionLocal()
-        open_count = db.query(Trade).filter(Trade.status == "OPEN").count()
-        db.close()
+        open_count = snapshot["open_count"]
         position_class = "status-active" if open_count < 3 else "status-warning"
         st.markdown(f'<span class="status-badge {position_class}">📊 Positions: {open_count}/3</span>', unsafe_allow_html=True)
 
-    st.markdown("---")
 
-    # --- TOP METRICS ROW ---
+@st.fragment(run_every=LIVE_UPDATE_SECONDS)
+def _metric_tiles():
+    snapshot = _snapshot()
+    bid, ask, balance = snapshot["bid"], snapshot["ask"], snapshot["balance"]
+    daily_pnl, trades_today = snapshot["daily_pnl"], snapshot["trades_today"]
+    
     col1, col2, col3, col4, col5 = st.columns(5)
 
     with col1:
@@ -167,6 +92,155 @@ def app():
         </div>
         """, unsafe_allow_html=True)
 
+
+@st.fragment(run_every=LIVE_UPDATE_SECONDS)
+def _positions_table():
+    all_trades = _snapshot()["recent_trades"]
+    
+    if all_trades:
+        # Filter for real trades
+        real_trades = [t for t in all_trades if t["action"] in ["BUY", "SELL"]]
+        
+        if real_trades:
+            data = []
+            for t in real_trades:
+                pnl = t["pnl"]
+                pnl_display = f"${pnl:.2f}" if pnl else "OPEN"
+                pnl_color = "🟢" if (pnl and pnl > 0) else ("🔴" if (pnl and pnl < 0) else "⚪")
+                
+                data.append({
+                    "Time": t["timestamp"].strftime("%H:%M:%S"),
+                    "Action": f"{t['action']} {t['lot_size']}",
+                    "Entry": f"{t['entry_price']:.5f}",
+                    "SL": f"{t['stop_loss']:.5f}",
+                    "TP": f"{t['take_profit']:.5f}",
+                    "Status": t["status"],
+                    "P&L": f"{pnl_color} {pnl_display}"
+                })
+            
+            df = pd.DataFrame(data)
+            st.dataframe(df, use_container_width=True, height=300)
+        else:
+            st.info("No trades executed yet. Agent is analyzing market...")
+    else:
+        st.info("No activity recorded.")
+
+
+@st.fragment(run_every=LIVE_UPDATE_SECONDS)
+def _thought_stream():
+    snapshot = _snapshot()
+    all_trades = snapshot["recent_trades"]
+    
+    # --- HEARTBEAT MONITOR ---
+    last_hb = snapshot["last_heartbeat"]
+    
+    if last_hb:
+        time_diff = (datetime.utcnow() - last_hb["timestamp"]).total_seconds()
+        if time_diff < 120:  # Less than 2 minutes
+            status_color = "#4CAF50"
+            status_text = "ACTIVE"
+            status_emoji = "🟢"
+        elif time_diff < 1200:  # Less than 20 minutes (15min cycle + 5min buffer)
+            status_color = "#FFC107"
+            status_text = "IDLE"
+            status_emoji = "🟡"
+        else:
+            status_color = "#FF5252"
+            status_text = "OFFLINE"
+            status_emoji = "🔴"
+        
+        st.markdown(f"""
+        <div style="background: linear-gradient(135deg, #1E1E1E 0%, #2A2A2A 100%); padding: 15px; border-radius: 8px; border-left: 5px solid {status_color}; margin-bottom: 20px; box-shadow: 0 4px 6px rgba(0,0,0,0.3);">
+            <b style="color: {status_color}; font-size: 16px;">{status_emoji} AGENT: {status_text}</b><br>
+            <small style="color: #888;">Last Heartbeat: {last_hb['timestamp'].strftime('%H:%M:%S')} ({int(time_diff)}s ago)</small><br>
+            <small style="color: #666;">Message: {last_hb['last_message'] or 'No message'}</small>
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.warning("⚠️ No heartbeat detected. Agent may not be running.")
+
+    # Latest reasoning trace
+    if all_trades and all_trades[0]["reasoning_trace"]:
+        latest_log = all_trades[0]
+        ts = latest_log["timestamp"].strftime("%H:%M:%S")
+        header = f"[{ts}] DECISION: {latest_log['action']}"
+        trace = "\n > ".join(latest_log["reasoning_trace"])
+        content = f"{header}\n\n > {trace}"
+    else:
+        content = "Waiting for AI reasoning..."
+        
+    st.markdown(f'<div class="trade-log">{content}</div>', unsafe_allow_html=True)
+
+
+# Function Wrapper
+def app():
+    st.title("🦅 Live War Room")
+    st.caption("Premium Intelligent Adaptive Trading Agent | Active Session")
+    
+    # Premium CSS
+    st.markdown("""
+    <style>
+        .metric-container {
+            background: linear-gradient(135deg, #1E1E1E 0%, #2A2A2A 100%);
+            padding: 20px;
+            border-radius: 12px;
+            border: 1px solid #333;
+            text-align: center;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.3);
+            transition: transform 0.2s;
+        }
+        .metric-container:hover {
+            transform: translateY(-2px);
+            border-color: #4CAF50;
+        }
+        .metric-label {
+            font-size: 12px;
+            color: #888;
+            text-transform: uppercase;
+            letter-spacing: 1px;
+            margin-bottom: 8px;
+        }
+        .metric-value {
+            font-size: 28px;
+            font-weight: bold;
+            color: #FFF;
+        }
+        .trade-log {
+            font-family: 'Courier New', monospace;
+            font-size: 12px;
+            background-color: #000;
+            padding: 15px;
+            border-radius: 8px;
+            height: 380px;
+            overflow-y: scroll;
+            border: 1px solid #333;
+            line-height: 1.6;
+        }
+        .status-badge {
+            display: inline-block;
+            padding: 5px 12px;
+            border-radius: 15px;
+            font-size: 11px;
+            font-weight: bold;
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+        }
+        .status-active { background: #4CAF50; color: #000; }
+        .status-inactive { background: #FF5252; color: #FFF; }
+        .status-warning { background: #FFC107; color: #000; }
+    </style>
+    """, unsafe_allow_html=True)
+
+    # --- SYSTEM STATUS BANNER ---
+    # Each section is a fragment: it re-renders on its own every LIVE_UPDATE_SECONDS
+    # from the shared snapshot, without re-running the page
+    _status_banner()
+
+    st.markdown("---")
+
+    # --- TOP METRICS ROW ---
+    _metric_tiles()
+
     st.markdown("---")
 
     # --- MAIN CONTENT ---
@@ -174,124 +248,43 @@ def app():
 
     with col_left:
         st.subheader("📊 Active Positions & History")
-        
-        db = SessionLocal()
-        all_trades = db.query(Trade).order_by(Trade.timestamp.desc()).limit(20).all()
-        db.close()
-        
-        if all_trades:
-            # Filter for real trades
-            real_trades = [t for t in all_trades if t.action in ["BUY", "SELL"]]
-            
-            if real_trades:
-                data = []
-                for t in real_trades:
-                    pnl_display = f"${t.pnl:.2f}" if t.pnl else "OPEN"
-                    pnl_color = "🟢" if (t.pnl and t.pnl > 0) else ("🔴" if (t.pnl and t.pnl < 0) else "⚪")
-                    
-                    data.append({
-                        "Time": t.timestamp.strftime("%H:%M:%S"),
-                        "Action": f"{t.action} {t.lot_size}",
-                        "Entry": f"{t.entry_price:.5f}",
-                        "SL": f"{t.stop_loss:.5f}",
-                        "TP": f"{t.take_profit:.5f}",
-                        "Status": t.status,
-                        "P&L": f"{pnl_color} {pnl_display}"
-                    })
-                
-                df = pd.DataFrame(data)
-                st.dataframe(df, use_container_width=True, height=300)
-            else:
-                st.info("No trades executed yet. Agent is analyzing market...")
-        else:
-            st.info("No activity recorded.")
+        _positions_table()
 
         # Quick actions
         st.markdown("### Quick Actions")
         col_act1, col_act2, col_act3 = st.columns(3)
         
         with col_act1:
-            if trading_enabled:
+            if _snapshot()["trading_enabled"]:
                 if st.button("🛑 Disable Trading", type="secondary"):
                     disable_trading()
+                    get_snapshot_service().refresh()  # Banner and button reflect the toggle at once
                     st.success("Trading disabled via kill switch")
                     st.rerun()
             else:
                 if st.button("✅ Enable Trading", type="primary"):
                     enable_trading()
+                    get_snapshot_service().refresh()
                     st.success("Trading activated")
                     st.rerun()
         
         with col_act2:
             if st.button("🔄 Refresh Data"):
                 st.cache_data.clear()
+                get_snapshot_service().refresh()
                 st.rerun()
         
         with col_act3:
             if st.button("📊 Export Trades"):
-                if all_trades:
-                    df_export = pd.DataFrame([{
-                        'Timestamp': t.timestamp,
-                        'Pair': t.pair,
-                        'Action': t.action,
-                        'Entry': t.entry_price,
-                        'Exit': t.exit_price,
-                        'P&L': t.pnl,
-                        'Status': t.status
-                    } for t in all_trades])
-                    csv = df_export.to_csv(index=False)
-                    st.download_button("Download CSV", csv, "trades.csv", "text/csv")
+                # Newest WAR_ROOM_EXPORT_ROWS only (filters/Parquet/larger exports on the Trade History page)
+                db = SessionLocal()
+                try:
+                    export = trade_history.export_file(db, "csv", max_rows=WAR_ROOM_EXPORT_ROWS)
+                finally:
+                    db.close()
+                with export:
+                    st.download_button("Download CSV", export, "trades.csv", "text/csv")
 
     with col_right:
         st.subheader("🧠 Thought Stream")
-        
-        # --- HEARTBEAT MONITOR ---
-        db = SessionLocal()
-        last_hb = db.query(Heartbeat).order_by(Heartbeat.timestamp.desc()).first()
-        db.close()
-        
-        if last_hb:
-            time_diff = (datetime.utcnow() - last_hb.timestamp).total_seconds()
-            if time_diff < 120:  # Less than 2 minutes
-                status_color = "#4CAF50"
-                status_text = "ACTIVE"
-                status_emoji = "🟢"
-            elif time_diff < 1200:  # Less than 20 minutes (15min cycle + 5min buffer)
-                status_color = "#FFC107"
-                status_text = "IDLE"
-                status_emoji = "🟡"
-            else:
-                status_color = "#FF5252"
-                status_text = "OFFLINE"
-                status_emoji = "🔴"
-            
-            st.markdown(f"""
-            <div style="background: linear-gradient(135deg, #1E1E1E 0%, #2A2A2A 100%); padding: 15px; border-radius: 8px; border-left: 5px solid {status_color}; margin-bottom: 20px; box-shadow: 0 4px 6px rgba(0,0,0,0.3);">
-                <b style="color: {status_color}; font-size: 16px;">{status_emoji} AGENT: {status_text}</b><br>
-                <small style="color: #888;">Last Heartbeat: {last_hb.timestamp.strftime('%H:%M:%S')} ({int(time_diff)}s ago)</small><br>
-                <small style="color: #666;">Message: {last_hb.last_message or 'No message'}</small>
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            st.warning("⚠️ No heartbeat detected. Agent may not be running.")
-
-        # Latest reasoning trace
-        if all_trades and all_trades[0].reasoning_trace:
-            latest_log = all_trades[0]
-            ts = latest_log.timestamp.strftime("%H:%M:%S")
-            header = f"[{ts}] DECISION: {latest_log.action}"
-            trace = "\n > ".join(latest_log.reasoning_trace)
-            content = f"{header}\n\n > {trace}"
-        else:
-            content = "Waiting for AI reasoning..."
-            
-        st.markdown(f'<div class="trade-log">{content}</div>', unsafe_allow_html=True)
-
-    # Auto-refresh every 15 seconds
-    import time
-    if "last_refresh" not in st.session_state:
-        st.session_state.last_refresh = time.time()
-    
-    if time.time() - st.session_state.last_refresh > 15:
-        st.session_state.last_refresh = time.time()
-        st.rerun()
+        _thought_stream()
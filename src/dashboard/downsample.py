@@ -0,0 +1,69 @@
+"""
+Chart Downsampling - Fixed Point Budget for Dashboard Charts
+LTTB (largest-triangle-three-buckets) keeps the visual shape of line series;
+min/max-per-bucket keeps every spike (e.g. heartbeat outages). Both return row
+indices so callers can slice whatever structure they hold.
+"""
+from typing import Any, Dict, List, Sequence
+import numpy as np
+
+DEFAULT_CHART_POINTS = 800  # ~ one point per horizontal pixel of a wide Streamlit chart
+
+
+def _as_float(x: Sequence[Any]) -> np.ndarray:
+    """Numbers as-is, datetimes as epoch nanoseconds."""
+    arr = np.asarray(x)
+    if np.issubdtype(arr.dtype, np.number):
+        return arr.astype(float)
+    return np.asarray(arr, dtype="datetime64[ns]").astype("int64").astype(float)
+
+
+def lttb_indices(x: Sequence[Any], y: Sequence[float], threshold: int) -> np.ndarray:
+    """Indices of the `threshold` points LTTB selects (all indices if already small enough)."""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    xs, ys = _as_float(x), np.asarray(y, dtype=float)
+    # Bucket edges for the n-2 interior points; first and last points are always kept
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = xs[next_start:next_end].mean(), ys[next_start:next_end].mean()
+        # Triangle area between the last kept point, each candidate and the next bucket's centroid
+        areas = np.abs((xs[a] - avg_x) * (ys[start:end] - ys[a]) - (xs[a] - xs[start:end]) * (avg_y - ys[a]))
+        a = start + int(areas.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y: Sequence[float], buckets: int) -> np.ndarray:
+    """First, last and the min and max of each of `buckets` equal-count buckets, in order."""
+    n = len(y)
+    if n <= buckets * 2:
+        return np.arange(n)
+
+    ys = np.asarray(y, dtype=float)
+    keep = {0, n - 1}
+    for chunk in np.array_split(np.arange(n), buckets):
+        keep.add(int(chunk[ys[chunk].argmin()]))
+        keep.add(int(chunk[ys[chunk].argmax()]))
+    return np.array(sorted(keep))
+
+
+def downsample(points: List[Dict[str, Any]], x_key: str, y_key: str,
+               budget: int = DEFAULT_CHART_POINTS, method: str = "lttb") -> List[Dict[str, Any]]:
+    """Reduce a list of point dicts to at most `budget` points ("lttb" or "minmax")."""
+    if len(points) <= budget:
+        return points
+    ys = [p[y_key] for p in points]
+    if method == "minmax":
+        idx = minmax_indices(ys, budget // 2)
+    else:
+        idx = lttb_indices([p[x_key] for p in points], ys, budget)
+    return [points[i] for i in idx]
@@ -0,0 +1,135 @@
+"""
+Query Sandbox - Read-Only Execution for the Admin SQL Console
+Ad-hoc queries run on their own single-connection engine (READONLY_DATABASE_URL,
+e.g. a replica or read-only role, else DATABASE_URL) inside a read-only transaction
+with a statement timeout, and results are fetched in chunks up to a row cap, so
+analysis can't lock tables, exhaust the agent's pool or flood the Streamlit process.
+"""
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import create_engine, text
+
+SANDBOX_ROW_LIMIT = 1000
+SANDBOX_TIMEOUT_MS = 5000
+SANDBOX_FETCH_CHUNK = 200
+
+_ALLOWED_START = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+
+
+def validate_query(sql: str) -> Tuple[bool, str]:
+    """
+    Cheap up-front check: exactly one SELECT/WITH statement.
+    The read-only transaction is what actually prevents writes.
+    """
+    body = _COMMENTS.sub(" ", sql or "").strip().rstrip(";").strip()
+    if not body:
+        return False, "Empty query"
+    if ";" in body:
+        return False, "Only a single statement is allowed"
+    if not _ALLOWED_START.match(body):
+        return False, "Only SELECT / WITH queries are allowed"
+    return True, body
+
+
+def _sqlite_guard(dbapi_conn, timeout_ms: int):
+    """SQLite has no statement_timeout: abort from the progress handler once the deadline passes."""
+    deadline = time.monotonic() + timeout_ms / 1000
+    dbapi_conn.set_progress_handler(lambda: 1 if time.monotonic() > deadline else 0, 10_000)
+
+
+def _begin_read_only(conn, timeout_ms: int):
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+        conn.exec_driver_sql("SET LOCAL lock_timeout = 1000")
+    elif dialect == "sqlite":
+        conn.exec_driver_sql("PRAGMA query_only = ON")
+        _sqlite_guard(conn.connection.dbapi_connection, timeout_ms)
+
+
+def _end_read_only(conn):
+    if conn.dialect.name == "sqlite":
+        conn.exec_driver_sql("PRAGMA query_only = OFF")
+        conn.connection.dbapi_connection.set_progress_handler(None, 0)
+
+
+def run_query(engine, sql: str, row_limit: int = SANDBOX_ROW_LIMIT,
+              timeout_ms: int = SANDBOX_TIMEOUT_MS) -> Dict[str, Any]:
+    """
+    Execute a validated query read-only; returns columns, at most `row_limit` rows,
+    whether the result was truncated and the elapsed time. Raises ValueError if
+    the query is rejected; database errors (incl. timeouts) propagate.
+    """
+    ok, body = validate_query(sql)
+    if not ok:
+        raise ValueError(body)
+
+    start = time.perf_counter()
+    rows: List[tuple] = []
+    truncated = False
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            _begin_read_only(conn, timeout_ms)
+            result = conn.execution_options(stream_results=True).execute(text(body))
+            columns = list(result.keys())
+            while len(rows) < row_limit:
+                chunk = result.fetchmany(min(SANDBOX_FETCH_CHUNK, row_limit - len(rows)))
+                if not chunk:
+                    break
+                rows.extend(tuple(r) for r in chunk)
+            else:
+                truncated = result.fetchone() is not None
+            result.close()
+        finally:
+            trans.rollback()  # Never commit anything from the console
+            _end_read_only(conn)
+
+    return {
+        "columns": columns,
+        "rows": rows,
+        "truncated": truncated,
+        "elapsed_ms": (time.perf_counter() - start) * 1000,
+    }
+
+
+def explain(engine, sql: str, timeout_ms: int = SANDBOX_TIMEOUT_MS) -> List[str]:
+    """Query plan (without executing the query) as text lines."""
+    ok, body = validate_query(sql)
+    if not ok:
+        raise ValueError(body)
+
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            _begin_read_only(conn, timeout_ms)
+            if conn.dialect.name == "sqlite":
+                return [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {body}"))]
+            return [row[0] for row in conn.execute(text(f"EXPLAIN {body}"))]
+        finally:
+            trans.rollback()
+            _end_read_only(conn)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_sandbox_engine():
+    """Dedicated one-connection engine so console queries never use the agent's pool."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                url = os.getenv("READONLY_DATABASE_URL") or os.getenv("DATABASE_URL")
+                if url.startswith("sqlite"):
+                    _engine = create_engine(url)
+                else:
+                    _engine = create_engine(url, pool_size=1, max_overflow=0, pool_timeout=5, pool_pre_ping=True)
+    return _engine
@@ -0,0 +1,233 @@
+"""
+Live Snapshot Service - Shared Read Model for the Live War Room
+One background refresher per process queries OANDA and the database on a fixed
+interval and publishes an immutable snapshot; every browser session reads the
+latest snapshot, so broker, DB and shared breaker-state load no longer scale with
+the number of viewers.
+"""
+import threading
+import time
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from sqlalchemy import case, func
+from src.database.models import Trade, Heartbeat, SessionLocal
+from src.safety.circuit_breaker import ALL_BREAKERS
+from src.safety.kill_switch import is_trading_enabled
+
+SNAPSHOT_REFRESH_SECONDS = 5  # Full rebuild (incl. broker price) at least this often
+CHANGE_PROBE_SECONDS = 1  # Cheap DB change check; a new trade/fill/close/heartbeat triggers a rebuild
+RECENT_TRADES_LIMIT = 20
+SNAPSHOT_PAIR = "EUR_USD"
+
+
+def _trade_row(t: Trade) -> Mapping[str, Any]:
+    """Plain-data copy of a Trade (no ORM session attached)."""
+    return MappingProxyType({
+        "timestamp": t.timestamp,
+        "pair": t.pair,
+        "action": t.action,
+        "lot_size": t.lot_size,
+        "entry_price": t.entry_price,
+        "exit_price": t.exit_price,
+        "stop_loss": t.stop_loss,
+        "take_profit": t.take_profit,
+        "status": t.status,
+        "pnl": t.pnl,
+        "reasoning_trace": tuple(t.reasoning_trace or ()),
+    })
+
+
+def safety_state() -> tuple:
+    """(trading_enabled, breaker states) - cheap enough for the change probe."""
+    return is_trading_enabled(), tuple(b.state for b in ALL_BREAKERS)
+
+
+def build_snapshot(client=None, session_factory: Callable = SessionLocal,
+                   pair: str = SNAPSHOT_PAIR) -> Mapping[str, Any]:
+    """Query broker + DB once and return a read-only snapshot."""
+    errors = []
+    bid = ask = balance = 0.0
+    if client is not None:
+        try:
+            price = client.get_current_price(pair)
+            summary = client.get_account_summary()
+            bid, ask = price["bid"], price["ask"]
+            balance = float(summary.balance) if hasattr(summary, "balance") else 0.0
+        except Exception as e:
+            errors.append(f"broker: {e}")
+
+    trading_enabled, breakers = False, ()
+    try:
+        trading_enabled = is_trading_enabled()
+        breakers = tuple(MappingProxyType(b.get_status()) for b in ALL_BREAKERS)
+    except Exception as e:
+        errors.append(f"safety: {e}")
+
+    daily_pnl, trades_today, open_count = 0.0, 0, 0
+    recent, last_heartbeat = (), None
+    db = session_factory()
+    try:
+        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        pnls = db.query(Trade.pnl).filter(Trade.timestamp >= today_start, Trade.pnl != None).all()
+        daily_pnl, trades_today = float(sum(p for (p,) in pnls)), len(pnls)
+        open_count = db.query(Trade).filter(Trade.status == "OPEN").count()
+        recent = tuple(_trade_row(t) for t in
+                       db.query(Trade).order_by(Trade.timestamp.desc()).limit(RECENT_TRADES_LIMIT).all())
+        hb = db.query(Heartbeat).order_by(Heartbeat.timestamp.desc()).first()
+        if hb:
+            last_heartbeat = MappingProxyType({"timestamp": hb.timestamp, "last_message": hb.last_message})
+    except Exception as e:
+        errors.append(f"database: {e}")
+    finally:
+        db.close()
+
+    return MappingProxyType({
+        "taken_at": datetime.utcnow(),
+        "pair": pair,
+        "bid": bid,
+        "ask": ask,
+        "balance": balance,
+        "daily_pnl": daily_pnl,
+        "trades_today": trades_today,
+        "open_count": open_count,
+        "recent_trades": recent,
+        "last_heartbeat": last_heartbeat,
+        "trading_enabled": trading_enabled,
+        "breakers": breakers,
+        "errors": tuple(errors),
+    })
+
+
+def probe_changes(session_factory: Callable = SessionLocal) -> tuple:
+    """
+    One aggregate query whose result changes whenever the agent writes something the
+    War Room shows (new decision, fill/status change, close, heartbeat), plus the kill
+    switch and breaker states so a trip or toggle shows up within a probe interval.
+    """
+    db = session_factory()
+    try:
+        trades = db.query(
+            func.max(Trade.id), func.count(case((Trade.status == "OPEN", 1))), func.max(Trade.closed_at)
+        ).one()
+        return tuple(trades) + (db.query(func.max(Heartbeat.id)).scalar(),) + safety_state()
+    finally:
+        db.close()
+
+
+class SnapshotService:
+    """
+    Background refresher that swaps in a new snapshot every `interval` seconds, or
+    within `probe_interval` seconds of `probe()` reporting a change.
+    """
+
+    def __init__(self, builder: Callable[[], Mapping[str, Any]], interval: float = SNAPSHOT_REFRESH_SECONDS,
+                 probe: Optional[Callable[[], Any]] = None, probe_interval: float = CHANGE_PROBE_SECONDS):
+        self.builder = builder
+        self.interval = interval
+        self.probe = probe
+        self.probe_interval = probe_interval
+        self.refresh_count = 0
+        self._last_token = None
+        self._last_build = 0.0
+        self._force = False
+        self._snapshot: Optional[Mapping[str, Any]] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> Mapping[str, Any]:
+        """Build and publish a snapshot now (one build at a time)."""
+        with self._lock:
+            snapshot = self.builder()
+            self._snapshot = snapshot  # Single reference swap; readers never see a partial snapshot
+            self.refresh_count += 1
+            self._last_build = time.monotonic()
+        self._ready.set()
+        return snapshot
+
+    def _changed(self) -> bool:
+        if self.probe is None:
+            return False
+        token = self.probe()
+        changed = token != self._last_token
+        self._last_token = token
+        return changed
+
+    def _run(self):
+        tick = self.probe_interval if self.probe else self.interval
+        while not self._stop.is_set():
+            try:
+                changed = self._changed()
+                stale = time.monotonic() - self._last_build >= self.interval
+                if changed or stale or self._force or self._snapshot is None:
+                    self._force = False
+                    self.refresh()
+            except Exception as e:
+                print(f"[SNAPSHOT] Refresh failed: {e}")
+            if self._wake.wait(tick):
+                self._wake.clear()
+                self._force = True
+
+    def start(self) -> "SnapshotService":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="dashboard-snapshot", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def request_refresh(self):
+        """Ask the refresher to run early (e.g. the dashboard's Refresh button)."""
+        self._wake.set()
+
+    def get(self) -> Mapping[str, Any]:
+        """Latest snapshot; the first caller builds one synchronously if none exists yet."""
+        if self._snapshot is None:
+            # Wait for the refresher's first build rather than starting a second one
+            if not (self._thread and self._thread.is_alive() and self._ready.wait(self.interval * 2)):
+                return self.refresh()
+        return self._snapshot
+
+    def get_status(self) -> Dict:
+        """Get refresher state."""
+        snapshot = self._snapshot
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "interval": self.interval,
+            "probe_interval": self.probe_interval if self.probe else None,
+            "refresh_count": self.refresh_count,
+            "taken_at": snapshot.get("taken_at") if snapshot else None,
+        }
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_snapshot_service() -> SnapshotService:
+    """Process-wide SnapshotService, started on first use."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                from src.execution.oanda_client import get_oanda_client
+
+                def _build():
+                    try:
+                        client = get_oanda_client()
+                    except Exception as e:
+                        print(f"[SNAPSHOT] OANDA unavailable: {e}")
+                        client = None
+                    return build_snapshot(client)
+
+                _service = SnapshotService(_build, probe=probe_changes).start()
+    return _service
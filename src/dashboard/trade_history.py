@@ -0,0 +1,136 @@
+"""
+Trade History - Keyset-Paginated Browser and Chunked Export
+Pages walk the (timestamp, id) index newest-first with a cursor instead of OFFSET,
+so page N costs the same as page 1; exports reuse the same cursor to write up to
+EXPORT_MAX_ROWS rows in fixed-size chunks to a temp file on disk, without loading
+the table into memory.
+"""
+import csv
+import io
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+from src.database.models import Trade
+
+PAGE_SIZE = 50
+EXPORT_CHUNK_ROWS = 2000
+EXPORT_MAX_ROWS = 100_000  # Newest rows kept per export; Streamlit serves the whole file from memory
+
+HISTORY_COLUMNS = (
+    "id", "timestamp", "pair", "action", "order_type", "status", "lot_size", "entry_price",
+    "stop_loss", "take_profit", "exit_price", "pnl", "exit_reason", "closed_at",
+    "slippage_pips", "oanda_trade_id", "reasoning_trace",
+)
+_columns = [getattr(Trade, name) for name in HISTORY_COLUMNS]
+
+Cursor = Tuple[datetime, int]
+
+
+def _filtered(stmt, pair: Optional[str] = None, action: Optional[str] = None, status: Optional[str] = None,
+              start: Optional[datetime] = None, end: Optional[datetime] = None):
+    """Apply the browser's optional filters (end is exclusive)."""
+    if pair:
+        stmt = stmt.where(Trade.pair == pair)
+    if action:
+        stmt = stmt.where(Trade.action == action)
+    if status:
+        stmt = stmt.where(Trade.status == status)
+    if start:
+        stmt = stmt.where(Trade.timestamp >= start)
+    if end:
+        stmt = stmt.where(Trade.timestamp < end)
+    return stmt
+
+
+def trade_page(db, cursor: Optional[Cursor] = None, page_size: int = PAGE_SIZE,
+               **filters) -> Tuple[List[Any], Optional[Cursor]]:
+    """
+    One page of trades/decisions, newest first, strictly older than `cursor`.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    stmt = _filtered(select(*_columns), **filters)
+    if cursor is not None:
+        ts, trade_id = cursor
+        stmt = stmt.where(or_(Trade.timestamp < ts, and_(Trade.timestamp == ts, Trade.id < trade_id)))
+    rows = db.execute(stmt.order_by(Trade.timestamp.desc(), Trade.id.desc()).limit(page_size + 1)).all()
+
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, (rows[-1].timestamp, rows[-1].id)
+
+
+def iter_trade_chunks(db, chunk_size: int = EXPORT_CHUNK_ROWS, max_rows: Optional[int] = None,
+                      **filters) -> Iterator[List[Any]]:
+    """Matching rows (the newest `max_rows`, or all), newest first, `chunk_size` rows at a time."""
+    cursor, remaining = None, max_rows
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        rows, cursor = trade_page(db, cursor, size, **filters)
+        if rows:
+            yield rows
+        if cursor is None:
+            return
+        if remaining is not None:
+            remaining -= len(rows)
+
+
+def _export_value(name: str, value: Any) -> Any:
+    if name == "reasoning_trace":
+        return " > ".join(str(step) for step in value) if value else ""
+    return value
+
+
+def write_csv(db, out, max_rows: Optional[int] = None, **filters) -> int:
+    """Write matching rows as CSV to a text file object; returns the row count."""
+    writer = csv.writer(out)
+    writer.writerow(HISTORY_COLUMNS)
+    count = 0
+    for chunk in iter_trade_chunks(db, max_rows=max_rows, **filters):
+        writer.writerows([_export_value(n, v) for n, v in zip(HISTORY_COLUMNS, row)] for row in chunk)
+        count += len(chunk)
+    return count
+
+
+def write_parquet(db, out, max_rows: Optional[int] = None, **filters) -> int:
+    """Write matching rows as Parquet (one row group per chunk); returns the row count."""
+    import pyarrow as pa  # Ships with streamlit; only needed for this export
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()), ("timestamp", pa.timestamp("us")), ("pair", pa.string()), ("action", pa.string()),
+        ("order_type", pa.string()), ("status", pa.string()), ("lot_size", pa.float64()),
+        ("entry_price", pa.float64()), ("stop_loss", pa.float64()), ("take_profit", pa.float64()),
+        ("exit_price", pa.float64()), ("pnl", pa.float64()), ("exit_reason", pa.string()),
+        ("closed_at", pa.timestamp("us")), ("slippage_pips", pa.float64()), ("oanda_trade_id", pa.string()),
+        ("reasoning_trace", pa.string()),
+    ])
+    count = 0
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in iter_trade_chunks(db, max_rows=max_rows, **filters):
+            columns: Dict[str, list] = {name: [] for name in HISTORY_COLUMNS}
+            for row in chunk:
+                for name, value in zip(HISTORY_COLUMNS, row):
+                    columns[name].append(_export_value(name, value))
+            writer.write_table(pa.table(columns, schema=schema))
+            count += len(chunk)
+    return count
+
+
+def export_file(db, fmt: str = "csv", max_rows: Optional[int] = EXPORT_MAX_ROWS, **filters):
+    """
+    Export the newest `max_rows` matching rows into an unbuffered temp file, rewound for
+    reading. The raw file object can go straight to st.download_button; it is deleted on close.
+    """
+    out = tempfile.TemporaryFile(buffering=0)
+    if fmt == "parquet":
+        write_parquet(db, out, max_rows=max_rows, **filters)
+    else:
+        text = io.TextIOWrapper(io.BufferedWriter(out), encoding="utf-8", newline="")
+        write_csv(db, text, max_rows=max_rows, **filters)
+        text.flush()
+        text.detach().detach()  # Keep `out` open after the wrappers go away
+    out.seek(0)
+    return out
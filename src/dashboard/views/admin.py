@@ -5,38 +5,41 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 from src.database.models import Trade, Heartbeat, SessionLocal
 from src.config import risk_config
+from src.execution import execution_quality
+from src.dashboard import analytics, query_sandbox
+from src.dashboard.downsample import downsample, DEFAULT_CHART_POINTS
 
 def app():
     st.header("🧠 Admin Deep Dive")
     st.caption("Advanced Analytics, Performance Metrics & System Health")
     
+    # Point budget per chart (~ chart width in pixels); series are downsampled to fit
+    chart_points = st.sidebar.slider("Chart resolution (points)", 200, 2000, DEFAULT_CHART_POINTS, step=100)
+    
     db = SessionLocal()
-    all_trades = db.query(Trade).all()
-    heartbeats = db.query(Heartbeat).order_by(Heartbeat.timestamp.desc()).limit(100).all()
+    # Aggregates come back from SQL - no full trade table load per render
+    summary = analytics.performance_summary(db)
+    equity_points = analytics.equity_curve(db, risk_config.ACCOUNT_BALANCE)
+    pnl_bins = analytics.pnl_histogram(db, bins=20)
+    fills = analytics.measured_fills(db)
+    heartbeats = (
+        db.query(Heartbeat.timestamp, Heartbeat.last_message)
+        .filter(Heartbeat.timestamp >= datetime.utcnow() - timedelta(hours=24))
+        .order_by(Heartbeat.timestamp.desc())
+        .all()
+    )
     db.close()
     
     #--- PERFORMANCE METRICS ---
     st.subheader("📈 Performance Dashboard")
     
-    # Filter real trades
-    real_trades = [t for t in all_trades if t.action in ["BUY", "SELL"]] if all_trades else []
-    closed_trades = [t for t in real_trades if t.status == "CLOSED" and t.pnl is not None] if real_trades else []
-    
-    # Calculate metrics with defaults
-    total_trades = len(real_trades)
-    winning_trades = len([t for t in closed_trades if t.pnl > 0])
-    losing_trades = len([t for t in closed_trades if t.pnl < 0])
-    
-    if closed_trades:
-        win_rate = (winning_trades / len(closed_trades) * 100)
-        total_pnl = sum(t.pnl for t in closed_trades)
-        avg_win = sum(t.pnl for t in closed_trades if t.pnl > 0) / winning_trades if winning_trades else 0
-        avg_loss = sum(t.pnl for t in closed_trades if t.pnl < 0) / losing_trades if losing_trades else 0
-    else:
-        win_rate = 0.0
-        total_pnl = 0.0
-        avg_win = 0.0
-        avg_loss = 0.0
+    total_trades = summary["total_trades"]
+    winning_trades = summary["wins"]
+    losing_trades = summary["losses"]
+    win_rate = summary["win_rate"]
+    total_pnl = summary["total_pnl"]
+    avg_win = summary["avg_win"]
+    avg_loss = summary["avg_loss"]
     
     # Metrics row
     col1, col2, col3, col4, col5 = st.columns(5)
@@ -52,22 +55,15 @@ def app():
     # --- EQUITY CURVE ---
     st.subheader("💹 Equity Curve")
     
-    balance = risk_config.ACCOUNT_BALANCE
-    history = [{"Date": datetime.utcnow() - timedelta(days=30), "Balance": balance}]
+    history = [{"Date": datetime.utcnow() - timedelta(days=30), "Balance": risk_config.ACCOUNT_BALANCE}]
+    history.extend(equity_points)
     
-    sorted_trades = sorted(all_trades, key=lambda x: x.timestamp) if all_trades else []
+    # If no closed trades, append current time point to make a flat line
+    if not equity_points:
+        history.append({"Date": datetime.utcnow(), "Balance": risk_config.ACCOUNT_BALANCE})
     
-    for t in sorted_trades:
-        # Only count consolidated PnL for closed trades to avoid volatility
-        if t.status == "CLOSED" and t.pnl is not None:
-             balance += t.pnl
-             history.append({"Date": t.timestamp, "Balance": balance})
-    
-    # If no trades, append current time point to make a flat line
-    if not sorted_trades:
-        history.append({"Date": datetime.utcnow(), "Balance": balance})
-    
-    df_equity = pd.DataFrame(history)
+    # LTTB keeps the curve's shape within the chart's point budget
+    df_equity = pd.DataFrame(downsample(history, "Date", "Balance", budget=chart_points))
     
     fig_equity = go.Figure()
     fig_equity.add_trace(go.Scatter(
@@ -98,11 +94,12 @@ def app():
     with col_chart1:
         st.subheader("📊 P&L Distribution")
         
-        if closed_trades:
-            pnl_data = [t.pnl for t in closed_trades]
-            fig_pnl = go.Figure(data=[go.Histogram(
-                x=pnl_data,
-                nbinsx=20,
+        if pnl_bins:
+            # Pre-binned by SQL - draw as bars at the bin centres
+            fig_pnl = go.Figure(data=[go.Bar(
+                x=[(b["start"] + b["end"]) / 2 for b in pnl_bins],
+                y=[b["count"] for b in pnl_bins],
+                width=[b["end"] - b["start"] for b in pnl_bins],
                 marker_color='#4CAF50',
                 opacity=0.7
             )])
@@ -114,7 +111,7 @@ def app():
     with col_chart2:
         st.subheader("🎯 Win/Loss Breakdown")
         
-        if closed_trades:
+        if summary["closed"]:
             fig_pie = go.Figure(data=[go.Pie(
                 labels=['Wins', 'Losses'],
                 values=[winning_trades, losing_trades],
@@ -128,10 +125,42 @@ def app():
     
     st.markdown("---")
     
+    # --- EXECUTION QUALITY ---
+    st.subheader("⏱️ Execution Quality")
+    
+    quality = execution_quality.summarize(fills)
+    if quality["trades"]:
+        q1, q2, q3, q4 = st.columns(4)
+        q1.metric("Decision → Submit", f"{quality['avg_decision_latency_ms'] or 0:.0f} ms",
+                  delta=f"p95 {quality['p95_decision_latency_ms'] or 0:.0f} ms", delta_color="off")
+        q2.metric("Submit → Fill", f"{quality['avg_fill_latency_ms']:.0f} ms",
+                  delta=f"p95 {quality['p95_fill_latency_ms']:.0f} ms", delta_color="off")
+        q3.metric("Avg Slippage", f"{quality['avg_slippage_pips'] or 0:.2f} pips",
+                  delta=f"worst {quality['max_slippage_pips'] or 0:.2f}", delta_color="inverse")
+        q4.metric("Measured Fills", quality["trades"], delta="latest 1000", delta_color="off")
+        
+        df_exec = pd.DataFrame([{
+            "Decision → Submit (ms)": t.decision_latency_ms,
+            "Slippage (pips)": t.slippage_pips,
+            "Action": t.action,
+            "Timestamp": t.timestamp,
+        } for t in fills if t.decision_latency_ms is not None])
+        
+        if not df_exec.empty:
+            fig_exec = px.scatter(df_exec, x="Decision → Submit (ms)", y="Slippage (pips)", color="Action",
+                                  hover_data=["Timestamp"], title="Slippage vs Decision Latency",
+                                  color_discrete_map={"BUY": "#4CAF50", "SELL": "#FF5252"})
+            fig_exec.update_layout(template='plotly_dark', height=300, margin=dict(l=0, r=0, t=40, b=0))
+            st.plotly_chart(fig_exec, use_container_width=True)
+    else:
+        st.info("No fills with latency/slippage data yet")
+    
+    st.markdown("---")
+    
     # --- TRADE ANALYSIS ---
     st.subheader("🔍 Trade Analysis")
     
-    if real_trades:
+    if total_trades:
         # Trade table with filters
         col_filter1, col_filter2, col_filter3 = st.columns(3)
         
@@ -144,22 +173,26 @@ def app():
         with col_filter3:
             sort_by = st.selectbox("Sort By", ["Timestamp", "P&L", "Lot Size"])
         
-        # Apply filters
-        filtered_trades = real_trades
-        if filter_status != "ALL":
-            filtered_trades = [t for t in filtered_trades if t.status == filter_status]
-        if filter_action != "ALL":
-            filtered_trades = [t for t in filtered_trades if t.action == filter_action]
+        # Filters, sort and LIMIT run in SQL
+        db = SessionLocal()
+        filtered_trades = analytics.recent_trades(
+            db,
+            status=None if filter_status == "ALL" else filter_status,
+            action=None if filter_action == "ALL" else filter_action,
+            sort_by=sort_by
+        )
+        db.close()
+        st.caption(f"Showing up to {analytics.TRADE_TABLE_LIMIT} most relevant trades")
         
         # Parse data for table
         trade_data = []
         for t in filtered_trades:
             trade_data.append({
-                "ID": t.id[:8],
+                "ID": t.id,
                 "Timestamp": t.timestamp,
                 "Pair": t.pair,
                 "Action": t.action,
-                "Size": t.size,
+                "Size": t.lot_size,
                 "Entry": t.entry_price,
                 "Exit": t.exit_price,
                 "P&L": f"${t.pnl:.2f}" if t.pnl else "-",
@@ -198,13 +231,15 @@ def app():
                 "Status": status,
                 "Message": hb.last_message
             })
-            
-        df_hb = pd.DataFrame(hb_data)
+        
+        # Min/max buckets so a single offline beat is never averaged away
+        hb_data.reverse()
+        df_hb = pd.DataFrame(downsample(hb_data, "Timestamp", "Status", budget=chart_points, method="minmax"))
         
         fig_hb = px.scatter(df_hb, x="Timestamp", y="Status", 
                            color="Status", 
                            color_continuous_scale=["#FF5252", "#FFC107", "#4CAF50"],
-                           title="Agent Activity Timeline")
+                           title=f"Agent Activity Timeline (24h, {len(heartbeats)} beats)")
         
         fig_hb.update_layout(
             template='plotly_dark',
@@ -241,8 +276,11 @@ def app():
         st.warning("Read-only access to raw database tables")
         
         if st.checkbox("View Raw Trade Data"):
+            db = SessionLocal()
+            latest_rows = db.query(Trade).order_by(Trade.id.desc()).limit(500).all()
+            db.close()
             raw_data = []
-            for t in all_trades:
+            for t in latest_rows:
                 # Convert object to dict safely
                 raw_data.append({k: v for k, v in t.__dict__.items() if not k.startswith('_')})
             
@@ -252,15 +290,25 @@ def app():
             st.info("Trade table is empty")
     
         if st.checkbox("Custom SQL Query (Read-Only)"):
+            st.caption(f"Runs read-only on a separate connection · {query_sandbox.SANDBOX_TIMEOUT_MS // 1000}s timeout · "
+                       f"max {query_sandbox.SANDBOX_ROW_LIMIT} rows")
             query = st.text_area("Enter SQL Query (SELECT only)", "SELECT * FROM trades LIMIT 5")
-            if st.button("Run Query"):
-                if "DROP" in query.upper() or "DELETE" in query.upper() or "UPDATE" in query.upper() or "INSERT" in query.upper():
-                    st.error("❌ Only SELECT queries are allowed!")
-                else:
-                    try:
-                        db = SessionLocal()
-                        result = pd.read_sql(query, db.bind)
-                        db.close()
-                        st.dataframe(result, use_container_width=True)
-                    except Exception as e:
-                        st.error(f"Query error: {e}")
+            col_run, col_plan = st.columns(2)
+            run_clicked = col_run.button("Run Query")
+            plan_clicked = col_plan.button("Explain Plan")
+            if run_clicked or plan_clicked:
+                try:
+                    engine = query_sandbox.get_sandbox_engine()
+                    if plan_clicked:
+                        st.code("\n".join(query_sandbox.explain(engine, query)), language="text")
+                    else:
+                        result = query_sandbox.run_query(engine, query)
+                        st.dataframe(pd.DataFrame(result["rows"], columns=result["columns"]), use_container_width=True)
+                        note = f"{len(result['rows'])} rows in {result['elapsed_ms']:.0f} ms"
+                        if result["truncated"]:
+                            note += f" (truncated at {query_sandbox.SANDBOX_ROW_LIMIT})"
+                        st.caption(note)
+                except ValueError as e:
+                    st.error(f"❌ {e}")
+                except Exception as e:
+                    st.error(f"Query error: {e}")
@@ -0,0 +1,103 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from src.database.models import Trade, SessionLocal
+from src.dashboard import trade_history
+
+STATUSES = ["SUBMITTING", "PENDING", "OPEN", "CLOSED", "REJECTED", "CANCELLED"]
+
+
+@st.cache_data(ttl=300)
+def _known_pairs():
+    db = SessionLocal()
+    try:
+        return [p for (p,) in db.execute(select(Trade.pair).distinct().order_by(Trade.pair)).all()]
+    finally:
+        db.close()
+
+
+def app():
+    st.header("📜 Trade History")
+    st.caption("Every trade and decision, newest first, filterable and exportable")
+
+    # --- FILTERS ---
+    col_f1, col_f2, col_f3, col_f4 = st.columns(4)
+    with col_f1:
+        pair = st.selectbox("Pair", ["ALL"] + _known_pairs())
+    with col_f2:
+        action = st.selectbox("Action", ["ALL", "BUY", "SELL", "WAIT"])
+    with col_f3:
+        status = st.selectbox("Status", ["ALL"] + STATUSES)
+    with col_f4:
+        dates = st.date_input("Date range", value=(), help="Leave empty for all history")
+
+    filters = {
+        "pair": None if pair == "ALL" else pair,
+        "action": None if action == "ALL" else action,
+        "status": None if status == "ALL" else status,
+    }
+    if len(dates) == 2:
+        filters["start"] = datetime.combine(dates[0], datetime.min.time())
+        filters["end"] = datetime.combine(dates[1], datetime.min.time()) + timedelta(days=1)
+
+    # Cursor stack: cursors[i] is where page i starts; new filters restart at page 0
+    if st.session_state.get("history_filters") != filters:
+        st.session_state.history_filters = filters
+        st.session_state.history_cursors = [None]
+    cursors = st.session_state.history_cursors
+
+    db = SessionLocal()
+    try:
+        rows, next_cursor = trade_history.trade_page(db, cursors[-1], **filters)
+    finally:
+        db.close()
+
+    # --- PAGE ---
+    if rows:
+        df = pd.DataFrame([{
+            "ID": r.id,
+            "Timestamp": r.timestamp,
+            "Pair": r.pair,
+            "Action": r.action,
+            "Type": r.order_type or "-",
+            "Size": r.lot_size,
+            "Entry": r.entry_price,
+            "Exit": r.exit_price,
+            "P&L": f"${r.pnl:.2f}" if r.pnl is not None else "-",
+            "Status": r.status,
+            "Exit Reason": r.exit_reason or "-",
+            "Reasoning": " > ".join(r.reasoning_trace) if r.reasoning_trace else "",
+        } for r in rows])
+        st.dataframe(df, use_container_width=True, height=500)
+    else:
+        st.info("No trades match the selected filters")
+
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("← Newer", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with col_page:
+        st.caption(f"Page {len(cursors)} · {trade_history.PAGE_SIZE} rows per page")
+    with col_next:
+        if st.button("Older →", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
+
+    st.markdown("---")
+
+    # --- EXPORT ---
+    st.subheader("📥 Export")
+    st.caption(f"Exports the newest {trade_history.EXPORT_MAX_ROWS:,} rows matching the filters, "
+               f"written to disk in chunks of {trade_history.EXPORT_CHUNK_ROWS} rows")
+    fmt = st.radio("Format", ["csv", "parquet"], horizontal=True)
+    if st.button("Prepare Export"):
+        db = SessionLocal()
+        try:
+            export = trade_history.export_file(db, fmt, **filters)
+        finally:
+            db.close()
+        mime = "text/csv" if fmt == "csv" else "application/vnd.apache.parquet"
+        with export:  # Streamlit copies the file when the button is built; the temp file goes after
+            st.download_button("Download", export, f"trade_history.{fmt}", mime)
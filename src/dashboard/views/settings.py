@@ -3,7 +3,7 @@ import os
 from dotenv import set_key, load_dotenv
 from src.config import risk_config
 from src.safety.kill_switch import is_trading_enabled, enable_trading, disable_trading
-from src.safety.circuit_breaker import api_circuit_breaker
+from src.safety.circuit_breaker import ALL_BREAKERS
 
 def app():
     st.header("⚙️ System Settings")
@@ -37,18 +37,21 @@ def app():
     
     with col2:
         st.markdown("**Circuit Breaker Status**")
-        circuit_status = api_circuit_breaker.get_status()
         
-        if circuit_status['is_open']:
-            st.warning(f"⚠️ Circuit is OPEN ({circuit_status['failure_count']}/{circuit_status['max_failures']} failures)")
-            st.caption("System has halted due to repeated failures. It will auto-reset after cooldown period.")
-        else:
-            st.success(f"✅ Circuit is HEALTHY ({circuit_status['failure_count']}/{circuit_status['max_failures']} failures)")
-            st.caption("API calls are operating normally.")
+        # Shared with the agent and monitors; a reset here takes effect in every process
+        for breaker in ALL_BREAKERS:
+            circuit_status = breaker.get_status()
+            label = f"{circuit_status['name']}: {circuit_status['state']} ({circuit_status['failure_count']}/{circuit_status['max_failures']} failures)"
+            if circuit_status['is_open']:
+                st.warning(f"⚠️ {label}")
+            else:
+                st.success(f"✅ {label}")
+        st.caption("Open breakers fail fast, then let one probe call through after their cooldown.")
         
-        if st.button("🔄 Reset Circuit Breaker"):
-            api_circuit_breaker.record_success()
-            st.success("Circuit breaker reset")
+        if st.button("🔄 Reset Circuit Breakers"):
+            for breaker in ALL_BREAKERS:
+                breaker.record_success()
+            st.success("Circuit breakers reset")
             st.rerun()
     
     st.markdown("---")
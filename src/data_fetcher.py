@@ -1,4 +1,4 @@
-from src.execution.oanda_client import OandaClient
+from src.execution.oanda_client import get_oanda_client
 import pandas as pd
 
 class DataFetcher:
@@ -6,7 +6,7 @@ class DataFetcher:
     Fetches and formats real market data from OANDA for the AI Brain.
     """
     def __init__(self):
-        self.client = OandaClient()
+        self.client = get_oanda_client()
 
     def get_market_state(self, pair="EUR_USD"):
         """
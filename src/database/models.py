@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, create_engine
+from sqlalchemy import Column, Index, Integer, String, Float, DateTime, JSON, create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -32,10 +33,23 @@ class Trade(Base):
     stop_loss = Column(Float, nullable=False)
     take_profit = Column(Float, nullable=False)
     lot_size = Column(Float, nullable=False)
-    status = Column(String(10), default="OPEN")  # "OPEN" or "CLOSED"
+    status = Column(String(10), default="OPEN")  # SUBMITTING, PENDING, OPEN, CLOSED, REJECTED, CANCELLED
     exit_price = Column(Float, nullable=True)
     pnl = Column(Float, nullable=True)  # Profit/Loss in USD
     reasoning_trace = Column(JSON, nullable=True)  # Full AI reasoning chain
+    oanda_trade_id = Column(String(20), nullable=True, index=True)  # OANDA trade ID (set at fill time)
+    exit_reason = Column(String(30), nullable=True)  # e.g. STOP_LOSS_ORDER, TAKE_PROFIT_ORDER
+    closed_at = Column(DateTime, nullable=True)
+    requested_price = Column(Float, nullable=True)  # Tactical entry_price the order was sent for
+    decision_latency_ms = Column(Float, nullable=True)  # Tactical decision -> order submit
+    fill_latency_ms = Column(Float, nullable=True)  # Order submit -> fill response
+    slippage_pips = Column(Float, nullable=True)  # Positive = filled worse than requested
+    client_order_id = Column(String(64), nullable=True, unique=True, index=True)  # One row per decision (outbox key)
+    order_type = Column(String(10), nullable=True)  # MARKET, LIMIT or STOP
+    
+    __table_args__ = (
+        Index("ix_trades_timestamp_id", "timestamp", "id"),  # Keyset pagination / newest-first scans
+    )
     
     def __repr__(self):
         return f"<Trade(id={self.id}, pair={self.pair}, action={self.action}, status={self.status})>"
@@ -61,9 +75,61 @@ def create_retrying_engine(url, max_retries=5, delay=3):
                 raise e
     raise last_err
 
-import time
-engine = create_retrying_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_engine = None
+
+def get_engine():
+    """Connect on first use instead of at import time (fast agent/dashboard startup)."""
+    global _engine
+    if _engine is None:
+        set_engine(create_retrying_engine(DATABASE_URL))
+    return _engine
+
+def set_engine(new_engine):
+    """Point every SessionLocal user at a specific engine (e.g. SQLite in tests)."""
+    global _engine
+    _engine = new_engine
+    SessionLocal.configure(bind=new_engine)
+
+class LazySessionLocal:
+    """sessionmaker proxy that only connects to the database when the first session is opened."""
+    
+    def __init__(self):
+        self._factory = sessionmaker(autocommit=False, autoflush=False)
+    
+    def __call__(self, **kwargs):
+        if _engine is None:
+            get_engine()
+        return self._factory(**kwargs)
+    
+    def __getattr__(self, name):
+        return getattr(self._factory, name)
+
+SessionLocal = LazySessionLocal()
+
+def __getattr__(name):
+    # Backwards compatible `from src.database.models import engine`
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def migrate_schema(bind):
+    """
+    Add columns and indexes introduced after a table was first created.
+    create_all() never alters existing tables, so new nullable columns are added here.
+    """
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    col_type = column.type.compile(dialect=bind.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"))
+                    print(f"  [DB] Added column {table.name}.{column.name}")
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
 
 def init_db():
     """Initialize database tables with retry logic."""
@@ -71,7 +137,8 @@ def init_db():
     for i in range(max_retries):
         try:
             # create_all is idempotent - only creates if missing
-            Base.metadata.create_all(bind=engine)
+            Base.metadata.create_all(bind=get_engine())
+            migrate_schema(get_engine())
             return
         except Exception as e:
             if "starting up" in str(e).lower() and i < max_retries - 1:
@@ -0,0 +1,33 @@
+"""
+Execution Quality - Latency & Slippage Analytics
+Per-trade timing (decision -> submit -> fill) and slippage against the Tactical
+entry price, plus the aggregates shown in the Admin view.
+"""
+from typing import Any, Dict, Iterable, Optional
+import numpy as np
+
+
+def slippage_pips(action: str, requested_price: float, fill_price: float) -> float:
+    """Signed slippage in pips; positive = filled worse than requested."""
+    direction = 1.0 if action == "BUY" else -1.0
+    return round((fill_price - requested_price) * 10000 * direction, 2)
+
+
+def summarize(trades: Iterable[Any]) -> Dict[str, Optional[float]]:
+    """
+    Aggregate latency/slippage over trades that recorded them.
+    Returns averages, p95 and worst values (None when nothing was recorded).
+    """
+    rows = [t for t in trades if getattr(t, "fill_latency_ms", None) is not None]
+    summary = {"trades": len(rows)}
+
+    for field in ("decision_latency_ms", "fill_latency_ms", "slippage_pips"):
+        values = np.array([getattr(t, field) for t in rows if getattr(t, field) is not None], dtype=float)
+        if values.size == 0:
+            summary[f"avg_{field}"] = summary[f"p95_{field}"] = summary[f"max_{field}"] = None
+            continue
+        summary[f"avg_{field}"] = round(float(values.mean()), 2)
+        summary[f"p95_{field}"] = round(float(np.percentile(values, 95)), 2)
+        summary[f"max_{field}"] = round(float(values.max()), 2)
+
+    return summary
@@ -0,0 +1,414 @@
+"""
+Fake OANDA v20 Server - Offline Stand-In for Integration & Load Tests
+Implements the REST subset used by OandaClient (accounts, pricing, candles, market/
+LIMIT/STOP orders, trades, positions, transactions) over plain HTTP, with a random-walk
+price, SL/TP execution, configurable latency and error injection.
+
+Run: PYTHONPATH=. python src/execution/fake_v20_server.py --port 8765 --latency-ms 20 --error-rate 0.01
+Then point the agent at it: OANDA_URL=http://127.0.0.1:8765
+"""
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+ACCOUNT_ID = "101-001-0000000-001"
+DEFAULT_PRICES = {"EUR_USD": 1.0850, "GBP_USD": 1.2700, "USD_JPY": 148.00, "AUD_USD": 0.6550}
+GRANULARITY_SECONDS = {"M1": 60, "M5": 300, "M15": 900, "M30": 1800, "H1": 3600, "H4": 14400, "D": 86400}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _rfc3339(ts: datetime) -> str:
+    return ts.strftime("%Y-%m-%dT%H:%M:%S.%f000Z")
+
+
+def _pip(instrument: str) -> float:
+    return 0.01 if instrument.endswith("JPY") else 0.0001
+
+
+class FakeV20State:
+    """In-memory broker: prices, orders, trades and the transaction log."""
+
+    def __init__(self, balance: float = 100000.0, spread_pips: float = 1.2, volatility_pips: float = 0.5,
+                 candles_file: Optional[str] = None, seed: Optional[int] = None):
+        self.lock = threading.Lock()
+        self.rng = random.Random(seed)
+        self.balance = balance
+        self.spread_pips = spread_pips
+        self.volatility_pips = volatility_pips
+        self.mid = dict(DEFAULT_PRICES)
+        self.file_candles = self._load_candles(candles_file) if candles_file else None
+        self.trades: Dict[str, Dict[str, Any]] = {}
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.transactions: List[Dict[str, Any]] = []
+        self.next_id = 1000
+        self.requests = 0
+
+    @staticmethod
+    def _load_candles(path: str) -> List[Dict[str, Any]]:
+        """JSON list (or JSON lines) of {"time", "o", "h", "l", "c", "volume"} candles."""
+        with open(path) as f:
+            text = f.read().strip()
+        rows = json.loads(text) if text.startswith("[") else [json.loads(line) for line in text.splitlines() if line]
+        return [{"time": r["time"], "complete": True, "volume": int(r.get("volume", 1000)),
+                 "mid": {k: str(r[k]) for k in ("o", "h", "l", "c")}} for r in rows]
+
+    def _id(self) -> str:
+        self.next_id += 1
+        return str(self.next_id)
+
+    def _txn(self, **fields) -> Dict[str, Any]:
+        txn = dict(fields, id=self._id(), time=_rfc3339(_now()), accountID=ACCOUNT_ID)
+        self.transactions.append(txn)
+        return txn
+
+    # --- Market ---
+
+    def quote(self, instrument: str) -> Dict[str, float]:
+        mid = self.mid.setdefault(instrument, 1.0)
+        half = self.spread_pips * _pip(instrument) / 2
+        return {"bid": mid - half, "ask": mid + half}
+
+    def tick(self, instrument: str):
+        """Advance the random walk one step and execute any SL/TP/entry it crosses."""
+        self.mid[instrument] = self.mid.setdefault(instrument, 1.0) + \
+            self.rng.gauss(0, self.volatility_pips) * _pip(instrument)
+        self._trigger(instrument)
+
+    def set_price(self, instrument: str, mid: float):
+        with self.lock:
+            self.mid[instrument] = mid
+            self._trigger(instrument)
+
+    def candles(self, instrument: str, granularity: str, count: int) -> List[Dict[str, Any]]:
+        if self.file_candles:
+            return self.file_candles[-count:]
+        step = GRANULARITY_SECONDS.get(granularity, 300)
+        end = int(_now().timestamp()) // step * step
+        rng = random.Random(f"{instrument}{granularity}{end}")
+        price = self.mid.setdefault(instrument, 1.0)
+        candles = []
+        for i in range(count, 0, -1):
+            o = price
+            c = o + rng.gauss(0, self.volatility_pips * 4) * _pip(instrument)
+            h, l = max(o, c) + rng.random() * 3 * _pip(instrument), min(o, c) - rng.random() * 3 * _pip(instrument)
+            candles.append({"time": _rfc3339(datetime.fromtimestamp(end - i * step, timezone.utc)),
+                            "complete": True, "volume": rng.randint(100, 5000),
+                            "mid": {"o": f"{o:.5f}", "h": f"{h:.5f}", "l": f"{l:.5f}", "c": f"{c:.5f}"}})
+            price = c
+        return candles
+
+    # --- Orders & trades ---
+
+    def _open_trade(self, order: Dict[str, Any], price: float, reason: str) -> Dict[str, Any]:
+        trade_id = self._id()
+        trade = {
+            "id": trade_id, "instrument": order["instrument"], "price": f"{price:.5f}",
+            "openTime": _rfc3339(_now()), "state": "OPEN", "initialUnits": order["units"],
+            "currentUnits": order["units"], "realizedPL": "0.0", "unrealizedPL": "0.0",
+            "clientExtensions": order.get("tradeClientExtensions"),
+        }
+        for key, kind, on_fill in (("stopLossOrder", "STOP_LOSS", "stopLossOnFill"),
+                                   ("takeProfitOrder", "TAKE_PROFIT", "takeProfitOnFill")):
+            if order.get(on_fill):
+                trade[key] = {"id": self._id(), "type": kind, "tradeID": trade_id, "state": "PENDING",
+                              "price": order[on_fill]["price"]}
+        self.trades[trade_id] = trade
+        fill = self._txn(type="ORDER_FILL", orderID=order["id"], instrument=order["instrument"],
+                         units=order["units"], price=f"{price:.5f}", reason=reason,
+                         clientOrderID=(order.get("clientExtensions") or {}).get("id"),
+                         tradeOpened={"tradeID": trade_id, "units": order["units"], "price": f"{price:.5f}"},
+                         pl="0.0")
+        return fill
+
+    def _close_trade(self, trade: Dict[str, Any], price: float, reason: str):
+        units = float(trade["currentUnits"])
+        pl = (price - float(trade["price"])) * units
+        trade.update(state="CLOSED", currentUnits="0", averageClosePrice=f"{price:.5f}",
+                     realizedPL=f"{pl:.4f}", closeTime=_rfc3339(_now()))
+        self.balance += pl
+        self._txn(type="ORDER_FILL", orderID=self._id(), instrument=trade["instrument"], units=str(-units),
+                  price=f"{price:.5f}", reason=reason, pl=f"{pl:.4f}",
+                  tradesClosed=[{"tradeID": trade["id"], "units": str(-units), "price": f"{price:.5f}",
+                                 "realizedPL": f"{pl:.4f}"}])
+
+    def _trigger(self, instrument: str):
+        quote = self.quote(instrument)
+        for trade in [t for t in self.trades.values() if t["state"] == "OPEN" and t["instrument"] == instrument]:
+            long = float(trade["currentUnits"]) > 0
+            exit_price = quote["bid"] if long else quote["ask"]
+            sl = (trade.get("stopLossOrder") or {}).get("price")
+            tp = (trade.get("takeProfitOrder") or {}).get("price")
+            if sl and (exit_price <= float(sl) if long else exit_price >= float(sl)):
+                self._close_trade(trade, float(sl), "STOP_LOSS_ORDER")
+            elif tp and (exit_price >= float(tp) if long else exit_price <= float(tp)):
+                self._close_trade(trade, float(tp), "TAKE_PROFIT_ORDER")
+
+        now = _now()
+        for order in [o for o in self.orders.values() if o["state"] == "PENDING" and o["instrument"] == instrument]:
+            if order.get("gtdTime") and datetime.strptime(order["gtdTime"][:19], "%Y-%m-%dT%H:%M:%S").replace(
+                    tzinfo=timezone.utc) <= now:
+                order["state"] = "CANCELLED"
+                self._txn(type="ORDER_CANCEL", orderID=order["id"], reason="TIME_IN_FORCE_EXPIRED",
+                          clientOrderID=(order.get("clientExtensions") or {}).get("id"))
+                continue
+            if self._entry_marketable(order, quote):
+                order["state"] = "FILLED"
+                self._open_trade(order, float(order["price"]), f"{order['type']}_ORDER")
+
+    @staticmethod
+    def _entry_marketable(order: Dict[str, Any], quote: Dict[str, float]) -> bool:
+        long = float(order["units"]) > 0
+        price = float(order["price"])
+        market = quote["ask"] if long else quote["bid"]
+        if order["type"] == "LIMIT":
+            return market <= price if long else market >= price
+        return market >= price if long else market <= price  # STOP
+
+    def create_order(self, spec: Dict[str, Any]):
+        """Returns (status, body) like POST /v3/accounts/{id}/orders."""
+        client_id = (spec.get("clientExtensions") or {}).get("id")
+        if client_id and any((o.get("clientExtensions") or {}).get("id") == client_id for o in self.orders.values()):
+            return 400, {"errorCode": "CLIENT_ORDER_ID_ALREADY_EXISTS", "errorMessage": "Client order ID already exists"}
+
+        create = self._txn(type=f"{spec['type']}_ORDER", instrument=spec["instrument"], units=spec["units"],
+                           timeInForce=spec.get("timeInForce"), reason="CLIENT_ORDER",
+                           clientExtensions=spec.get("clientExtensions"))
+        order = dict(spec, id=create["id"], state="PENDING", createTime=create["time"])
+        self.orders[order["id"]] = order
+        body = {"orderCreateTransaction": create, "lastTransactionID": create["id"]}
+
+        quote = self.quote(order["instrument"])
+        if order["type"] == "MARKET" or self._entry_marketable(order, quote):
+            long = float(order["units"]) > 0
+            price = (quote["ask"] if long else quote["bid"]) if order["type"] == "MARKET" else float(order["price"])
+            order["state"] = "FILLED"
+            body["orderFillTransaction"] = self._open_trade(order, price, f"{order['type']}_ORDER")
+        return 201, body
+
+    def find(self, collection: Dict[str, Dict[str, Any]], specifier: str, ext_key: str):
+        if specifier.startswith("@"):
+            return next((x for x in collection.values()
+                         if (x.get(ext_key) or {}).get("id") == specifier[1:]), None)
+        return collection.get(specifier)
+
+    def summary(self) -> Dict[str, Any]:
+        open_trades = [t for t in self.trades.values() if t["state"] == "OPEN"]
+        return {"id": ACCOUNT_ID, "alias": "Fake", "currency": "USD", "balance": f"{self.balance:.4f}",
+                "NAV": f"{self.balance:.4f}", "openTradeCount": len(open_trades),
+                "pendingOrderCount": len([o for o in self.orders.values() if o["state"] == "PENDING"]),
+                "lastTransactionID": self.transactions[-1]["id"] if self.transactions else "1"}
+
+    def positions(self) -> List[Dict[str, Any]]:
+        sides: Dict[str, Dict[str, List[float]]] = {}  # instrument -> side -> [units, units * price]
+        for t in self.trades.values():
+            if t["state"] == "OPEN":
+                units = float(t["currentUnits"])
+                side = sides.setdefault(t["instrument"], {"long": [0.0, 0.0], "short": [0.0, 0.0]})
+                totals = side["long" if units > 0 else "short"]
+                totals[0] += units
+                totals[1] += units * float(t["price"])
+
+        def _side(units: float, notional: float) -> Dict[str, str]:
+            side = {"units": f"{units:.0f}", "pl": "0.0", "unrealizedPL": "0.0"}
+            if units:
+                side["averagePrice"] = f"{notional / units:.5f}"
+            return side
+
+        return [{"instrument": i, "long": _side(*s["long"]), "short": _side(*s["short"]),
+                 "pl": "0.0", "unrealizedPL": "0.0"} for i, s in sides.items()]
+
+
+class FakeV20Handler(BaseHTTPRequestHandler):
+    """Routes v20 REST paths to FakeV20State; latency/errors come from the server config."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+
+    ROUTES = [
+        ("GET", r"^/v3/accounts$", "accounts"),
+        ("GET", r"^/v3/accounts/[^/]+/summary$", "summary"),
+        ("GET", r"^/v3/accounts/[^/]+/pricing$", "pricing"),
+        ("GET", r"^/v3/instruments/([^/]+)/candles$", "candles"),
+        ("POST", r"^/v3/accounts/[^/]+/orders$", "create_order"),
+        ("GET", r"^/v3/accounts/[^/]+/orders/([^/]+)$", "get_order"),
+        ("GET", r"^/v3/accounts/[^/]+/openTrades$", "open_trades"),
+        ("GET", r"^/v3/accounts/[^/]+/trades$", "list_trades"),
+        ("GET", r"^/v3/accounts/[^/]+/trades/([^/]+)$", "get_trade"),
+        ("GET", r"^/v3/accounts/[^/]+/openPositions$", "open_positions"),
+        ("GET", r"^/v3/accounts/[^/]+/positions$", "positions"),
+        ("GET", r"^/v3/accounts/[^/]+/transactions/sinceid$", "transactions_since"),
+    ]
+
+    def log_message(self, format, *args):
+        pass  # Load tests would drown in access logs
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _send(self, status: int, body: Dict[str, Any]):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _dispatch(self, method: str):
+        server = self.server
+        url = urlparse(self.path)
+        query = {k: ",".join(v) for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+        if server.latency_ms:
+            time.sleep(max(0.0, server.latency_ms + server.state.rng.uniform(-1, 1) * server.jitter_ms) / 1000)
+        with server.state.lock:
+            server.state.requests += 1
+            inject = server.fail_next > 0 or server.state.rng.random() < server.error_rate
+            if server.fail_next > 0:
+                server.fail_next -= 1
+        if inject:
+            return self._send(503, {"errorMessage": "Injected fault: service unavailable"})
+
+        for route_method, pattern, name in self.ROUTES:
+            match = re.match(pattern, url.path)
+            if route_method == method and match:
+                try:
+                    with server.state.lock:
+                        status, response = getattr(self, f"_{name}")(server.state, query, body, *match.groups())
+                except (KeyError, ValueError) as e:
+                    status, response = 400, {"errorCode": "INVALID_REQUEST", "errorMessage": f"Invalid request: {e}"}
+                return self._send(status, response)
+        self._send(404, {"errorMessage": f"No route for {method} {url.path}"})
+
+    # --- Endpoints ---
+
+    def _accounts(self, state, query, body):
+        return 200, {"accounts": [{"id": ACCOUNT_ID, "tags": []}]}
+
+    def _summary(self, state, query, body):
+        return 200, {"account": state.summary(), "lastTransactionID": state.summary()["lastTransactionID"]}
+
+    def _pricing(self, state, query, body):
+        prices = []
+        for instrument in query.get("instruments", "EUR_USD").split(","):
+            state.tick(instrument)
+            q = state.quote(instrument)
+            prices.append({"type": "PRICE", "instrument": instrument, "time": _rfc3339(_now()), "tradeable": True,
+                           "bids": [{"price": f"{q['bid']:.5f}", "liquidity": 10000000}],
+                           "asks": [{"price": f"{q['ask']:.5f}", "liquidity": 10000000}],
+                           "closeoutBid": f"{q['bid']:.5f}", "closeoutAsk": f"{q['ask']:.5f}"})
+        return 200, {"prices": prices, "time": _rfc3339(_now())}
+
+    def _candles(self, state, query, body, instrument):
+        granularity = query.get("granularity", "S5")
+        count = int(query.get("count", 500))
+        return 200, {"instrument": instrument, "granularity": granularity,
+                     "candles": state.candles(instrument, granularity, count)}
+
+    def _create_order(self, state, query, body):
+        return state.create_order(body.get("order", {}))
+
+    def _get_order(self, state, query, body, specifier):
+        order = state.find(state.orders, specifier, "clientExtensions")
+        if not order:
+            return 404, {"errorCode": "ORDER_DOESNT_EXIST", "errorMessage": "The order does not exist"}
+        return 200, {"order": order, "lastTransactionID": state.summary()["lastTransactionID"]}
+
+    def _open_trades(self, state, query, body):
+        return 200, {"trades": [t for t in state.trades.values() if t["state"] == "OPEN"],
+                     "lastTransactionID": state.summary()["lastTransactionID"]}
+
+    def _list_trades(self, state, query, body):
+        ids = [i for i in query.get("ids", "").split(",") if i]
+        trades = [state.trades[i] for i in ids if i in state.trades] if ids else list(state.trades.values())
+        if query.get("state", "OPEN") != "ALL":
+            trades = [t for t in trades if t["state"] == query.get("state", "OPEN")]
+        return 200, {"trades": trades[:int(query.get("count", 50))],
+                     "lastTransactionID": state.summary()["lastTransactionID"]}
+
+    def _get_trade(self, state, query, body, specifier):
+        trade = state.find(state.trades, specifier, "clientExtensions")
+        if not trade:
+            return 404, {"errorCode": "NO_SUCH_TRADE", "errorMessage": "The Trade specified does not exist"}
+        return 200, {"trade": trade, "lastTransactionID": state.summary()["lastTransactionID"]}
+
+    def _open_positions(self, state, query, body):
+        return 200, {"positions": state.positions(), "lastTransactionID": state.summary()["lastTransactionID"]}
+
+    def _positions(self, state, query, body):
+        # Real /positions also lists flat instruments traded before; open ones are what callers read
+        return self._open_positions(state, query, body)
+
+    def _transactions_since(self, state, query, body):
+        since = int(query.get("id", 0))
+        return 200, {"transactions": [t for t in state.transactions if int(t["id"]) > since],
+                     "lastTransactionID": state.summary()["lastTransactionID"]}
+
+
+class FakeV20Server(ThreadingHTTPServer):
+    """Threaded fake v20 server; `latency_ms`, `jitter_ms`, `error_rate` and `fail_next` are live-tunable."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, state: Optional[FakeV20State] = None):
+        super().__init__((host, port), FakeV20Handler)
+        self.state = state or FakeV20State()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.fail_next = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeV20Server":
+        """Serve in a background thread (returns self for chaining)."""
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-v20", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that point OandaClient at this server."""
+        return {"OANDA_URL": self.url, "OANDA_ACCOUNT_ID": ACCOUNT_ID, "OANDA_API_KEY": "fake-token"}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fake OANDA v20 server for offline tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--candles-file", default=None)
+    args = parser.parse_args()
+
+    server = FakeV20Server(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate,
+                           FakeV20State(candles_file=args.candles_file))
+    print(f"[Fake v20] Serving on {server.url} (account {ACCOUNT_ID})")
+    print(f"[Fake v20] OANDA_URL={server.url} OANDA_ACCOUNT_ID={ACCOUNT_ID} OANDA_API_KEY=fake-token")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
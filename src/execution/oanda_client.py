@@ -1,13 +1,44 @@
 import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from urllib.parse import urlparse
 import v20
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from src.safety.circuit_breaker import guarded, oanda_pricing_breaker, oanda_orders_breaker
+from src.validation.tick_monitor import tick_monitor
 
 load_dotenv()
 
+POOL_SIZE = 10  # Keep-alive connections per host, shared by agent/monitor/dashboard threads
+
+
+def timed_call(method):
+    """Record per-endpoint latency (ms) and error counts on the client instance."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        failed = False
+        try:
+            result = method(self, *args, **kwargs)
+            failed = isinstance(result, dict) and "error" in result
+            return result
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._record_latency(method.__name__, (time.perf_counter() - started) * 1000, failed)
+    return wrapper
+
+
 class OandaClient:
     """
     Premium OANDA v20 API Wrapper.
     Handles pricing, historical data, and order execution.
+    Use get_oanda_client() for the shared process-wide instance.
     """
     def __init__(self):
         self.api_key = os.getenv("OANDA_API_KEY")
@@ -17,15 +48,84 @@ class OandaClient:
         if not all([self.api_key, self.account_id, self.url]):
             raise ValueError("OANDA credentials missing in .env")
             
-        self.client = v20.Context(
-            self.url.replace("https://", ""),
-            443,
-            True,
+        self.client = self._context(self.url)
+        self._keep_alive(self.client)
+        self._stream_client = None
+        self._stats_lock = threading.Lock()
+        self.latency = {}
+        self._fetch_pool = None
+
+    def _context(self, url):
+        """v20 context for an https:// host, or http://host:port (e.g. the fake v20 server)."""
+        parsed = urlparse(url if "://" in url else f"https://{url}")
+        ssl = parsed.scheme == "https"
+        return v20.Context(
+            parsed.hostname,
+            parsed.port or (443 if ssl else 80),
+            ssl,
             application="PremiumForexAgent",
             token=self.api_key,
             datetime_format="RFC3339"
         )
 
+    @staticmethod
+    def _keep_alive(context):
+        """Size the v20 context's requests.Session pool so concurrent callers reuse connections."""
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+        context._session.mount("https://", adapter)
+        context._session.mount("http://", adapter)
+
+    def _record_latency(self, endpoint, elapsed_ms, failed):
+        with self._stats_lock:
+            stats = self.latency.setdefault(
+                endpoint, {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0}
+            )
+            stats["calls"] += 1
+            stats["errors"] += int(failed)
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["last_ms"] = elapsed_ms
+
+    def get_latency_stats(self):
+        """Per-endpoint latency summary: calls, errors, avg/max/last ms."""
+        with self._stats_lock:
+            return {
+                endpoint: {
+                    "calls": s["calls"],
+                    "errors": s["errors"],
+                    "avg_ms": round(s["total_ms"] / s["calls"], 1),
+                    "max_ms": round(s["max_ms"], 1),
+                    "last_ms": round(s["last_ms"], 1),
+                }
+                for endpoint, s in self.latency.items()
+            }
+
+    def get_stream_context(self):
+        """v20 context for the streaming host (stream-fxpractice / stream-fxtrade)."""
+        if self._stream_client is None:
+            stream_url = os.getenv("OANDA_STREAM_URL") or self.url.replace("api-", "stream-")
+            self._stream_client = self._context(stream_url)
+        return self._stream_client
+
+    def stream_transactions(self):
+        """
+        Yield account transactions as dicts from the v20 transaction stream.
+        Heartbeats are skipped; the generator ends when the connection drops.
+        """
+        response = self.get_stream_context().transaction.stream(self.account_id)
+        for msg_type, msg in response.parts():
+            if msg_type == "transaction.Transaction":
+                yield msg.dict()
+
+    @timed_call
+    def get_transactions_since(self, transaction_id):
+        """Fetch account transactions after `transaction_id` (stream reconnect catch-up)."""
+        response = self.client.transaction.since(self.account_id, id=transaction_id)
+        if response.status != 200:
+            return []
+        return [t.dict() for t in response.get("transactions", 200)]
+
+    @timed_call
     def get_account_summary(self):
         """Fetch basic account details (Balance, NAV, etc.)"""
         response = self.client.account.summary(self.account_id)
@@ -33,6 +133,16 @@ class OandaClient:
             return {"error": response.body.get("errorMessage", "Unknown error")}
         return response.get("account", 200)
 
+    @staticmethod
+    def _format_price(p):
+        return {
+            "bid": float(p.bids[0].price),
+            "ask": float(p.asks[0].price),
+            "timestamp": p.time
+        }
+
+    @guarded(oanda_pricing_breaker)
+    @timed_call
     def get_current_price(self, pair="EUR_USD"):
         """Fetch live Bid/Ask price for a pair."""
         response = self.client.pricing.get(self.account_id, instruments=pair)
@@ -43,12 +153,32 @@ class OandaClient:
         if not prices:
             return {"error": "No price data received"}
             
-        return {
-            "bid": float(prices[0].bids[0].price),
-            "ask": float(prices[0].asks[0].price),
-            "timestamp": prices[0].time
-        }
+        quote = self._format_price(prices[0])
+        tick_monitor.observe(pair, quote)  # Every fetched quote feeds the anomaly stats
+        return quote
 
+    @guarded(oanda_pricing_breaker)
+    @timed_call
+    def get_prices(self, pairs):
+        """
+        Fetch live Bid/Ask for many pairs in one request.
+        Returns {pair: {"bid", "ask", "timestamp"}} or {"error": ...}.
+        """
+        response = self.client.pricing.get(self.account_id, instruments=",".join(pairs))
+        if response.status != 200:
+            return {"error": response.body.get("errorMessage", "Price fetch failed")}
+        
+        prices = response.get("prices", 200)
+        if not prices:
+            return {"error": "No price data received"}
+        
+        quotes = {p.instrument: self._format_price(p) for p in prices}
+        for instrument, quote in quotes.items():
+            tick_monitor.observe(instrument, quote)
+        return quotes
+
+    @guarded(oanda_pricing_breaker)
+    @timed_call
     def get_candles(self, pair="EUR_USD", granularity="H1", count=20):
         """Fetch historical candle data for AI analysis."""
         params = {"granularity": granularity, "count": count}
@@ -71,8 +201,88 @@ class OandaClient:
                 })
         return formatted_candles
 
-    def place_market_order(self, pair, units, stop_loss=None, take_profit=None):
-        """Execute a Market Order."""
+    def _pool(self):
+        if self._fetch_pool is None:
+            with self._stats_lock:
+                if self._fetch_pool is None:
+                    self._fetch_pool = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="oanda-fetch")
+        return self._fetch_pool
+
+    def get_candles_multi(self, specs):
+        """
+        Fetch several (pair, granularity, count) candle series in parallel.
+        Returns {(pair, granularity): candles}; latency is bounded by the slowest request.
+        """
+        futures = {
+            (pair, granularity): self._pool().submit(self.get_candles, pair, granularity, count)
+            for pair, granularity, count in specs
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+    def get_cycle_data(self, pair="EUR_USD", granularities=("H1", "M15", "M5"), count=20):
+        """
+        Everything one agent cycle needs, fetched in parallel round trips:
+        {"price": {...}, "candles": {granularity: [...]}}.
+        """
+        price_future = self._pool().submit(self.get_current_price, pair)
+        candles = self.get_candles_multi([(pair, g, count) for g in granularities])
+        return {
+            "price": price_future.result(),
+            "candles": {granularity: candles[(pair, granularity)] for granularity in granularities},
+        }
+
+    @timed_call
+    def get_open_trades(self):
+        """
+        Fetch all open trades in one call.
+        Returns {trade_id: {...}} or None on API error (callers must not treat that as "all closed").
+        """
+        response = self.client.trade.list_open(self.account_id)
+        if response.status != 200:
+            return None
+
+        return {
+            str(t.id): {
+                "instrument": t.instrument,
+                "units": float(t.currentUnits),
+                "price": float(t.price),
+                "unrealizedPL": float(t.unrealizedPL) if t.unrealizedPL is not None else 0.0
+            }
+            for t in response.get("trades", 200)
+        }
+
+    @timed_call
+    def get_trades_by_ids(self, trade_ids, batch_size=500):
+        """
+        Fetch trade details (incl. closed trades) for many IDs with one request per 500 IDs.
+        Returns {trade_id: {"state", "averageClosePrice", "realizedPL", "closeTime"}},
+        or None if any batch failed (a partial answer must not look like "no details").
+        """
+        trade_ids = [str(i) for i in trade_ids]
+        details = {}
+        for start in range(0, len(trade_ids), batch_size):
+            batch = trade_ids[start:start + batch_size]
+            # v20 str()s query params - a list would be sent as "['1', '2']"
+            response = self.client.trade.list(self.account_id, ids=",".join(batch), state="ALL", count=len(batch))
+            if response.status != 200:
+                return None
+            for t in response.get("trades", 200):
+                details[str(t.id)] = {
+                    "state": t.state,
+                    "averageClosePrice": float(t.averageClosePrice) if t.averageClosePrice is not None else None,
+                    "realizedPL": float(t.realizedPL) if t.realizedPL is not None else None,
+                    "closeTime": t.closeTime
+                }
+        return details
+
+    @guarded(oanda_orders_breaker, count_error_results=False)
+    @timed_call
+    def place_market_order(self, pair, units, stop_loss=None, take_profit=None, client_order_id=None):
+        """
+        Execute a Market Order.
+        `client_order_id` is attached to the order and the opened trade so a timed-out
+        submission can be looked up (get_trade_by_client_id) instead of resubmitted.
+        """
         order_spec = {
             "type": "MARKET",
             "instrument": pair,
@@ -84,23 +294,124 @@ class OandaClient:
             order_spec["stopLossOnFill"] = {"price": str(stop_loss)}
         if take_profit:
             order_spec["takeProfitOnFill"] = {"price": str(take_profit)}
+        if client_order_id:
+            order_spec["clientExtensions"] = {"id": client_order_id, "tag": "forex_agent"}
+            order_spec["tradeClientExtensions"] = {"id": client_order_id, "tag": "forex_agent"}
             
-        response = self.client.order.market(self.account_id, order=order_spec)
+        # order.market() would wrap the spec in MarketOrderRequest(order=...) and drop every field
+        response = self.client.order.create(self.account_id, order=order_spec)
         
         if response.status != 201:
-            return {"error": response.body.get("errorMessage", "Order failed")}
+            # status lets the orders breaker tell a 5xx outage from a 4xx rejection
+            return {"error": (response.body or {}).get("errorMessage", "Order failed"), "status": response.status}
             
         return response.get("orderFillTransaction", 201)
 
+    @guarded(oanda_orders_breaker, count_error_results=False)
+    @timed_call
+    def place_entry_order(self, pair, units, price, order_type="LIMIT", stop_loss=None,
+                          take_profit=None, expiry_minutes=30, client_order_id=None):
+        """
+        Rest a LIMIT or STOP entry order at `price` until filled or `expiry_minutes` (GTD).
+        Returns {"order_id", "fill_price", "trade_id"} (fill fields set if it filled at once)
+        or {"error": ...}.
+        """
+        gtd_time = datetime.now(timezone.utc) + timedelta(minutes=expiry_minutes)
+        order_spec = {
+            "type": order_type,
+            "instrument": pair,
+            "units": str(units),
+            "price": f"{price:.5f}",
+            "timeInForce": "GTD",
+            "gtdTime": gtd_time.strftime("%Y-%m-%dT%H:%M:%S.000000000Z"),
+            "positionFill": "DEFAULT"
+        }
+        
+        if stop_loss:
+            order_spec["stopLossOnFill"] = {"price": str(stop_loss)}
+        if take_profit:
+            order_spec["takeProfitOnFill"] = {"price": str(take_profit)}
+        if client_order_id:
+            order_spec["clientExtensions"] = {"id": client_order_id, "tag": "forex_agent"}
+            order_spec["tradeClientExtensions"] = {"id": client_order_id, "tag": "forex_agent"}
+        
+        response = self.client.order.create(self.account_id, order=order_spec)
+        
+        if response.status != 201:
+            # status lets the orders breaker tell a 5xx outage from a 4xx rejection
+            return {"error": (response.body or {}).get("errorMessage", "Order failed"), "status": response.status}
+        
+        created = response.get("orderCreateTransaction", 201)
+        fill = response.body.get("orderFillTransaction")
+        trade_opened = getattr(fill, "tradeOpened", None)
+        return {
+            "order_id": str(created.id),
+            "fill_price": float(fill.price) if fill is not None else None,
+            "trade_id": getattr(trade_opened, "tradeID", None)
+        }
+
+    @timed_call
+    def get_order_by_client_id(self, client_order_id):
+        """
+        Look up an order by its client ID.
+        Returns {"id", "state"} (PENDING, FILLED, TRIGGERED, CANCELLED), None if unknown, or {"error": ...}.
+        """
+        response = self.client.order.get(self.account_id, f"@{client_order_id}")
+        if response.status == 404:
+            return None
+        if response.status != 200:
+            return {"error": response.body.get("errorMessage", "Order lookup failed")}
+        
+        o = response.get("order", 200)
+        return {"id": str(o.id), "state": o.state}
+
+    @timed_call
+    def get_trade_by_client_id(self, client_order_id):
+        """
+        Look up the trade opened by an order with this client ID.
+        Returns {"id", "price", "state"}, None if no such trade exists, or {"error": ...}.
+        """
+        response = self.client.trade.get(self.account_id, f"@{client_order_id}")
+        if response.status == 404:
+            return None
+        if response.status != 200:
+            return {"error": response.body.get("errorMessage", "Trade lookup failed")}
+        
+        t = response.get("trade", 200)
+        return {"id": str(t.id), "price": float(t.price), "state": t.state}
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_oanda_client():
+    """Process-wide OandaClient: one v20 context and keep-alive pool for every caller."""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_lock:
+            if _shared_client is None:
+                _shared_client = OandaClient()
+    return _shared_client
+
+
+def reset_oanda_client():
+    """Drop the shared client (e.g. after credentials change); the next call rebuilds it."""
+    global _shared_client
+    with _shared_lock:
+        _shared_client = None
+
+
 if __name__ == "__main__":
     # Internal Test
     try:
-        trading_client = OandaClient()
+        trading_client = get_oanda_client()
         print("Connecting to OANDA...")
         summary = trading_client.get_account_summary()
         print(f"Account Balance: ${summary.balance}")
         
         price = trading_client.get_current_price("EUR_USD")
         print(f"EUR/USD Live Price: {price['bid']} / {price['ask']}")
+        print(f"Latency: {trading_client.get_latency_stats()}")
     except Exception as e:
         print(f"OANDA Client Error: {e}")
@@ -1,19 +1,154 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 from src.state import AgentState
 from src.database.models import Trade, SessionLocal
-from src.execution.oanda_client import OandaClient
+from src.execution.oanda_client import get_oanda_client
+from src.execution.execution_quality import slippage_pips
+from src.config import risk_config
+from src.safety.kill_switch import is_trading_enabled
+from src.nodes.risk_manager import calculate_position_size, calculate_risk_reward_ratio
+import hashlib
+import time
 import uuid
 
+
+def make_client_order_id(pair: str, action: str, candle_time: Optional[str]) -> str:
+    """
+    One ID per decision: the same pair/action on the same M5 candle always maps to the
+    same ID, so a graph retry after a timeout cannot open a second position.
+    """
+    if not candle_time:
+        return f"fa-{uuid.uuid4().hex[:20]}"
+    digest = hashlib.sha1(f"{pair}|{action}|{candle_time}".encode()).hexdigest()[:20]
+    return f"fa-{digest}"
+
+
+def resting_order_type(action: str, price: float, current_price: Optional[float]) -> str:
+    """
+    Order type for an entry resting at `price`: better than market -> LIMIT, worse -> STOP
+    (BUY below / SELL above price is a LIMIT). MARKET when the price is within
+    MIN_ENTRY_ORDER_DISTANCE_PIPS or there is no current price to compare against.
+    """
+    if not price or not current_price:
+        return "MARKET"
+    if abs(price - current_price) * 10000 < risk_config.MIN_ENTRY_ORDER_DISTANCE_PIPS:
+        return "MARKET"
+    below = price < current_price
+    return "LIMIT" if below == (action == "BUY") else "STOP"
+
+
+def check_resting_entry(action: str, price: float, stop_loss: float, take_profit: float) -> Tuple[bool, str]:
+    """
+    Re-run the Risk Manager's SL side and R/R checks at the resting price: the
+    approval was computed at the market entry, and a zone on the far side of the
+    SL/TP (or too close to the TP) would invert or shrink the trade.
+    """
+    rr_ratio = calculate_risk_reward_ratio(price, stop_loss, take_profit, action)
+    if rr_ratio <= 0:
+        return False, f"SL {stop_loss} / TP {take_profit} on the wrong side of the {action} entry at {price}"
+    if rr_ratio < risk_config.MIN_RISK_REWARD_RATIO:
+        return False, f"R/R ratio {rr_ratio:.2f} at {price} below minimum {risk_config.MIN_RISK_REWARD_RATIO}"
+    return True, f"R/R {rr_ratio:.2f} at {price}"
+
+
+def _mark_filled(trade: Trade, fill_price: float, oanda_trade_id: Optional[str]):
+    """Move an outbox row from SUBMITTING to OPEN with the actual fill."""
+    trade.status = "OPEN"
+    trade.entry_price = fill_price
+    trade.oanda_trade_id = oanda_trade_id
+    if trade.requested_price:
+        trade.slippage_pips = slippage_pips(trade.action, trade.requested_price, fill_price)
+
+
+def reconcile_submitting(db, client=None) -> int:
+    """
+    Resolve outbox rows left in SUBMITTING (timeout, crash or DB failure after a fill)
+    and resting PENDING entry orders by looking their client order ID up at OANDA.
+    Returns the number of rows whose status changed.
+    """
+    pending = db.query(Trade).filter(Trade.status.in_(["SUBMITTING", "PENDING"])).all()
+    if not pending:
+        return 0
+    
+    client = client or get_oanda_client()
+    resolved = 0
+    for trade in pending:
+        found = client.get_trade_by_client_id(trade.client_order_id)
+        if found is not None and "error" in found:
+            continue  # OANDA unreachable - try again next cycle
+        if found is not None:
+            _mark_filled(trade, found["price"], found["id"])
+            print(f"[OANDA Executor] Recovered fill for {trade.client_order_id} -> OANDA #{found['id']}")
+            resolved += 1
+            continue
+        
+        order = client.get_order_by_client_id(trade.client_order_id)
+        if order is not None and "error" in order:
+            continue
+        if order is None:
+            new_status = "REJECTED"  # Never reached OANDA
+        elif order["state"] == "PENDING":
+            new_status = "PENDING"
+        elif order["state"] == "CANCELLED":
+            new_status = "CANCELLED"  # FOK not filled, or GTD entry order expired
+        else:
+            continue  # FILLED/TRIGGERED - the trade lookup will find it next time
+        
+        if new_status != trade.status:
+            trade.status = new_status
+            resolved += 1
+    db.commit()
+    return resolved
+
+
+def refresh_resting_orders() -> int:
+    """Reconcile the outbox and return how many entry orders are still resting at OANDA."""
+    db = SessionLocal()
+    try:
+        reconcile_submitting(db)
+        return db.query(Trade).filter(Trade.status == "PENDING").count()
+    finally:
+        db.close()
+
+
+def _submit_entry_order(client, trade: Trade, units: int, order_type: str):
+    """
+    Rest a LIMIT/STOP order at the outbox row's requested price.
+    Returns the OANDA response dict ({"order_id", "fill_price", "trade_id"} or {"error"}).
+    """
+    try:
+        return client.place_entry_order(
+            pair=trade.pair,
+            units=units,
+            price=trade.requested_price,
+            order_type=order_type,
+            stop_loss=trade.stop_loss,
+            take_profit=trade.take_profit,
+            expiry_minutes=risk_config.ENTRY_ORDER_EXPIRY_MINUTES,
+            client_order_id=trade.client_order_id
+        )
+    except Exception as submit_error:
+        # Timeout: the order may have been accepted - ask OANDA before reporting failure
+        found = client.get_trade_by_client_id(trade.client_order_id)
+        if found and "error" not in found:
+            return {"order_id": trade.client_order_id, "fill_price": found["price"], "trade_id": found["id"]}
+        order = client.get_order_by_client_id(trade.client_order_id)
+        if order and order.get("state") == "PENDING":
+            return {"order_id": order["id"], "fill_price": None, "trade_id": None}
+        raise submit_error
+
+
 def oanda_executor_node(state: AgentState) -> Dict[str, Any]:
     """
     OANDA Executor Node - Places REAL trades in your Demo account.
     
     This replaces the mock executor. It:
     1. Checks if Risk Manager approved the trade
-    2. Places a Market Order via OANDA v20 API
-    3. Logs the trade to PostgreSQL
-    4. Returns execution confirmation
+    2. Writes a SUBMITTING outbox row keyed by a client order ID
+    3. Places a Market Order, or a GTD LIMIT/STOP entry order resting at the key zone
+       (SL/TP re-checked and lot size recomputed at that price), via OANDA v20 API
+       (looking the ID up if the call fails)
+    4. Marks the row OPEN with the fill (or PENDING while resting) and returns confirmation
     """
     
     # Extract data from state
@@ -39,84 +174,217 @@ def oanda_executor_node(state: AgentState) -> Dict[str, Any]:
     take_profit = order_details.get("take_profit", 0)
     lot_size = risk_assessment.get("lot_size", 0)
     
+    # Resting entry rests at the Architect's key zone; LIMIT vs STOP follows from where it sits
+    order_type = "MARKET"
+    current_price = state.get("technical_indicators", {}).get("Current_Price")
+    if str(order_details.get("order_type") or "MARKET").upper() in ("LIMIT", "STOP"):
+        key_zone = state.get("key_zone")
+        zone_price = (key_zone.get("price") if isinstance(key_zone, dict) else None) or entry_price
+        order_type = resting_order_type(action, zone_price, current_price)
+        if order_type != "MARKET":
+            valid, message = check_resting_entry(action, zone_price, stop_loss, take_profit)
+            if not valid:
+                return {
+                    "execution_result": {
+                        "executed": False,
+                        "reason": f"Resting entry rejected: {message}"
+                    },
+                    "reasoning_trace": [f"[OANDA Executor]: {order_type} entry not placed - {message}"]
+                }
+            # Size for the SL distance from where the order will actually fill
+            entry_price = zone_price
+            lot_size = calculate_position_size(
+                account_balance=risk_config.ACCOUNT_BALANCE,
+                risk_percentage=risk_config.MAX_RISK_PER_TRADE,
+                entry_price=entry_price,
+                stop_loss=stop_loss,
+                pair="EURUSD"
+            )
+    
     # Convert action to OANDA units (positive = BUY, negative = SELL)
     # 1 lot = 100,000 units in forex
     units = int(lot_size * 100000) if action == "BUY" else int(-lot_size * 100000)
     
-    # Initialize OANDA client
+    client_order_id = make_client_order_id(
+        "EUR_USD", action, state.get("candle_timestamps", {}).get("M5")
+    )
+    
+    db = SessionLocal()
     try:
-        client = OandaClient()
+        client = get_oanda_client()
+        reconcile_submitting(db, client)
         
-        # Place Market Order
-        order_response = client.place_market_order(
+        # === IDEMPOTENCY CHECK: this decision was already submitted (e.g. graph retry) ===
+        existing = db.query(Trade).filter(Trade.client_order_id == client_order_id).first()
+        if existing:
+            return {
+                "execution_result": {
+                    "executed": existing.status in ("OPEN", "CLOSED"),
+                    "reason": f"Duplicate decision {client_order_id} (status {existing.status})",
+                    "trade_id": existing.id,
+                    "client_order_id": client_order_id
+                },
+                "reasoning_trace": [f"[OANDA Executor]: Skipped duplicate order {client_order_id} "
+                                    f"(DB ID {existing.id}, {existing.status})"]
+            }
+        
+        # === KILL SWITCH: re-checked at submit time, not just at cycle start ===
+        if not is_trading_enabled():
+            return {
+                "execution_result": {
+                    "executed": False,
+                    "reason": "Trading disabled (kill switch)"
+                },
+                "reasoning_trace": ["[OANDA Executor]: Order not submitted - kill switch engaged during the cycle"]
+            }
+        
+        # === OUTBOX: persist intent before the order leaves the process ===
+        trade = Trade(
             pair="EUR_USD",
-            units=units,
+            action=action,
+            entry_price=entry_price,
             stop_loss=stop_loss,
-            take_profit=take_profit
+            take_profit=take_profit,
+            lot_size=lot_size,
+            status="SUBMITTING",
+            reasoning_trace=reasoning_trace,
+            client_order_id=client_order_id,
+            requested_price=entry_price,
+            order_type=order_type
         )
+        db.add(trade)
+        db.commit()
+        db.refresh(trade)
         
-        if "error" in order_response:
-            # Order failed
-            execution_result = {
-                "executed": False,
-                "reason": f"OANDA API Error: {order_response['error']}"
-            }
-            trace = f"[OANDA Executor]: ORDER FAILED - {order_response['error']}"
-        else:
-            # Order succeeded
-            order_id = order_response.id
-            actual_entry = float(order_response.price)
+        if order_type != "MARKET":
+            decided_at = order_details.get("decided_at")
+            if decided_at:
+                trade.decision_latency_ms = round((time.time() - decided_at) * 1000, 1)
+            entry_response = _submit_entry_order(client, trade, units, order_type)
             
-            # Log trade to database
-            db = SessionLocal()
-            try:
-                new_trade = Trade(
-                    pair="EUR_USD",
-                    action=action,
-                    entry_price=actual_entry,
-                    stop_loss=stop_loss,
-                    take_profit=take_profit,
-                    lot_size=lot_size,
-                    status="OPEN",
-                    reasoning_trace=reasoning_trace
-                )
-                
-                db.add(new_trade)
+            if "error" in entry_response:
+                trade.status = "REJECTED"
+                db.commit()
+                execution_result = {
+                    "executed": False,
+                    "reason": f"OANDA API Error: {entry_response['error']}"
+                }
+                trace = f"[OANDA Executor]: {order_type} ORDER FAILED - {entry_response['error']}"
+            else:
+                if entry_response["fill_price"] is not None:
+                    _mark_filled(trade, entry_response["fill_price"], entry_response["trade_id"])
+                else:
+                    trade.status = "PENDING"
                 db.commit()
-                db.refresh(new_trade)
-                
-                trade_id = new_trade.id
                 
                 execution_result = {
                     "executed": True,
-                    "order_id": order_id,
-                    "trade_id": trade_id,
+                    "pending": trade.status == "PENDING",
+                    "order_type": order_type,
+                    "order_id": entry_response["order_id"],
+                    "trade_id": trade.id,
+                    "oanda_trade_id": trade.oanda_trade_id,
+                    "client_order_id": client_order_id,
                     "timestamp": datetime.utcnow().isoformat(),
                     "pair": "EUR_USD",
                     "action": action,
-                    "entry_price": actual_entry,
+                    "entry_price": trade.entry_price,
                     "lot_size": lot_size,
                     "units": units
                 }
-                
                 trace = (
-                    f"[OANDA Executor]: TRADE EXECUTED - "
-                    f"Order ID: {order_id}, DB ID: {trade_id}, "
-                    f"{action} {lot_size} lots EUR/USD @ {actual_entry}"
+                    f"[OANDA Executor]: {order_type} ENTRY {trade.status} - "
+                    f"Order ID: {entry_response['order_id']}, DB ID: {trade.id}, "
+                    f"{action} {lot_size} lots EUR/USD @ {entry_price} "
+                    f"(expires in {risk_config.ENTRY_ORDER_EXPIRY_MINUTES} min)"
                 )
-                
-            except Exception as db_error:
-                db.rollback()
-                trace = f"[OANDA Executor]: Trade executed but DB logging failed - {str(db_error)}"
-            finally:
-                db.close()
+            return {
+                "execution_result": execution_result,
+                "reasoning_trace": [trace]
+            }
+        
+        # Place Market Order (FOK: the 201 response carries the fill)
+        submitted_at = time.time()
+        try:
+            order_response = client.place_market_order(
+                pair="EUR_USD",
+                units=units,
+                stop_loss=stop_loss,
+                take_profit=take_profit,
+                client_order_id=client_order_id
+            )
+        except Exception as submit_error:
+            # Timeout/connection drop: the order may still have filled - ask OANDA
+            found = client.get_trade_by_client_id(client_order_id)
+            if not found or "error" in found:
+                raise submit_error
+            order_response = None
+        fill_latency_ms = round((time.time() - submitted_at) * 1000, 1)
+        decided_at = order_details.get("decided_at")
+        trade.fill_latency_ms = fill_latency_ms
+        trade.decision_latency_ms = round((submitted_at - decided_at) * 1000, 1) if decided_at else None
+        
+        if isinstance(order_response, dict) and "error" in order_response:
+            # Order failed
+            trade.status = "REJECTED"
+            db.commit()
+            execution_result = {
+                "executed": False,
+                "reason": f"OANDA API Error: {order_response['error']}"
+            }
+            trace = f"[OANDA Executor]: ORDER FAILED - {order_response['error']}"
+        else:
+            # Order succeeded
+            if order_response is not None:
+                order_id = order_response.id
+                actual_entry = float(order_response.price)
+                # OANDA trade ID links this row to fills on the transaction stream
+                trade_opened = getattr(order_response, "tradeOpened", None)
+                oanda_trade_id = getattr(trade_opened, "tradeID", None)
+            else:
+                order_id = client_order_id
+                actual_entry = found["price"]
+                oanda_trade_id = found["id"]
+            
+            _mark_filled(trade, actual_entry, oanda_trade_id)
+            db.commit()
+            
+            execution_result = {
+                "executed": True,
+                "order_id": order_id,
+                "trade_id": trade.id,
+                "oanda_trade_id": oanda_trade_id,
+                "client_order_id": client_order_id,
+                "timestamp": datetime.utcnow().isoformat(),
+                "pair": "EUR_USD",
+                "action": action,
+                "entry_price": actual_entry,
+                "lot_size": lot_size,
+                "units": units,
+                "decision_latency_ms": trade.decision_latency_ms,
+                "fill_latency_ms": fill_latency_ms,
+                "slippage_pips": trade.slippage_pips
+            }
+            
+            trace = (
+                f"[OANDA Executor]: TRADE EXECUTED - "
+                f"Order ID: {order_id}, DB ID: {trade.id}, "
+                f"{action} {lot_size} lots EUR/USD @ {actual_entry} "
+                f"(slippage {trade.slippage_pips} pips, decision->submit {trade.decision_latency_ms} ms, "
+                f"fill {fill_latency_ms} ms)"
+            )
                 
     except Exception as e:
+        # Any SUBMITTING row left behind is resolved by reconcile_submitting() next cycle
+        db.rollback()
         execution_result = {
             "executed": False,
-            "reason": f"Execution error: {str(e)}"
+            "reason": f"Execution error: {str(e)}",
+            "client_order_id": client_order_id
         }
         trace = f"[OANDA Executor]: EXECUTION FAILED - {str(e)}"
+    finally:
+        db.close()
     
     return {
         "execution_result": execution_result,
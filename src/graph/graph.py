@@ -1,26 +1,55 @@
-from langgraph.graph import StateGraph, END
 from src.state import AgentState
+from src.nodes.pre_screen import pre_screen_node
 from src.nodes.strategist import strategist_node
 from src.nodes.architect import architect_node
 
 from src.nodes.tactical import tactical_node
 from src.nodes.risk_manager import risk_manager_node
 from src.execution.oanda_executor import oanda_executor_node
+from src.graph.layer_cache import cached_layer
 
-def create_graph():
+def create_graph(use_pre_screen: bool = True):
+    """
+    Build the agent graph.
+    `use_pre_screen=False` starts directly at the Strategist (synthetic test states
+    without live price data would otherwise be stopped by the gate).
+    """
+    # langgraph is heavy - import on first graph build, not at module import
+    from langgraph.graph import StateGraph, END
+    
     workflow = StateGraph(AgentState)
     
     # Add Nodes
-    workflow.add_node("strategist", strategist_node)
-    workflow.add_node("architect", architect_node)
+    # Upper layers only re-run when their own timeframe closes a new candle
+    workflow.add_node("strategist", cached_layer("Strategist", "H1", strategist_node))
+    workflow.add_node("architect", cached_layer("Architect", "M15", architect_node, depends_on=("current_bias",)))
     workflow.add_node("tactical", tactical_node)
     workflow.add_node("risk_manager", risk_manager_node)
     workflow.add_node("executor", oanda_executor_node)
     
     # Set Entry Point
-    workflow.set_entry_point("strategist")
+    if use_pre_screen:
+        workflow.add_node("pre_screen", pre_screen_node)
+        workflow.set_entry_point("pre_screen")
+    else:
+        workflow.set_entry_point("strategist")
     
     # Conditional Edge Logic
+    def pre_screen_router(state: AgentState):
+        if not state.get("pre_screen", {}).get("passed", True):
+            return "end" # No trade possible - skip the LLM chain
+        return "strategist"
+    
+    if use_pre_screen:
+        workflow.add_conditional_edges(
+            "pre_screen",
+            pre_screen_router,
+            {
+                "end": END,
+                "strategist": "strategist"
+            }
+        )
+    
     def router(state: AgentState):
         bias = state.get("current_bias")
         if bias == "RISK_OFF":
@@ -0,0 +1,87 @@
+"""
+Layer Cache - Tiered Evaluation for Upper Timeframe Nodes
+Keeps the last Strategist (H1) and Architect (15M) output together with the candle
+it was computed on, so those layers only call the LLM when a new candle closes.
+"""
+from typing import Any, Callable, Dict, Optional, Tuple
+from src.state import AgentState
+
+
+class LayerCache:
+    """Last output per layer, keyed by the candle (and upstream inputs) it was computed on."""
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+    def get(self, layer: str, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Return the cached output if it was computed on the same key."""
+        entry = self._entries.get(layer)
+        if entry and entry["key"] == key:
+            self.hits[layer] = self.hits.get(layer, 0) + 1
+            return entry["output"]
+        self.misses[layer] = self.misses.get(layer, 0) + 1
+        return None
+
+    def put(self, layer: str, key: Tuple, output: Dict[str, Any]):
+        """Store a fresh layer output."""
+        self._entries[layer] = {"key": key, "output": output}
+
+    def clear(self):
+        """Forget all cached outputs (forces a full re-evaluation)."""
+        self._entries.clear()
+
+    def get_status(self) -> Dict:
+        """Get cache statistics (hits = LLM calls saved)."""
+        return {
+            layer: {
+                "hits": self.hits.get(layer, 0),
+                "misses": self.misses.get(layer, 0),
+                "candle": self._entries.get(layer, {}).get("key", (None,))[0],
+            }
+            for layer in sorted(set(self.hits) | set(self.misses))
+        }
+
+
+def cached_layer(
+    layer: str,
+    timeframe: str,
+    node: Callable[[AgentState], Dict[str, Any]],
+    depends_on: Tuple[str, ...] = (),
+    cache: Optional[LayerCache] = None,
+) -> Callable[[AgentState], Dict[str, Any]]:
+    """
+    Wrap a node so it reuses its last output until its timeframe closes a new candle.
+
+    `depends_on` lists state keys produced upstream (e.g. the Architect depends on
+    `current_bias`); a change in any of them also invalidates the cached output.
+    """
+    def wrapper(state: AgentState) -> Dict[str, Any]:
+        store = cache if cache is not None else layer_cache
+        candle_time = state.get("candle_timestamps", {}).get(timeframe)
+        if candle_time is None:
+            # No candle info (e.g. manual test state) -> always evaluate
+            return node(state)
+
+        key = (candle_time,) + tuple(str(state.get(k)) for k in depends_on)
+        cached = store.get(layer, key)
+        if cached is not None:
+            output = dict(cached)
+            output["reasoning_trace"] = [
+                f"{entry} [Cached {timeframe} @ {candle_time}]" for entry in cached.get("reasoning_trace", [])
+            ]
+            return output
+
+        output = node(state)
+
+        # Never pin a fallback answer for a whole candle - retry the LLM next cycle
+        if not any("(Fallback)" in entry for entry in output.get("reasoning_trace", [])):
+            store.put(layer, key, output)
+        return output
+
+    return wrapper
+
+
+# Global instance (shared across graph rebuilds within the agent process)
+layer_cache = LayerCache()
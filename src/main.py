@@ -1,27 +1,43 @@
 import os
 import time
 from datetime import datetime
-from src.graph.graph import create_graph
-from src.execution.oanda_client import OandaClient
+from src.execution.oanda_client import get_oanda_client
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # Safety imports
-from src.safety.kill_switch import is_trading_enabled
+from src.safety.kill_switch import is_trading_enabled, kill_switch
 from src.safety.circuit_breaker import api_circuit_breaker
 from src.validation.data_validator import validator
+from src.validation.tick_monitor import tick_monitor
+from src.scheduling.candle_scheduler import CandleScheduler
+from src.graph.layer_cache import layer_cache
+from src.nodes.pre_screen import pre_screen_stats
 
 # Configuration
-RUN_INTERVAL_MINUTES = 15  # Increased to 15m to respect Gemini Free Tier limits
+CYCLE_GRANULARITY = "M15"  # Run after every 15M candle close to respect Gemini Free Tier limits
+                           # ("M5" = Tactical cadence; Strategist/Architect are cached until their candle closes)
 RUN_ONCE = False  # Set to False for continuous loop
 
+scheduler = CandleScheduler(cycle_granularity=CYCLE_GRANULARITY)
+_graph = None
+
+def get_graph():
+    """Build and compile the agent graph once per process (imports langgraph on first use)."""
+    global _graph
+    if _graph is None:
+        from src.graph.graph import create_graph
+        _graph = create_graph()
+    return _graph
+
 def fetch_live_market_data():
     """Fetch real-time market data from OANDA (Deep History)."""
-    client = OandaClient()
+    client = get_oanda_client()
     
-    # Fetch current price
-    price = client.get_current_price("EUR_USD")
+    # Price + H1/M15/M5 candles in parallel round trips (bounded by the slowest request)
+    cycle_data = client.get_cycle_data("EUR_USD", granularities=("H1", "M15", "M5"), count=20)
+    price = cycle_data["price"]
     
     # === DATA VALIDATION ===
     is_valid, message = validator.validate_price(price)
@@ -31,14 +47,23 @@ def fetch_live_market_data():
     
     # --- LIGHTWEIGHT MODE (Rate Limit Safe) ---
     # Fetch just enough for calculation
-    h1_candles = client.get_candles("EUR_USD", granularity="H1", count=20)
-    m15_candles = client.get_candles("EUR_USD", granularity="M15", count=20)
+    h1_candles = cycle_data["candles"]["H1"]
+    m15_candles = cycle_data["candles"]["M15"]
+    m5_candles = cycle_data["candles"]["M5"]
     
-    # Validate candle data
-    is_valid, message = validator.validate_candles(h1_candles)
-    if not is_valid:
-        print(f"[DATA VALIDATION] {message}")
-        raise ValueError(f"Invalid candle data: {message}")
+    # Validate candle data (M15/M5 times also key the scheduler's change check and the order ID)
+    for granularity, candles in (("H1", h1_candles), ("M15", m15_candles), ("M5", m5_candles)):
+        is_valid, message = validator.validate_candles(candles)
+        if not is_valid:
+            print(f"[DATA VALIDATION] {granularity}: {message}")
+            raise ValueError(f"Invalid candle data ({granularity}): {message}")
+    
+    # Tick anomalies (stale quote, spread spike, jump vs recent volatility) gate entries in the pre-screen;
+    # seeded only from validated M5 candles
+    tick_monitor.seed_returns("EUR_USD", [c['close'] for c in m5_candles], interval_seconds=300)
+    tick_ok, tick_message = tick_monitor.last_verdict("EUR_USD")
+    if not tick_ok:
+        print(f"[TICK MONITOR] {tick_message}")
     
     # Calculate simple indicators locally to save tokens
     h1_closes = [c['close'] for c in h1_candles]
@@ -66,13 +91,19 @@ def fetch_live_market_data():
         "risk_environment": {
             "VIX": 15,
             "Spread": abs(price.get('ask', 0.0) - price.get('bid', 0.0)),
+            "Tick_Anomaly": None if tick_ok else tick_message,
+        },
+        "candle_timestamps": {
+            "H1": h1_candles[-1]['time'],
+            "M15": m15_candles[-1]['time'],
+            "M5": m5_candles[-1]['time'],
         },
         "reasoning_trace": []
     }
 
 def run_agent_cycle():
     """Single execution cycle of the trading agent."""
-    graph = create_graph()
+    graph = get_graph()
     
     # --- ADAPTIVE LEARNING: Self-Reflection ---
     from src.nodes.evaluator import get_learning_context
@@ -97,9 +128,22 @@ def run_agent_cycle():
     print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Fetching live market data from OANDA...")
     initial_state = fetch_live_market_data()
     
+    # === UNCHANGED INPUT CHECK ===
+    # No new candle since the last cycle (weekend, broker lag) -> same prompt, wasted LLM calls
+    if not scheduler.inputs_changed(initial_state["candle_timestamps"]):
+        print(f"[SCHEDULER] No new candles since last cycle. Skipping. {initial_state['candle_timestamps']}")
+        return False
+    
     # Inject learning context into the state
     initial_state["learning_context"] = learning_summary
     
+    # Resting LIMIT/STOP entries make the Tactical call redundant until they fill or expire
+    from src.execution.oanda_executor import refresh_resting_orders
+    try:
+        initial_state["resting_orders"] = refresh_resting_orders()
+    except Exception as e:
+        print(f"  Resting order check skipped: {e}")
+    
     print("Running AI Analysis Chain...")
     
     # Smart Retry Logic for Free Tier Limits
@@ -115,7 +159,12 @@ def run_agent_cycle():
                   f"Structure: {result.get('market_structure')} | "
                   f"Decision: {result.get('trade_decision')}")
             
-            if result.get('execution_result', {}).get('executed'):
+            if result.get('execution_result', {}).get('pending'):
+                exec_result = result['execution_result']
+                print(f"[OK] {exec_result.get('order_type')} ENTRY RESTING: {exec_result.get('action')} "
+                      f"{exec_result.get('lot_size')} lots @ {exec_result.get('entry_price')}")
+                print(f"  Order ID: {exec_result.get('order_id')}")
+            elif result.get('execution_result', {}).get('executed'):
                 exec_result = result['execution_result']
                 print(f"[OK] TRADE EXECUTED: {exec_result.get('action')} "
                       f"{exec_result.get('lot_size')} lots @ {exec_result.get('entry_price')}")
@@ -124,7 +173,10 @@ def run_agent_cycle():
                 # --- PROFESSIONAL OBSERVABILITY UPGRADE ---
                 exec_res = result.get('execution_result', {})
                 risk_res = result.get('risk_assessment', {})
-                reason = exec_res.get('reason') or risk_res.get('rejection_reason') or 'Setup not met'
+                pre_res = result.get('pre_screen', {})
+                reason = (exec_res.get('reason') or risk_res.get('rejection_reason')
+                          or (pre_res.get('reason') if not pre_res.get('passed', True) else None)
+                          or 'Setup not met')
                 
                 print(f"[X] No trade: {reason}")
                 
@@ -158,6 +210,8 @@ def run_agent_cycle():
             
             # Record success for circuit breaker
             api_circuit_breaker.record_success()
+            # Only a completed cycle consumes its candles; a failed one is retried on the same inputs
+            scheduler.record_cycle(initial_state["candle_timestamps"])
             return True # Success
             
             
@@ -186,6 +240,8 @@ def main():
     print(f"Started: {datetime.now()}")
     print(f"Mode: {'SINGLE RUN' if RUN_ONCE else 'CONTINUOUS'}")
     print(f"Pair: EUR/USD")
+    # Watch the flag file so the executor's pre-submit check reads a cached flag
+    print(f"Kill switch: {kill_switch.start().get_status()}")
     print("="*60)
     
     if RUN_ONCE:
@@ -196,7 +252,7 @@ def main():
         print("="*60)
     else:
         # Continuous loop
-        print(f"Running every {RUN_INTERVAL_MINUTES} minutes. Press Ctrl+C to stop.\n")
+        print(f"Running after every {CYCLE_GRANULARITY} candle close. Press Ctrl+C to stop.\n")
         
         while True:
             try:
@@ -212,8 +268,17 @@ def main():
                     print(f"Heartbeat Error: {db_err}")
 
                 run_agent_cycle()
-                print(f"\nNext check in {RUN_INTERVAL_MINUTES} minutes...")
-                time.sleep(RUN_INTERVAL_MINUTES * 60)
+                
+                # --- CANDLE-ALIGNED WAIT (no drift from cycle duration) ---
+                status = scheduler.get_status()
+                print(f"\nNext check at {status['next_wake']} (in {scheduler.seconds_until_next_close():.0f}s) | "
+                      f"Jitter avg/max: {status['avg_jitter_ms']}/{status['max_jitter_ms']} ms | "
+                      f"Skipped: {status['cycles_skipped']}")
+                print(f"[LAYER CACHE] {layer_cache.get_status()}")
+                print(f"[PRE-SCREEN] {pre_screen_stats.get_status()}")
+                print(f"[OANDA LATENCY] {get_oanda_client().get_latency_stats()}")
+                closed = scheduler.wait_for_next_close()
+                print(f"[SCHEDULER] Candle close: {', '.join(closed)} (jitter {scheduler.last_jitter_ms:.0f} ms)")
             except KeyboardInterrupt:
                 print("\n\nAgent stopped by user.")
                 break
@@ -4,25 +4,73 @@ Monitors open positions on OANDA and updates database with exit data.
 """
 import time
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import numpy as np
+from sqlalchemy import update, bindparam
 from src.database.models import Trade, SessionLocal
-from src.execution.oanda_client import OandaClient
+from src.execution.oanda_client import get_oanda_client
 from src.config import risk_config
+from src.monitoring.poll_scheduler import AdaptivePollScheduler, average_true_range
+
+# Only the columns needed to close a trade (no ORM objects / JSON reasoning traces)
+OPEN_TRADE_COLUMNS = (
+    Trade.id, Trade.pair, Trade.action, Trade.entry_price,
+    Trade.stop_loss, Trade.take_profit, Trade.lot_size, Trade.oanda_trade_id,
+)
+
+ATR_REFRESH_SECONDS = 300  # M5 ATR per instrument is refreshed at most every 5 minutes
+
+# DB pair spelling ("EURUSD" / "EUR_USD") -> OANDA instrument, built once
+INSTRUMENT_SYMBOLS: Dict[str, str] = {}
+for _pair in risk_config.PIP_VALUE_PER_LOT:
+    INSTRUMENT_SYMBOLS[_pair] = INSTRUMENT_SYMBOLS[f"{_pair[:3]}_{_pair[3:]}"] = f"{_pair[:3]}_{_pair[3:]}"
+
+def to_instrument(pair: str) -> str:
+    """Map a DB pair to its OANDA instrument (memoized for unknown pairs)."""
+    symbol = INSTRUMENT_SYMBOLS.get(pair)
+    if symbol is None:
+        raw = pair.replace("_", "")
+        symbol = INSTRUMENT_SYMBOLS[pair] = f"{raw[:3]}_{raw[3:]}"
+    return symbol
+
+def calculate_pnl_batch(actions, entry_prices, exit_prices, lot_sizes, pairs) -> np.ndarray:
+    """Vectorized P&L: signed pip distance x pip value per lot x lots."""
+    direction = np.where(np.asarray(actions) == "BUY", 1.0, -1.0)
+    pip_values = np.array([risk_config.get_pip_value(to_instrument(p).replace("_", "")) for p in pairs])
+    pips = (np.asarray(exit_prices, dtype=float) - np.asarray(entry_prices, dtype=float)) * 10000
+    return pips * direction * pip_values * np.asarray(lot_sizes, dtype=float)
+
+# One executemany UPDATE for all closed trades; rows closed meanwhile (e.g. by the
+# transaction stream tracker) are left untouched by the status guard
+_CLOSE_TRADES = (
+    update(Trade.__table__)
+    .where(Trade.__table__.c.id == bindparam("b_id"))
+    .where(Trade.__table__.c.status == "OPEN")
+    .values(
+        status="CLOSED",
+        exit_price=bindparam("b_exit_price"),
+        pnl=bindparam("b_pnl"),
+        closed_at=bindparam("b_closed_at"),
+    )
+)
 
 class TradeExitMonitor:
     """Monitors and updates trade exits."""
     
-    def __init__(self, check_interval_seconds: int = 60):
-        self.client = OandaClient()
+    def __init__(self, check_interval_seconds: int = 60, client=None):
+        self.client = client or get_oanda_client()
         self.check_interval = check_interval_seconds
+        self.scheduler = AdaptivePollScheduler(base_seconds=check_interval_seconds)
+        self._atr_cache: Dict[str, Any] = {}  # instrument -> (atr, fetched_at)
+        self._sweep_error = False
     
-    def get_open_positions_from_oanda(self) -> Dict[str, Any]:
-        """Fetch current open positions from OANDA."""
+    def get_open_positions_from_oanda(self) -> Optional[Dict[str, Any]]:
+        """Fetch current open positions from OANDA (None if the request failed)."""
         try:
             response = self.client.client.position.list(self.client.account_id)
             if response.status != 200:
                 print(f"[Exit Monitor] Error fetching positions: {response.status}")
-                return {}
+                return None
             
             positions = response.get("positions", 200)
             
@@ -45,7 +93,7 @@ class TradeExitMonitor:
             return position_dict
         except Exception as e:
             print(f"[Exit Monitor] Exception fetching positions: {e}")
-            return {}
+            return None
     
     def calculate_pnl(self, trade: Trade, exit_price: float) -> float:
         """Calculate P&L for a closed trade."""
@@ -63,79 +111,191 @@ class TradeExitMonitor:
             else:
                 return -pip_distance * pip_value  # Loss
     
-    def check_and_update_exits(self):
-        """Main monitoring loop - checks for closed trades."""
+    def _close_updates(self, rows, exit_prices, broker_pnl=None) -> List[Dict[str, Any]]:
+        """Compute P&L for all closed rows at once and build the bulk UPDATE parameters."""
+        if not rows:
+            return []
+        pnl = calculate_pnl_batch(
+            [r.action for r in rows], [r.entry_price for r in rows],
+            exit_prices, [r.lot_size for r in rows], [r.pair for r in rows]
+        )
+        if broker_pnl is not None:
+            # Prefer OANDA's realized P&L where available
+            broker_pnl = np.asarray(broker_pnl, dtype=float)
+            pnl = np.where(np.isnan(broker_pnl), pnl, broker_pnl)
+        
+        now = datetime.utcnow()
+        return [
+            {"b_id": row.id, "b_exit_price": float(x), "b_pnl": float(p), "b_closed_at": now}
+            for row, x, p in zip(rows, exit_prices, pnl)
+        ]
+    
+    def reconcile_by_trade_id(self, tracked: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Trade-level reconciliation: one call for all open OANDA trades, a set diff
+        against the DB, then one batched lookup for the closed trades' fills.
+        Returns bulk UPDATE parameters for the closed trades.
+        """
+        if not tracked:
+            return []
+        
+        open_ids = self.client.get_open_trades()
+        if open_ids is None:
+            print("[Exit Monitor] Could not fetch open trades - skipping sweep")
+            self._sweep_error = True
+            return []
+        
+        closed_ids = tracked.keys() - open_ids.keys()
+        if not closed_ids:
+            return []
+        
+        details = self.client.get_trades_by_ids(closed_ids)
+        if details is None:
+            print("[Exit Monitor] Could not fetch closed trade details - skipping sweep")
+            self._sweep_error = True
+            return []
+        
+        rows, exit_prices, broker_pnl = [], [], []
+        for trade_id in closed_ids:
+            fill = details.get(trade_id)
+            if not fill or fill.get("state") != "CLOSED":
+                continue  # No details yet, or not closed after all (list_open raced a fill) - retried next sweep
+            
+            row = tracked[trade_id]
+            rows.append(row)
+            exit_prices.append(fill.get("averageClosePrice") or row.stop_loss)  # Conservative fallback
+            pnl = fill.get("realizedPL")
+            broker_pnl.append(np.nan if pnl is None else pnl)
+        
+        return self._close_updates(rows, exit_prices, broker_pnl)
+    
+    def reconcile_by_instrument(self, legacy_rows: List[Any]) -> List[Dict[str, Any]]:
+        """Instrument-level fallback for rows logged before OANDA trade IDs were stored."""
+        if not legacy_rows:
+            return []
+        
+        # Get current OANDA positions
+        oanda_positions = self.get_open_positions_from_oanda()
+        if oanda_positions is None:
+            print("[Exit Monitor] Could not fetch positions - skipping legacy rows")
+            self._sweep_error = True
+            return []
+        
+        # Rows whose instrument no longer has a position have been closed
+        closed_rows = [r for r in legacy_rows if to_instrument(r.pair) not in oanda_positions]
+        if not closed_rows:
+            return []
+        
+        # One price request per instrument
+        current_prices = {}
+        for instrument in {to_instrument(r.pair) for r in closed_rows}:
+            try:
+                price_data = self.client.get_current_price(instrument)
+                if 'error' not in price_data:
+                    current_prices[instrument] = price_data['bid']
+            except:
+                pass
+        
+        # Fallback: SL is the conservative assumption when no price is available
+        exit_prices = [current_prices.get(to_instrument(r.pair), r.stop_loss) for r in closed_rows]
+        return self._close_updates(closed_rows, exit_prices)
+    
+    def get_atr(self, instrument: str) -> Optional[float]:
+        """M5 ATR for an instrument, cached for ATR_REFRESH_SECONDS."""
+        cached = self._atr_cache.get(instrument)
+        if cached and time.time() - cached[1] < ATR_REFRESH_SECONDS:
+            return cached[0]
+        atr = average_true_range(self.client.get_candles(instrument, granularity="M5", count=15))
+        self._atr_cache[instrument] = (atr, time.time())
+        return atr
+    
+    def nearest_exit_distance_atr(self, open_rows: List[Any]) -> Optional[float]:
+        """Smallest distance from current price to any open SL/TP, in ATRs (None if unknown)."""
+        if not open_rows:
+            return None
+        try:
+            nearest = None
+            instruments = sorted({to_instrument(r.pair) for r in open_rows})
+            prices = self.client.get_prices(instruments)  # One request for every open instrument
+            if 'error' in prices:
+                return None
+            for instrument in instruments:
+                price = prices.get(instrument)
+                atr = self.get_atr(instrument)
+                if not price or not atr:
+                    continue
+                mid = (price['bid'] + price['ask']) / 2
+                for row in open_rows:
+                    if to_instrument(row.pair) != instrument:
+                        continue
+                    distance = min(abs(mid - row.stop_loss), abs(mid - row.take_profit)) / atr
+                    nearest = distance if nearest is None else min(nearest, distance)
+            return nearest
+        except Exception as e:
+            print(f"[Exit Monitor] Proximity check skipped: {e}")
+            return None
+    
+    def check_and_update_exits(self) -> Dict[str, Any]:
+        """
+        Main monitoring loop - checks for closed trades.
+        Returns a sweep summary used to pick the next polling interval.
+        """
         db = SessionLocal()
+        self._sweep_error = False
+        summary = {"open_trades": 0, "closed": 0, "min_distance_atr": None, "api_error": False}
         
         try:
-            # Get all open trades from database
-            open_trades = db.query(Trade).filter(Trade.status == "OPEN").all()
+            # Get all open trades from database (plain rows, not ORM objects)
+            open_rows = db.query(*OPEN_TRADE_COLUMNS).filter(Trade.status == "OPEN").all()
             
-            if not open_trades:
+            if not open_rows:
                 print("[Exit Monitor] No open trades to monitor")
-                return
+                return summary
             
-            # Get current OANDA positions
-            oanda_positions = self.get_open_positions_from_oanda()
+            tracked = {r.oanda_trade_id: r for r in open_rows if r.oanda_trade_id}
+            legacy = [r for r in open_rows if not r.oanda_trade_id]
             
-            # Get current market price for each pair
-            current_prices = {}
-            for trade in open_trades:
-                pair = trade.pair.replace('USD', '_USD').replace('EUR', 'EUR_')  # Format for OANDA
-                if pair not in current_prices:
-                    try:
-                        price_data = self.client.get_current_price(pair)
-                        if 'error' not in price_data:
-                            current_prices[pair] = price_data
-                    except:
-                        pass
+            updates = self.reconcile_by_trade_id(tracked) + self.reconcile_by_instrument(legacy)
+            if updates:
+                db.execute(_CLOSE_TRADES, updates)
+            db.commit()
             
-            # Check each open trade
-            for trade in open_trades:
-                pair = trade.pair.replace('USD', '_USD').replace('EUR', 'EUR_')
-                
-                # If trade is not in OANDA positions, it has been closed
-                if pair not in oanda_positions:
-                    print(f"[Exit Monitor] Trade {trade.id} closed on OANDA")
-                    
-                    # Determine exit price
-                    if pair in current_prices:
-                        exit_price = current_prices[pair]['bid']
-                    else:
-                        # Fallback: use SL or TP based on which was likely hit
-                        exit_price = trade.stop_loss  # Conservative assumption
-                    
-                    # Calculate P&L
-                    pnl = self.calculate_pnl(trade, exit_price)
-                    
-                    # Update trade record
-                    trade.status = "CLOSED"
-                    trade.exit_price = exit_price
-                    trade.pnl = pnl
-                    
-                    print(f"  Trade ID: {trade.id}, Exit: {exit_price}, P&L: ${pnl:.2f}")
+            print(f"[Exit Monitor] Updated {len(updates)} closed trades ({len(open_rows)} checked)")
             
-            db.commit()
-            print(f"[Exit Monitor] Updated {len([t for t in open_trades if t.status == 'CLOSED'])} closed trades")
+            closed_ids = {u["b_id"] for u in updates}
+            still_open = [r for r in open_rows if r.id not in closed_ids]
+            summary["open_trades"] = len(still_open)
+            summary["closed"] = len(updates)
+            if not self._sweep_error:
+                summary["min_distance_atr"] = self.nearest_exit_distance_atr(still_open)
             
         except Exception as e:
             print(f"[Exit Monitor] Error: {e}")
             db.rollback()
+            self._sweep_error = True
         finally:
             db.close()
+        
+        summary["api_error"] = self._sweep_error
+        return summary
     
     def run_forever(self):
-        """Continuous monitoring loop."""
-        print(f"[Exit Monitor] Starting continuous monitoring (interval: {self.check_interval}s)")
+        """Continuous monitoring loop with adaptive interval."""
+        print(f"[Exit Monitor] Starting adaptive monitoring (base interval: {self.check_interval}s)")
         
         while True:
+            summary = {"open_trades": 0, "min_distance_atr": None, "api_error": True}
             try:
-                self.check_and_update_exits()
+                summary = self.check_and_update_exits()
             except Exception as e:
                 print(f"[Exit Monitor] Fatal error: {e}")
             
-            time.sleep(self.check_interval)
+            interval = self.scheduler.next_interval(
+                summary["open_trades"], summary["min_distance_atr"], summary["api_error"]
+            )
+            print(f"[Exit Monitor] Next sweep in {interval:.0f}s ({self.scheduler.last_mode})")
+            time.sleep(interval)
 
 if __name__ == "__main__":
-    monitor = TradeExitMonitor(check_interval_seconds=120)  # Check every 2 minutes
+    monitor = TradeExitMonitor(check_interval_seconds=120)  # Base interval; 5s near SL/TP, 5m when flat
     monitor.run_forever()
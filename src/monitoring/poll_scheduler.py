@@ -0,0 +1,83 @@
+"""
+Adaptive Poll Scheduler - Exit Monitor Sweep Timing
+Sleeps long when flat, tightens when price is within N ATR of any stop/target,
+and backs off exponentially while the broker API is failing.
+"""
+from typing import Any, Dict, List, Optional
+
+
+def average_true_range(candles: List[Dict[str, Any]], period: int = 14) -> Optional[float]:
+    """Simple-average ATR over the last `period` candles (None if not enough data)."""
+    if not isinstance(candles, list) or len(candles) < 2:
+        return None
+
+    true_ranges = []
+    for prev, cur in zip(candles, candles[1:]):
+        true_ranges.append(max(
+            cur["high"] - cur["low"],
+            abs(cur["high"] - prev["close"]),
+            abs(cur["low"] - prev["close"]),
+        ))
+    window = true_ranges[-period:]
+    return sum(window) / len(window)
+
+
+class AdaptivePollScheduler:
+    """Chooses the next exit-monitor sleep from exposure, proximity and API health."""
+
+    def __init__(
+        self,
+        idle_seconds: float = 300,
+        base_seconds: float = 60,
+        near_seconds: float = 5,
+        near_atr_multiple: float = 1.0,
+        backoff_base_seconds: float = 30,
+        backoff_max_seconds: float = 600,
+    ):
+        self.idle_seconds = idle_seconds
+        self.base_seconds = base_seconds
+        self.near_seconds = near_seconds
+        self.near_atr_multiple = near_atr_multiple
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.consecutive_errors = 0
+        self.last_interval = base_seconds
+        self.last_mode = "BASE"
+
+    def next_interval(
+        self,
+        open_trades: int,
+        min_distance_atr: Optional[float] = None,
+        api_error: bool = False,
+    ) -> float:
+        """
+        Seconds to sleep before the next sweep.
+
+        `min_distance_atr` is the smallest distance from current price to any open
+        trade's SL/TP, measured in ATRs (None if unknown).
+        """
+        if api_error:
+            self.consecutive_errors += 1
+            interval = min(self.backoff_base_seconds * 2 ** (self.consecutive_errors - 1),
+                           self.backoff_max_seconds)
+            mode = "BACKOFF"
+        else:
+            self.consecutive_errors = 0
+            if open_trades == 0:
+                interval, mode = self.idle_seconds, "IDLE"
+            elif min_distance_atr is not None and min_distance_atr <= self.near_atr_multiple:
+                interval, mode = self.near_seconds, "NEAR_EXIT"
+            else:
+                interval, mode = self.base_seconds, "BASE"
+
+        self.last_interval = interval
+        self.last_mode = mode
+        return interval
+
+    def get_status(self) -> Dict:
+        """Get current scheduling state."""
+        return {
+            "mode": self.last_mode,
+            "interval_seconds": self.last_interval,
+            "consecutive_errors": self.consecutive_errors,
+        }
@@ -0,0 +1,228 @@
+"""
+Transaction Stream Exit Tracker - Event-Driven Trade Close Updates
+Consumes the OANDA v20 transaction stream and closes the matching Trade rows with
+the actual fill price and realized P&L as soon as OANDA reports the fill.
+Resting entry orders (PENDING rows) are opened or cancelled the same way.
+"""
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from src.database.models import Trade, SessionLocal
+
+
+class ReplayTransactionStream:
+    """
+    Offline stand-in for the v20 transaction stream.
+    Replays transaction dicts from a JSON-lines file (one transaction per line) or a list.
+    """
+
+    def __init__(self, source: Union[str, Iterable[Dict[str, Any]]], delay_seconds: float = 0.0):
+        self.source = source
+        self.delay_seconds = delay_seconds
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if isinstance(self.source, str):
+            with open(self.source) as f:
+                events = [json.loads(line) for line in f if line.strip()]
+        else:
+            events = list(self.source)
+
+        for event in events:
+            if self.delay_seconds:
+                time.sleep(self.delay_seconds)
+            # Real stream interleaves heartbeats; consumers must ignore them
+            if event.get("type") == "HEARTBEAT":
+                continue
+            yield event
+
+
+class TransactionExitTracker:
+    """Updates Trade rows from ORDER_FILL transactions."""
+
+    def __init__(self, session_factory=None):
+        self.session_factory = session_factory
+        self.transactions_seen = 0
+        self.trades_closed = 0
+        self.entries_filled = 0
+        self.last_transaction_id: Optional[str] = None
+        self.last_update_ms = 0.0
+        self.max_update_ms = 0.0
+
+    def handle_transaction(self, txn: Dict[str, Any]) -> List[int]:
+        """
+        Apply one transaction. Returns the DB ids of trades that were updated.
+        Relevant: ORDER_FILLs that open a resting entry and/or close or reduce trades
+        (reason: STOP_LOSS_ORDER, TAKE_PROFIT_ORDER, MARKET_ORDER_TRADE_CLOSE, ...),
+        and ORDER_CANCELs of resting entries.
+        """
+        self.transactions_seen += 1
+        self.last_transaction_id = txn.get("id", self.last_transaction_id)
+
+        if txn.get("type") == "ORDER_CANCEL":
+            return self._apply_entry_cancel(txn)
+        if txn.get("type") != "ORDER_FILL":
+            return []
+        # One fill can open our entry and close/reduce opposite trades (positionFill DEFAULT)
+        opened = []
+        if txn.get("tradeOpened") and txn.get("clientOrderID"):
+            opened = self._apply_entry_fill(txn)
+
+        closed = txn.get("tradesClosed") or []
+        reduced = txn.get("tradeReduced")
+        if not closed and not reduced:
+            return opened
+
+        started = time.perf_counter()
+        db = (self.session_factory or SessionLocal)()
+        updated = []
+        closed_count = 0
+        try:
+            reason = txn.get("reason", "ORDER_FILL")
+
+            for close in closed:
+                trade = db.query(Trade).filter(
+                    Trade.oanda_trade_id == str(close["tradeID"]),
+                    Trade.status == "OPEN"
+                ).first()
+                if not trade:
+                    continue
+
+                # Partial closes may already have booked some P&L on this row
+                trade.exit_price = float(close.get("price", txn.get("price")))
+                trade.pnl = (trade.pnl or 0.0) + float(close.get("realizedPL", 0.0))
+                trade.status = "CLOSED"
+                trade.exit_reason = reason
+                trade.closed_at = datetime.utcnow()
+                updated.append(trade.id)
+                closed_count += 1
+
+                print(f"[Exit Tracker] Trade {trade.id} (OANDA #{close['tradeID']}) closed by {reason} "
+                      f"@ {trade.exit_price}, P&L: ${trade.pnl:.2f}")
+
+            if reduced:
+                trade = db.query(Trade).filter(
+                    Trade.oanda_trade_id == str(reduced["tradeID"]),
+                    Trade.status == "OPEN"
+                ).first()
+                if trade:
+                    trade.pnl = (trade.pnl or 0.0) + float(reduced.get("realizedPL", 0.0))
+                    updated.append(trade.id)
+                    print(f"[Exit Tracker] Trade {trade.id} reduced by {reduced.get('units')} units")
+
+            db.commit()
+        except Exception as e:
+            print(f"[Exit Tracker] Error applying transaction {txn.get('id')}: {e}")
+            db.rollback()
+            updated = []
+            closed_count = 0
+        finally:
+            db.close()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.last_update_ms = elapsed_ms
+        self.max_update_ms = max(self.max_update_ms, elapsed_ms)
+        self.trades_closed += closed_count
+        return opened + updated
+
+    def _pending_entry(self, db, txn: Dict[str, Any]) -> Optional[Trade]:
+        return db.query(Trade).filter(
+            Trade.client_order_id == txn.get("clientOrderID"),
+            Trade.status.in_(["SUBMITTING", "PENDING"])
+        ).first()
+
+    def _apply_entry_fill(self, txn: Dict[str, Any]) -> List[int]:
+        """A resting LIMIT/STOP entry filled: PENDING row -> OPEN with the fill price."""
+        from src.execution.execution_quality import slippage_pips
+
+        db = (self.session_factory or SessionLocal)()
+        try:
+            trade = self._pending_entry(db, txn)
+            if not trade:
+                return []
+            trade.status = "OPEN"
+            trade.entry_price = float(txn["price"])
+            trade.oanda_trade_id = str(txn["tradeOpened"]["tradeID"])
+            if trade.requested_price:
+                trade.slippage_pips = slippage_pips(trade.action, trade.requested_price, trade.entry_price)
+            db.commit()
+            self.entries_filled += 1
+            print(f"[Exit Tracker] Entry order {trade.client_order_id} filled @ {trade.entry_price} "
+                  f"-> OANDA #{trade.oanda_trade_id}")
+            return [trade.id]
+        except Exception as e:
+            print(f"[Exit Tracker] Error applying entry fill {txn.get('id')}: {e}")
+            db.rollback()
+            return []
+        finally:
+            db.close()
+
+    def _apply_entry_cancel(self, txn: Dict[str, Any]) -> List[int]:
+        """A resting entry order was cancelled or its GTD expired: PENDING row -> CANCELLED."""
+        if not txn.get("clientOrderID"):
+            return []
+        db = (self.session_factory or SessionLocal)()
+        try:
+            trade = self._pending_entry(db, txn)
+            if not trade:
+                return []
+            trade.status = "CANCELLED"
+            trade.exit_reason = txn.get("reason", "ORDER_CANCEL")  # e.g. TIME_IN_FORCE_EXPIRED
+            trade.closed_at = datetime.utcnow()
+            db.commit()
+            print(f"[Exit Tracker] Entry order {trade.client_order_id} cancelled ({trade.exit_reason})")
+            return [trade.id]
+        except Exception as e:
+            print(f"[Exit Tracker] Error applying order cancel {txn.get('id')}: {e}")
+            db.rollback()
+            return []
+        finally:
+            db.close()
+
+    def consume(self, stream: Iterable[Dict[str, Any]]):
+        """Apply every transaction from a (live or replayed) stream until it ends."""
+        for txn in stream:
+            self.handle_transaction(txn)
+
+    def run_forever(self, client=None, reconnect_delay: int = 5, max_delay: int = 120):
+        """Follow the live transaction stream, reconnecting with backoff when it drops."""
+        from src.execution.oanda_client import get_oanda_client
+        client = client or get_oanda_client()
+        delay = reconnect_delay
+
+        print("[Exit Tracker] Listening to OANDA transaction stream...")
+        while True:
+            try:
+                # Catch up on fills that happened while disconnected
+                if self.last_transaction_id:
+                    self.consume(client.get_transactions_since(self.last_transaction_id))
+                self.consume(client.stream_transactions())
+                delay = reconnect_delay  # Clean end of stream - reconnect promptly
+                time.sleep(1)
+            except Exception as e:
+                print(f"[Exit Tracker] Stream error: {e}. Reconnecting in {delay}s...")
+                time.sleep(delay)
+                delay = min(delay * 2, max_delay)
+
+    def get_status(self) -> Dict:
+        """Get tracker statistics."""
+        return {
+            "transactions_seen": self.transactions_seen,
+            "trades_closed": self.trades_closed,
+            "entries_filled": self.entries_filled,
+            "last_transaction_id": self.last_transaction_id,
+            "last_update_ms": round(self.last_update_ms, 2),
+            "max_update_ms": round(self.max_update_ms, 2),
+        }
+
+
+if __name__ == "__main__":
+    import sys
+
+    tracker = TransactionExitTracker()
+    if len(sys.argv) > 2 and sys.argv[1] == "--replay":
+        # Offline: PYTHONPATH=. python src/monitoring/transaction_stream.py --replay transactions.jsonl
+        tracker.consume(ReplayTransactionStream(sys.argv[2]))
+        print(f"[Exit Tracker] Replay complete: {tracker.get_status()}")
+    else:
+        tracker.run_forever()
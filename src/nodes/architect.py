@@ -1,9 +1,8 @@
 from typing import Dict, Any
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel, Field
 from src.state import AgentState
+from src.nodes.prompt_codec import compact_indicators
+from src.safety.circuit_breaker import gemini_breaker
 import os
 import time
 
@@ -25,8 +24,10 @@ Your Supervisor (Strategist) has already defined the Daily Bias: **{bias}**.
 Your job is to find the *best location* to execute this bias on the 15-Minute chart.
 
 ### INPUT DATA
-1. **15M_Technicals**: Market Structure (HH/HL), Order Blocks, FVGs.
-2. **Current_Price**: Live bid/ask.
+1. **m15**: 15M Market Structure (HH/HL), Order Blocks, FVGs.
+2. **price**: Live bid.
+3. **h1_trend, h1_mom, h1_close, h1_high, h1_low**: 1H context.
+Data arrives as compact `key=value` lines (nested sections as `m15.key=value`); candle series as `t,o,h,l,c` rows.
 
 ### TASK
 Analyze the 15M structure.
@@ -60,6 +61,11 @@ def architect_node(state: AgentState) -> Dict[str, Any]:
     from dotenv import load_dotenv
     load_dotenv(override=True)
 
+    # LLM stack is imported on first use (keeps agent/dashboard startup fast)
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.output_parsers import JsonOutputParser
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
     # Initialize LLM (Stable Flash)
     llm = ChatGoogleGenerativeAI(
         model="gemini-flash-latest",
@@ -83,14 +89,15 @@ def architect_node(state: AgentState) -> Dict[str, Any]:
         # Get learning context
         learning_context = state.get("learning_context", "No recent performance data available.")
         
-        response = chain.invoke({
+        response = gemini_breaker.call(chain.invoke, {
             "bias": state.get("current_bias", "NEUTRAL"),
-            "data": technicals,
+            "data": compact_indicators(technicals),
             "learning_context": learning_context
         })
         
         return {
             "market_structure": response["structure"],
+            "key_zone": response["key_zone"],
             "reasoning_trace": [f"[Architect (Gemini)]: {response['reasoning']} (Plan: {response['action_plan']})"]
         }
     except Exception as e:
@@ -102,13 +109,14 @@ def architect_node(state: AgentState) -> Dict[str, Any]:
             import time
             time.sleep(10)
             try:
-                response = chain.invoke({
+                response = gemini_breaker.call(chain.invoke, {
                     "bias": state.get("current_bias", "NEUTRAL"),
-                    "data": technicals,
+                    "data": compact_indicators(technicals),
                     "learning_context": learning_context
                 })
                 return {
                     "market_structure": response["structure"],
+                    "key_zone": response["key_zone"],
                     "reasoning_trace": [f"[Architect (Gemini - Retry)]: {response['reasoning']}"]
                 }
             except Exception as retry_e:
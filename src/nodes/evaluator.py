@@ -6,7 +6,7 @@ Analyzes past WAIT decisions against actual market outcomes.
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
 from src.database.models import SessionLocal, Trade
-from src.execution.oanda_client import OandaClient
+from src.execution.oanda_client import get_oanda_client
 
 
 def evaluate_past_performance(lookback_hours: int = 24) -> str:
@@ -18,7 +18,7 @@ def evaluate_past_performance(lookback_hours: int = 24) -> str:
     """
     try:
         db = SessionLocal()
-        client = OandaClient()
+        client = get_oanda_client()
         
         # Get WAIT records from the last 24-48 hours
         cutoff_time = datetime.utcnow() - timedelta(hours=lookback_hours)
@@ -0,0 +1,133 @@
+"""
+Pre-Screen Node - Deterministic Gate Before the LLM Chain
+Cheap rule-based checks that end the cycle early when no trade is possible,
+so the Strategist/Architect/Tactical calls are only spent on tradeable markets.
+"""
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+from src.state import AgentState
+from src.config import risk_config
+from src.validation.data_validator import validator
+
+
+def is_market_open(now: datetime) -> bool:
+    """FX trades 24/5: closed from Friday close until Sunday open (UTC)."""
+    close_day, close_hour = risk_config.MARKET_CLOSE_UTC
+    open_day, open_hour = risk_config.MARKET_OPEN_UTC
+    weekday, hour = now.weekday(), now.hour
+
+    if weekday == close_day and hour >= close_hour:
+        return False
+    if close_day < weekday < open_day:
+        return False
+    if weekday == open_day and hour < open_hour:
+        return False
+    return True
+
+
+def evaluate_pre_screen(state: AgentState, now: Optional[datetime] = None) -> Tuple[bool, str]:
+    """
+    Run the deterministic checks in order of cost.
+    Returns (passed, reason).
+    """
+    now = now or datetime.utcnow()
+
+    # Check 1: Market hours
+    if not is_market_open(now):
+        return False, f"Market closed ({now.strftime('%a %H:%M')} UTC)"
+
+    # Check 2: Quote feed behaving (tick monitor verdict from fetch time)
+    tick_anomaly = state.get("risk_environment", {}).get("Tick_Anomaly")
+    if tick_anomaly:
+        return False, f"Quote anomaly: {tick_anomaly}"
+
+    # Check 3: An entry order is already resting at the key zone
+    if state.get("resting_orders"):
+        return False, f"Entry order resting ({state['resting_orders']} pending)"
+
+    # Check 4: Indicator payload is complete and sane
+    tech = state.get("technical_indicators", {})
+    is_valid, message = validator.validate_technical_indicators(tech)
+    if not is_valid:
+        return False, f"Indicator data invalid: {message}"
+
+    # Check 5: Spread
+    spread_pips = state.get("risk_environment", {}).get("Spread", 0.0) * 10000
+    if spread_pips > risk_config.MAX_ENTRY_SPREAD_PIPS:
+        return False, f"Spread too wide: {spread_pips:.1f} pips (max: {risk_config.MAX_ENTRY_SPREAD_PIPS})"
+
+    # Check 6: Distance to the nearest key level
+    price = tech["Current_Price"]
+    levels = [tech.get(k) for k in ("H1_High", "H1_Low") if tech.get(k)]
+    if levels:
+        distance_pips = min(abs(price - level) for level in levels) * 10000
+        if distance_pips > risk_config.MAX_DISTANCE_FROM_LEVEL_PIPS:
+            return False, (f"Price {distance_pips:.1f} pips from nearest level "
+                           f"(max: {risk_config.MAX_DISTANCE_FROM_LEVEL_PIPS})")
+
+    return True, "Pre-screen passed"
+
+
+class PreScreenStats:
+    """Tracks skip rate and LLM quota saved per UTC day."""
+
+    def __init__(self):
+        self.day = None
+        self.evaluated = 0
+        self.skipped = 0
+        self.reasons: Dict[str, int] = {}
+
+    def record(self, passed: bool, reason: str, now: Optional[datetime] = None):
+        """Record one gate decision (counters reset at UTC midnight)."""
+        today = (now or datetime.utcnow()).date()
+        if today != self.day:
+            self.day = today
+            self.evaluated = 0
+            self.skipped = 0
+            self.reasons = {}
+
+        self.evaluated += 1
+        if not passed:
+            self.skipped += 1
+            category = reason.split(":")[0].split(" (")[0]
+            self.reasons[category] = self.reasons.get(category, 0) + 1
+
+    def get_status(self) -> Dict:
+        """Get today's gate statistics."""
+        return {
+            "day": self.day.isoformat() if self.day else None,
+            "evaluated": self.evaluated,
+            "skipped": self.skipped,
+            "skip_rate": round(self.skipped / self.evaluated * 100, 1) if self.evaluated else 0.0,
+            "llm_calls_saved": self.skipped * risk_config.LLM_CALLS_PER_CYCLE,
+            "reasons": dict(self.reasons),
+        }
+
+
+# Global instance
+pre_screen_stats = PreScreenStats()
+
+
+def pre_screen_node(state: AgentState) -> Dict[str, Any]:
+    """
+    Pre-Screen Node - Runs before the Strategist.
+
+    This is a RULE-BASED node (no LLM). It ends the cycle when:
+    1. The FX market is closed
+    2. The tick monitor flagged the latest quote (stale, spread spike, price jump)
+    3. An entry order is already resting at the key zone
+    4. The indicator payload fails validation
+    5. The spread is too wide to enter
+    6. Price is far from every key level
+    """
+    passed, reason = evaluate_pre_screen(state)
+    pre_screen_stats.record(passed, reason)
+
+    trace = "[Pre-Screen]: PASSED" if passed else f"[Pre-Screen]: SKIPPED - {reason}"
+    if not passed:
+        print(f"[PRE-SCREEN] {reason}. Skipping LLM chain.")
+
+    return {
+        "pre_screen": {"passed": passed, "reason": reason},
+        "reasoning_trace": [trace]
+    }
@@ -0,0 +1,103 @@
+"""
+Prompt Codec - Compact Serialization of Market Data for LLM Prompts
+Replaces the Python repr of `technical_indicators` with a stable, short format:
+rounded prices, short keys in a fixed order and tabular candle rows.
+"""
+from typing import Any, Dict, List
+
+PRICE_DECIMALS = 5
+
+# Short keys for the live payload (fixed order = stable prompts across cycles)
+KEY_ALIASES = {
+    "Current_Price": "price",
+    "H1_Trend": "h1_trend",
+    "H1_Momentum": "h1_mom",
+    "H1_Close": "h1_close",
+    "H1_High": "h1_high",
+    "H1_Low": "h1_low",
+    "15M_Technicals": "m15",
+    "5M_Technicals": "m5",
+    "Key_Levels": "levels",
+}
+
+# Internal bookkeeping the LLM does not need
+DROPPED_KEYS = {"Mode"}
+
+CANDLE_FIELDS = ("time", "open", "high", "low", "close")
+
+
+def format_value(value: Any) -> str:
+    """Render a scalar compactly (floats rounded, trailing zeros stripped)."""
+    if isinstance(value, bool) or value is None:
+        return str(value)
+    if isinstance(value, float):
+        text = f"{value:.{PRICE_DECIMALS}f}".rstrip("0").rstrip(".")
+        return text if text not in ("", "-0") else "0"
+    return str(value)
+
+
+def _short_time(value: Any) -> str:
+    """RFC3339 '2024-01-26T21:00:00.000000000Z' -> '01-26T21:00'."""
+    text = str(value)
+    if len(text) >= 16 and text[4] == "-" and "T" in text:
+        return text[5:16]
+    return text
+
+
+def _is_candle_list(value: Any) -> bool:
+    return (
+        isinstance(value, list) and bool(value)
+        and all(isinstance(c, dict) and {"open", "high", "low", "close"} <= c.keys() for c in value)
+    )
+
+
+def encode_candles(candles: List[Dict[str, Any]]) -> str:
+    """Tabular candle encoding: one header line, then one 't,o,h,l,c' row per candle."""
+    fields = [f for f in CANDLE_FIELDS if f in candles[0]]
+    rows = [",".join(f[0] for f in fields)]
+    for candle in candles:
+        rows.append(",".join(
+            _short_time(candle[f]) if f == "time" else format_value(candle[f]) for f in fields
+        ))
+    return "\n".join(rows)
+
+
+def _ordered_items(data: Dict[str, Any]):
+    """Known keys first in alias order, then the rest sorted by name."""
+    known = [k for k in KEY_ALIASES if k in data]
+    rest = sorted(k for k in data if k not in KEY_ALIASES)
+    for key in known + rest:
+        if key not in DROPPED_KEYS:
+            yield KEY_ALIASES.get(key, key), data[key]
+
+
+def _encode(data: Any, prefix: str, lines: List[str]):
+    if isinstance(data, dict):
+        for key, value in _ordered_items(data):
+            if isinstance(value, dict):
+                _encode(value, f"{prefix}{key}.", lines)
+            else:
+                _encode(value, f"{prefix}{key}", lines)
+    elif _is_candle_list(data):
+        lines.append(f"{prefix}[{len(data)}]:\n{encode_candles(data)}")
+    elif isinstance(data, (list, tuple)):
+        lines.append(f"{prefix}=" + ",".join(format_value(v) for v in data))
+    else:
+        lines.append(f"{prefix}={format_value(data)}")
+
+
+def compact_indicators(data: Any) -> str:
+    """
+    Serialize a technical_indicators payload (or any sub-section) for a prompt.
+    Nested dicts are flattened to dotted keys, candle lists become tables.
+    """
+    if not isinstance(data, (dict, list)):
+        return format_value(data)
+    lines: List[str] = []
+    _encode(data, "", lines)
+    return "\n".join(lines)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token for Gemini/GPT tokenizers)."""
+    return max(1, (len(text) + 3) // 4)
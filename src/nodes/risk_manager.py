@@ -84,7 +84,8 @@ def risk_manager_node(state: AgentState) -> Dict[str, Any]:
     # Check 0: Max Open Positions
     try:
         db = SessionLocal()
-        open_positions = db.query(Trade).filter(Trade.status == "OPEN").count()
+        # Resting entry orders become positions without another decision - count them too
+        open_positions = db.query(Trade).filter(Trade.status.in_(["OPEN", "PENDING", "SUBMITTING"])).count()
         db.close()
         
         if open_positions >= risk_config.MAX_OPEN_POSITIONS:
@@ -1,9 +1,8 @@
 from typing import Dict, Any
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_google_genai import ChatGoogleGenerativeAI # CHANGED: Switched to Google
 from pydantic import BaseModel, Field
 from src.state import AgentState
+from src.nodes.prompt_codec import compact_indicators
+from src.safety.circuit_breaker import gemini_breaker
 import os
 import time
 from dotenv import load_dotenv
@@ -28,8 +27,9 @@ Your goal is to determine the "Market Bias" by performing deep technical analysi
 
 ### INPUT DATA SCHEMA
 You will receive calculated Technical Indicators (Lightweight Mode):
-1. **Trend:** H1 Trend Direction.
-2. **Levels:** Highs/Lows.
+1. **Trend:** `h1_trend` (H1 Trend Direction), `h1_mom` (last H1 candle direction).
+2. **Levels:** `h1_high`/`h1_low` (H1 range), `h1_close`, `price` (live bid).
+Data arrives as compact `key=value` lines (prices rounded to 5 decimals); candle series as `t,o,h,l,c` rows.
 
 ### ANALYSIS PROTOCOL
 1. **Trend Check:** If Trend is BULLISH, look for longs.
@@ -62,6 +62,11 @@ def strategist_node(state: AgentState) -> Dict[str, Any]:
     # Force reload environment to pick up API Key changes without restart
     load_dotenv(override=True)
     
+    # LLM stack is imported on first use (keeps agent/dashboard startup fast)
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.output_parsers import JsonOutputParser
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
     # Initialize LLM (Gemini Flash Stable)
     llm = ChatGoogleGenerativeAI(
         model="gemini-flash-latest",
@@ -83,8 +88,8 @@ def strategist_node(state: AgentState) -> Dict[str, Any]:
         learning_context = state.get("learning_context", "No recent performance data available.")
         
         # Fix: Pass dictionary matching prompt variable
-        response = chain.invoke({
-            "technical_indicators": state["technical_indicators"],
+        response = gemini_breaker.call(chain.invoke, {
+            "technical_indicators": compact_indicators(state["technical_indicators"]),
             "learning_context": learning_context
         })
         
@@ -102,8 +107,8 @@ def strategist_node(state: AgentState) -> Dict[str, Any]:
              print(f"⚠️ Strategist Rate Limit: Waiting 10s for retry...")
              time.sleep(10)
              try:
-                 response = chain.invoke({
-                    "technical_indicators": state["technical_indicators"],
+                 response = gemini_breaker.call(chain.invoke, {
+                    "technical_indicators": compact_indicators(state["technical_indicators"]),
                     "learning_context": learning_context
                  })
                  return {
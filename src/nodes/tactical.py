@@ -1,9 +1,8 @@
 from typing import Dict, Any, Optional
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel, Field
 from src.state import AgentState
+from src.nodes.prompt_codec import compact_indicators
+from src.safety.circuit_breaker import gemini_breaker
 import os
 import time
 
@@ -13,6 +12,7 @@ class OrderDetails(BaseModel):
     entry_price: float = Field(description="Proposed entry level")
     stop_loss: float = Field(description="Invalidation level")
     take_profit: float = Field(description="Target level (1:2 min)")
+    order_type: str = Field(default="MARKET", description="MARKET, LIMIT or STOP")
 
 class TacticalOutput(BaseModel):
     decision: str = Field(description="EXECUTE, WAIT, or CANCEL")
@@ -30,14 +30,18 @@ Your supervisors have done the heavy lifting:
 Refine the entry on the **5-Minute Chart**. You are the one who pulls the trigger.
 
 ### INPUT DATA
-1. **5M_Technicals**: RSI, Candle Patterns (Engulfing, Pinbar, Marubozu).
-2. **Current_Price**: Live market price.
-3. **Setup_Context**: The 15M Key Zone identified by the Architect.
+1. **5M Data**: RSI, Candle Patterns (Engulfing, Pinbar, Marubozu).
+2. **Price**: Live market price.
+3. **Key Zone**: The 15M Key Zone identified by the Architect.
+Data arrives as compact `key=value` lines; candle series as `t,o,h,l,c` rows.
 
 ### RULES
 1. **Confirm Deviation**: If Bias is LONG, 5M RSI should be < 30 (Oversold) OR showing Bullish Divergence.
 2. **Candle Trigger**: Must see a reversal candle (Hammer, Engulfing) AT the Key Zone.
 3. **Risk/Reward**: Trade must offer at least 1:2 R/R.
+4. **Resting Entry**: If the setup is valid but price has not reached the Key Zone yet, `EXECUTE` with
+   `order_type` `LIMIT` (pullback into the zone) or `STOP` (breakout through it) and `entry_price` at the zone.
+   The order rests at the broker until filled or expired - no need to re-check every 5 minutes.
 
 ### OUTPUT DECISIONS
 - `EXECUTE`: All stars aligned. Fire the trade.
@@ -49,6 +53,7 @@ Refine the entry on the **5-Minute Chart**. You are the one who pulls the trigge
     "decision": "EXECUTE" | "WAIT" | "CANCEL",
     "order_details": {{
         "action": "BUY",
+        "order_type": "MARKET" | "LIMIT" | "STOP",
         "entry_price": 1.0500,
         "stop_loss": 1.0480,
         "take_profit": 1.0550
@@ -57,6 +62,12 @@ Refine the entry on the **5-Minute Chart**. You are the one who pulls the trigge
 }}
 """
 
+def _stamp_decision(response: Dict[str, Any]):
+    """Start the decision-to-submit latency clock on EXECUTE orders (WAIT/CANCEL may carry no order)."""
+    if response.get("decision") == "EXECUTE" and isinstance(response.get("order_details"), dict):
+        response["order_details"]["decided_at"] = time.time()
+
+
 def tactical_node(state: AgentState) -> Dict[str, Any]:
     """
     The Tactical Node (5M Layer).
@@ -67,6 +78,11 @@ def tactical_node(state: AgentState) -> Dict[str, Any]:
     from dotenv import load_dotenv
     load_dotenv(override=True)
 
+    # LLM stack is imported on first use (keeps agent/dashboard startup fast)
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.output_parsers import JsonOutputParser
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
     # Initialize LLM (Stable Flash)
     llm = ChatGoogleGenerativeAI(
         model="gemini-flash-latest",
@@ -78,7 +94,7 @@ def tactical_node(state: AgentState) -> Dict[str, Any]:
     
     prompt = ChatPromptTemplate.from_messages([
         ("system", SYSTEM_PROMPT),
-        ("user", "Bias: {bias}\nStructure: {structure}\n5M Data: {data}\n\nSniper, report status.")
+        ("user", "Bias: {bias}\nStructure: {structure}\nPrice: {price}\nKey Zone: {zone}\n5M Data: {data}\n\nSniper, report status.")
     ])
     
     chain = prompt | llm | parser
@@ -89,10 +105,12 @@ def tactical_node(state: AgentState) -> Dict[str, Any]:
     current_price = technicals.get("Current_Price", 1.0500)
     
     try:
-        response = chain.invoke({
+        response = gemini_breaker.call(chain.invoke, {
             "bias": state.get("current_bias", "NEUTRAL"),
             "structure": state.get("market_structure", "UNKNOWN"),
-            "data": five_min_data
+            "price": compact_indicators(technicals.get("Current_Price")),
+            "zone": compact_indicators(state.get("key_zone") or "None"),
+            "data": compact_indicators(five_min_data)
         })
         
         # Format the reasoning for the trace
@@ -100,6 +118,8 @@ def tactical_node(state: AgentState) -> Dict[str, Any]:
         if response['decision'] == "EXECUTE":
             trace_entry += f" (Entry: {response['order_details']['entry_price']}, SL: {response['order_details']['stop_loss']})"
         
+        _stamp_decision(response)
+        
         return {
             "trade_decision": response["decision"],
             "order_details": response["order_details"],
@@ -111,14 +131,16 @@ def tactical_node(state: AgentState) -> Dict[str, Any]:
         # Transient error retry
         if "RESOURCE_EXHAUSTED" in error_msg or "429" in error_msg:
             print(f"⚠️ Tactical Rate Limit: Waiting 10s for retry...")
-            import time
             time.sleep(10)
             try:
-                response = chain.invoke({
+                response = gemini_breaker.call(chain.invoke, {
                     "bias": state.get("current_bias", "NEUTRAL"),
                     "structure": state.get("market_structure", "UNKNOWN"),
-                    "data": five_min_data
+                    "price": compact_indicators(technicals.get("Current_Price")),
+                    "zone": compact_indicators(state.get("key_zone") or "None"),
+                    "data": compact_indicators(five_min_data)
                 })
+                _stamp_decision(response)
                 return {
                     "trade_decision": response["decision"],
                     "order_details": response["order_details"],
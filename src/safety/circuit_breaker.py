@@ -1,64 +1,329 @@
 """
 Circuit Breaker Module - Prevents Runaway Loops
-Tracks consecutive failures and implements exponential backoff.
+Tracks consecutive failures per endpoint, fails fast while open and lets a single
+half-open probe through after the cooldown. Named breakers keep their state in a
+shared SQLite file so the agent, exit monitor, stream tracker and dashboard all see
+(and trip) the same breaker, and an agent restart does not reset it.
 """
+import os
+import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+STATE_FILE = os.path.abspath(os.getenv("CIRCUIT_STATE_FILE") or os.path.join(_REPO_ROOT, "circuit_state.db"))
+BUSY_TIMEOUT_MS = 5000  # SQLite waits this long for another process's write lock
+LOCK_RETRIES = 5  # ...then retries lock acquisition (BEGIN IMMEDIATE, setup) this many times
+
+CLOSED, OPEN, HALF_OPEN = "CLOSED", "OPEN", "HALF_OPEN"
+
+
+def _initial_state() -> Dict[str, Any]:
+    return {"state": CLOSED, "failure_count": 0, "last_failure": None, "probe_started": None}
+
+
+class MemoryBreakerStore:
+    """Per-process state (unnamed breakers, tests, fallback if the shared file is unusable)."""
+
+    def __init__(self):
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def read(self, name: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._rows.get(name) or _initial_state())
+
+    def update(self, name: str, mutate: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+        """Atomically apply `mutate` to the breaker's state and return the new state."""
+        with self._lock:
+            row = mutate(dict(self._rows.get(name) or _initial_state()))
+            self._rows[name] = row
+            return dict(row)
+
+
+class SharedBreakerStore:
+    """
+    Cross-process state in a local SQLite file (WAL). Updates run inside
+    BEGIN IMMEDIATE, so concurrent read-modify-writes from different processes
+    serialize instead of overwriting each other. Lock contention is waited out
+    (busy_timeout) and retried rather than surfaced as an error.
+    """
+
+    def __init__(self, path: str = STATE_FILE):
+        self.path = path
+        self._local = threading.local()
+        self._setup_done = False
+        self._setup_lock = threading.Lock()
+
+    @staticmethod
+    def _with_retry(fn: Callable[[], Any]) -> Any:
+        """Run `fn`, retrying while SQLite reports the database locked/busy."""
+        for attempt in range(LOCK_RETRIES):
+            try:
+                return fn()
+            except sqlite3.OperationalError as e:
+                message = str(e).lower()
+                if ("locked" not in message and "busy" not in message) or attempt == LOCK_RETRIES - 1:
+                    raise
+                time.sleep(0.05 * (attempt + 1))
+
+    def _setup(self, conn: sqlite3.Connection):
+        """WAL mode and the table are per file, so do them once per process."""
+        with self._setup_lock:
+            if self._setup_done:
+                return
+            self._with_retry(lambda: conn.execute("PRAGMA journal_mode=WAL"))
+            self._with_retry(lambda: conn.execute(
+                "CREATE TABLE IF NOT EXISTS breakers (name TEXT PRIMARY KEY, state TEXT, failure_count INTEGER, "
+                "last_failure REAL, probe_started REAL)"
+            ))
+            self._setup_done = True
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            try:
+                conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                self._setup(conn)
+            except Exception:
+                conn.close()  # Not cached: the next call starts over
+                raise
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _row(cursor) -> Dict[str, Any]:
+        row = cursor.fetchone()
+        if row is None:
+            return _initial_state()
+        return {"state": row[0], "failure_count": row[1], "last_failure": row[2], "probe_started": row[3]}
+
+    def read(self, name: str) -> Dict[str, Any]:
+        return self._row(self._conn().execute(
+            "SELECT state, failure_count, last_failure, probe_started FROM breakers WHERE name = ?", (name,)
+        ))
+
+    def update(self, name: str, mutate: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+        conn = self._conn()
+        self._with_retry(lambda: conn.execute("BEGIN IMMEDIATE"))
+        try:
+            row = mutate(self._row(conn.execute(
+                "SELECT state, failure_count, last_failure, probe_started FROM breakers WHERE name = ?", (name,)
+            )))
+            conn.execute(
+                "INSERT OR REPLACE INTO breakers (name, state, failure_count, last_failure, probe_started) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (name, row["state"], row["failure_count"], row["last_failure"], row["probe_started"]),
+            )
+            conn.execute("COMMIT")
+            return row
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
 
 class CircuitBreaker:
     """Circuit breaker for preventing runaway trading loops."""
-    
-    def __init__(self, max_consecutive_failures: int = 5, reset_window_minutes: int = 60):
+
+    def __init__(self, max_consecutive_failures: int = 5, reset_window_minutes: int = 60,
+                 name: Optional[str] = None, store=None, cooldown_seconds: Optional[float] = None):
         self.max_failures = max_consecutive_failures
         self.reset_window = timedelta(minutes=reset_window_minutes)
-        self.failure_count = 0
-        self.last_failure_time: Optional[datetime] = None
-        self.is_open = False
-    
+        # How long an open breaker fails fast before letting one probe through
+        self.cooldown = cooldown_seconds if cooldown_seconds is not None else self.reset_window.total_seconds()
+        self.name = name or f"breaker-{id(self)}"
+        self._store = store or MemoryBreakerStore()
+        # Used only for calls where the shared store fails; the next call tries it again
+        self._fallback_store = MemoryBreakerStore()
+        self._degraded = False
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            row = self._store.read(self.name)
+        except Exception as e:
+            self._fallback(e)
+            return self._fallback_store.read(self.name)
+        self._recovered()
+        return row
+
+    def _update(self, mutate) -> Dict[str, Any]:
+        try:
+            row = self._store.update(self.name, mutate)
+        except Exception as e:
+            self._fallback(e)
+            return self._fallback_store.update(self.name, mutate)
+        self._recovered()
+        return row
+
+    def _fallback(self, error: Exception):
+        if not self._degraded:
+            print(f"[CIRCUIT BREAKER] {self.name}: shared state unavailable ({error}), "
+                  f"using process-local state until it recovers")
+        self._degraded = True
+
+    def _recovered(self):
+        if self._degraded:
+            print(f"[CIRCUIT BREAKER] {self.name}: shared state available again")
+            self._degraded = False
+
+    # --- State (read from the store, so every process agrees) ---
+
+    @property
+    def state(self) -> str:
+        return self._read()["state"]
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != CLOSED
+
+    @property
+    def failure_count(self) -> int:
+        return self._read()["failure_count"]
+
+    @property
+    def last_failure_time(self) -> Optional[datetime]:
+        last = self._read()["last_failure"]
+        return datetime.utcfromtimestamp(last) if last else None
+
+    # --- Transitions ---
+
     def record_success(self):
-        """Reset the circuit breaker on successful execution."""
-        self.failure_count = 0
-        self.is_open = False
-        self.last_failure_time = None
-    
+        """Reset the circuit breaker on successful execution (closes a half-open breaker)."""
+        def close(row):
+            if row["state"] != CLOSED:
+                print(f"[CIRCUIT BREAKER] {self.name}: CLOSED")
+            return _initial_state()
+
+        if self._read() != _initial_state():
+            self._update(close)
+
     def record_failure(self):
         """Record a failure and check if circuit should open."""
-        current_time = datetime.utcnow()
-        
-        # Reset if window has passed
-        if self.last_failure_time and (current_time - self.last_failure_time) > self.reset_window:
-            self.failure_count = 0
-        
-        self.failure_count += 1
-        self.last_failure_time = current_time
-        
-        # Open circuit if threshold exceeded
-        if self.failure_count >= self.max_failures:
-            self.is_open = True
-            print(f"[CIRCUIT BREAKER] OPENED after {self.failure_count} consecutive failures")
-    
+        def fail(row):
+            now = time.time()
+            # Reset if window has passed
+            if row["last_failure"] and now - row["last_failure"] > self.reset_window.total_seconds():
+                row["failure_count"] = 0
+            row["failure_count"] += 1
+            row["last_failure"] = now
+            row["probe_started"] = None
+
+            if row["state"] == HALF_OPEN:
+                row["state"] = OPEN
+                print(f"[CIRCUIT BREAKER] {self.name}: probe failed, re-OPENED")
+            elif row["state"] == CLOSED and row["failure_count"] >= self.max_failures:
+                # Open circuit if threshold exceeded
+                row["state"] = OPEN
+                print(f"[CIRCUIT BREAKER] {self.name}: OPENED after {row['failure_count']} consecutive failures")
+            return row
+
+        self._update(fail)
+
     def can_attempt(self) -> bool:
-        """Check if we can attempt another operation."""
-        if not self.is_open:
-            return True
-        
-        # Check if enough time has passed to auto-reset
-        if self.last_failure_time and (datetime.utcnow() - self.last_failure_time) > self.reset_window:
-            print(f"[CIRCUIT BREAKER] Auto-resetting after {self.reset_window.seconds}s cooldown")
-            self.failure_count = 0
-            self.is_open = False
+        """
+        Check if we can attempt another operation.
+        Closed: always. Open: no, until the cooldown passes; then exactly one caller
+        (across all processes) gets a half-open probe until it reports back.
+        """
+        row = self._read()
+        if row["state"] == CLOSED:
             return True
-        
-        return False
-    
+
+        granted = []
+
+        def try_probe(row):
+            now = time.time()
+            if row["state"] == CLOSED:
+                granted.append(True)
+            elif row["state"] == OPEN and now - (row["last_failure"] or 0) >= self.cooldown:
+                row["state"], row["probe_started"] = HALF_OPEN, now
+                granted.append(True)
+                print(f"[CIRCUIT BREAKER] {self.name}: HALF_OPEN, probing after {self.cooldown:.0f}s cooldown")
+            elif row["state"] == HALF_OPEN and now - (row["probe_started"] or 0) >= self.cooldown:
+                # The previous probe never reported back (process died); hand out a new one
+                row["probe_started"] = now
+                granted.append(True)
+            return row
+
+        self._update(try_probe)
+        return bool(granted)
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """Run `fn` through the breaker: fail fast while open, record the outcome otherwise."""
+        if not self.can_attempt():
+            raise RuntimeError(f"Circuit open: {self.name}")
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
     def get_status(self) -> Dict:
         """Get current status of the circuit breaker."""
+        row = self._read()
         return {
-            "is_open": self.is_open,
-            "failure_count": self.failure_count,
+            "name": self.name,
+            "state": row["state"],
+            "is_open": row["state"] != CLOSED,
+            "failure_count": row["failure_count"],
             "max_failures": self.max_failures,
-            "last_failure": self.last_failure_time.isoformat() if self.last_failure_time else None
+            "last_failure": datetime.utcfromtimestamp(row["last_failure"]).isoformat() if row["last_failure"] else None
         }
 
-# Global instance
-api_circuit_breaker = CircuitBreaker(max_consecutive_failures=5, reset_window_minutes=60)
+
+def _is_outage(result: Any) -> bool:
+    """{"error": ..., "status": 5xx} - the broker failed, as opposed to rejecting the request."""
+    return isinstance(result, dict) and "error" in result and (result.get("status") or 0) >= 500
+
+
+def guarded(breaker: CircuitBreaker, count_error_results: bool = True):
+    """
+    Decorator for OandaClient methods: return {"error": ...} without calling the API
+    while `breaker` is open. Exceptions (transport errors) and 5xx error results always
+    count as failures; other {"error": ...} results only if `count_error_results`
+    (False for orders, where a 4xx rejection is the broker working correctly).
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            if not breaker.can_attempt():
+                return {"error": f"Circuit open: {breaker.name}"}
+            try:
+                result = method(*args, **kwargs)
+            except Exception:
+                breaker.record_failure()
+                raise
+            if _is_outage(result) or (count_error_results and isinstance(result, dict) and "error" in result):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            return result
+        return wrapper
+    return decorator
+
+
+# Global instances (state shared by every process through STATE_FILE)
+shared_store = SharedBreakerStore(STATE_FILE)
+api_circuit_breaker = CircuitBreaker(max_consecutive_failures=5, reset_window_minutes=60,
+                                     name="agent_cycle", store=shared_store)
+gemini_breaker = CircuitBreaker(max_consecutive_failures=5, reset_window_minutes=15,
+                                name="gemini", store=shared_store, cooldown_seconds=120)
+oanda_pricing_breaker = CircuitBreaker(max_consecutive_failures=5, reset_window_minutes=5,
+                                       name="oanda_pricing", store=shared_store, cooldown_seconds=30)
+oanda_orders_breaker = CircuitBreaker(max_consecutive_failures=3, reset_window_minutes=15,
+                                      name="oanda_orders", store=shared_store, cooldown_seconds=60)
+
+ALL_BREAKERS = (api_circuit_breaker, gemini_breaker, oanda_pricing_breaker, oanda_orders_breaker)
+
+
+def set_breaker_store(store):
+    """Point every global breaker at a specific store (e.g. MemoryBreakerStore in tests)."""
+    for breaker in ALL_BREAKERS:
+        breaker._store = store
@@ -1,33 +1,158 @@
 """
 Kill Switch Module - Emergency Trading Halt
 Checks for the presence of a flag file to determine if trading is enabled.
+The flag lives at an absolute path (KILL_SWITCH_FILE, default: repo root) so every
+process sees the same switch regardless of working directory. A watcher keeps an
+in-memory copy current (filesystem notifications via watchdog when installed,
+otherwise a stat poll), so is_trading_enabled() is cheap enough to call right
+before every order submission.
 """
 import os
+import threading
+from typing import Callable, List, Optional
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+FLAG_FILE = os.path.abspath(os.getenv("KILL_SWITCH_FILE") or os.path.join(_REPO_ROOT, "TRADING_ENABLED.flag"))
+POLL_SECONDS = 0.1  # Watcher period when watchdog is unavailable
+SAFETY_POLL_SECONDS = 1.0  # Backstop poll alongside notifications (e.g. missed events on network filesystems)
+
+
+class KillSwitch:
+    """Cached view of the flag file, refreshed by a background watcher."""
+
+    def __init__(self, flag_file: str = FLAG_FILE, poll_seconds: float = POLL_SECONDS):
+        self.flag_file = flag_file
+        self.poll_seconds = poll_seconds
+        self._enabled: Optional[bool] = None
+        self._listeners: List[Callable[[bool], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._observer = None
+        self.mode = "OFF"
+
+    def _refresh(self, announce: bool = True) -> bool:
+        """Re-read the flag file and notify listeners if it flipped."""
+        enabled = os.path.exists(self.flag_file)
+        with self._lock:
+            changed = self._enabled is not None and enabled != self._enabled
+            self._enabled = enabled
+            listeners = list(self._listeners)
+        if changed:
+            if announce:
+                print(f"[KILL SWITCH] Trading {'ENABLED' if enabled else 'DISABLED'} (flag file changed)")
+            for listener in listeners:
+                try:
+                    listener(enabled)
+                except Exception as e:
+                    print(f"[KILL SWITCH] Listener error: {e}")
+        return enabled
+
+    def is_enabled(self) -> bool:
+        """Cached flag while watching; a direct stat otherwise."""
+        if self.mode == "OFF" or self._enabled is None:
+            return self._refresh()
+        return self._enabled
+
+    def add_listener(self, callback: Callable[[bool], None]):
+        """Call `callback(enabled)` whenever the switch flips (from any process)."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def _poll(self, interval: float):
+        while not self._stop.wait(interval):
+            self._refresh()
+
+    def _start_notifications(self) -> bool:
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return False
+
+        switch = self
+
+        class _FlagHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                paths = {getattr(event, "src_path", None), getattr(event, "dest_path", None)}
+                if switch.flag_file in {os.path.abspath(p) for p in paths if p}:
+                    switch._refresh()
+
+        try:
+            observer = Observer()
+            observer.daemon = True
+            observer.schedule(_FlagHandler(), os.path.dirname(self.flag_file), recursive=False)
+            observer.start()
+        except Exception as e:
+            print(f"[KILL SWITCH] File notifications unavailable ({e}), polling instead")
+            return False
+        self._observer = observer
+        return True
+
+    def start(self) -> "KillSwitch":
+        """Start watching (idempotent)."""
+        with self._lock:
+            if self.mode != "OFF":
+                return self
+            self.mode = "STARTING"
+        self._refresh()
+        notify = self._start_notifications()
+        interval = max(self.poll_seconds, SAFETY_POLL_SECONDS) if notify else self.poll_seconds
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, args=(interval,), name="kill-switch", daemon=True)
+        self._thread.start()
+        self.mode = "NOTIFY" if notify else "POLL"
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        self.mode = "OFF"
+
+    def set(self, enabled: bool):
+        """Write the flag file and update this process immediately."""
+        if enabled:
+            with open(self.flag_file, 'w') as f:
+                f.write("Trading is ACTIVE. Delete this file to emergency stop.\n")
+        elif os.path.exists(self.flag_file):
+            os.remove(self.flag_file)
+        self._refresh(announce=False)
+
+    def get_status(self) -> dict:
+        """Get current switch state."""
+        return {"enabled": self.is_enabled(), "flag_file": self.flag_file, "mode": self.mode}
+
+
+# Global instance
+kill_switch = KillSwitch()
 
-FLAG_FILE = "TRADING_ENABLED.flag"
 
 def is_trading_enabled() -> bool:
     """
     Check if trading is currently enabled.
     Returns True if flag file exists, False otherwise.
     """
-    return os.path.exists(FLAG_FILE)
+    return kill_switch.is_enabled()
 
 def enable_trading():
     """Create the flag file to enable trading."""
-    with open(FLAG_FILE, 'w') as f:
-        f.write("Trading is ACTIVE. Delete this file to emergency stop.\n")
+    kill_switch.set(True)
     print("[KILL SWITCH] Trading ENABLED")
 
 def disable_trading():
     """Remove the flag file to disable trading."""
-    if os.path.exists(FLAG_FILE):
-        os.remove(FLAG_FILE)
+    kill_switch.set(False)
     print("[KILL SWITCH] Trading DISABLED")
 
 if __name__ == "__main__":
     # Quick test
     print("=== KILL SWITCH TEST ===")
+    print(f"Flag file: {FLAG_FILE}")
     print(f"Trading enabled: {is_trading_enabled()}")
     enable_trading()
     print(f"After enable: {is_trading_enabled()}")
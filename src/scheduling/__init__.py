@@ -0,0 +1 @@
+# Scheduling __init__.py
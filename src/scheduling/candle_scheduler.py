@@ -0,0 +1,115 @@
+"""
+Candle Scheduler - Candle-Close-Aligned Cycle Timing
+Wakes the agent right after M5/M15/H1 candles close instead of sleeping a fixed
+interval, skips cycles whose candle inputs have not changed and tracks jitter.
+"""
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Candle lengths in seconds (OANDA granularity codes)
+GRANULARITY_SECONDS = {
+    "M5": 5 * 60,
+    "M15": 15 * 60,
+    "H1": 60 * 60,
+}
+
+
+class CandleScheduler:
+    """Schedules agent cycles on candle close boundaries."""
+
+    def __init__(
+        self,
+        cycle_granularity: str = "M15",
+        settle_seconds: float = 3.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if cycle_granularity not in GRANULARITY_SECONDS:
+            raise ValueError(f"Unsupported granularity: {cycle_granularity}")
+
+        self.cycle_granularity = cycle_granularity
+        self.cycle_seconds = GRANULARITY_SECONDS[cycle_granularity]
+        # OANDA marks a candle complete a moment after the boundary
+        self.settle_seconds = settle_seconds
+        self._clock = clock
+        self._sleep = sleep
+
+        self.last_fingerprint: Optional[Tuple] = None
+        self.cycles_run = 0
+        self.cycles_skipped = 0
+        self.jitter_samples = 0
+        self.last_jitter_ms = 0.0
+        self.total_jitter_ms = 0.0
+        self.max_jitter_ms = 0.0
+
+    def next_close(self, now: Optional[float] = None) -> float:
+        """Epoch time of the next cycle-granularity candle close after `now`."""
+        now = self._clock() if now is None else now
+        return (int(now // self.cycle_seconds) + 1) * self.cycle_seconds
+
+    @staticmethod
+    def closed_granularities(boundary: float) -> List[str]:
+        """Granularities whose candle closes exactly at `boundary`."""
+        return [g for g, secs in GRANULARITY_SECONDS.items() if int(boundary) % secs == 0]
+
+    def wait_for_next_close(self) -> List[str]:
+        """
+        Sleep until the next candle close (plus settle delay).
+        Returns the granularities that closed at that boundary, e.g. ["M5", "M15", "H1"].
+        """
+        boundary = self.next_close()
+        target = boundary + self.settle_seconds
+
+        # Sleep in one go, then top up if the OS woke us early
+        remaining = target - self._clock()
+        while remaining > 0:
+            self._sleep(remaining)
+            remaining = target - self._clock()
+
+        self._record_jitter(self._clock() - target)
+        return self.closed_granularities(boundary)
+
+    def seconds_until_next_close(self) -> float:
+        """Seconds left before the next scheduled wake-up."""
+        return max(0.0, self.next_close() + self.settle_seconds - self._clock())
+
+    def inputs_changed(self, candle_timestamps: Dict[str, str]) -> bool:
+        """
+        Compare the latest complete candle per timeframe against the last completed cycle.
+        Returns False (skip the cycle) when nothing has closed since then, e.g. over the
+        weekend or when the broker has not published the new candle yet.
+        """
+        if tuple(sorted(candle_timestamps.items())) == self.last_fingerprint:
+            self.cycles_skipped += 1
+            return False
+        return True
+
+    def record_cycle(self, candle_timestamps: Dict[str, str]):
+        """
+        Remember the inputs of a cycle that completed. Called only on success, so a
+        failed cycle is retried on the same candles at the next wake-up.
+        """
+        self.last_fingerprint = tuple(sorted(candle_timestamps.items()))
+        self.cycles_run += 1
+
+    def _record_jitter(self, jitter_seconds: float):
+        jitter_ms = max(0.0, jitter_seconds * 1000)
+        self.jitter_samples += 1
+        self.last_jitter_ms = jitter_ms
+        self.total_jitter_ms += jitter_ms
+        self.max_jitter_ms = max(self.max_jitter_ms, jitter_ms)
+
+    def get_status(self) -> Dict:
+        """Get scheduling statistics."""
+        avg_jitter = self.total_jitter_ms / self.jitter_samples if self.jitter_samples else 0.0
+        next_wake = datetime.fromtimestamp(self.next_close() + self.settle_seconds, tz=timezone.utc)
+        return {
+            "cycle_granularity": self.cycle_granularity,
+            "cycles_run": self.cycles_run,
+            "cycles_skipped": self.cycles_skipped,
+            "last_jitter_ms": round(self.last_jitter_ms, 1),
+            "avg_jitter_ms": round(avg_jitter, 1),
+            "max_jitter_ms": round(self.max_jitter_ms, 1),
+            "next_wake": next_wake.isoformat(),
+        }
@@ -10,11 +10,15 @@ class AgentState(TypedDict):
     technical_indicators: Dict[str, Any]
     macro_sentiment: Dict[str, Any]
     risk_environment: Dict[str, Any]
+    candle_timestamps: Dict[str, str] # Latest complete candle time per timeframe (H1, M15, M5)
     
     # Decision States
+    pre_screen: Dict[str, Any] # Deterministic gate result: passed, reason
     current_bias: str # "BIAS_LONG", "BIAS_SHORT", "RISK_OFF"
     market_structure: str # e.g. "TRENDING", "RANGING"
     hard_levels: Dict[str, float] # Invalidation and Target levels from Strategist
+    key_zone: Dict[str, Any] # Architect's 15M entry zone: price, type
+    resting_orders: int # PENDING entry orders already working at OANDA
     learning_context: str # Performance summary from Evaluator
     
     # Reasoning Logs (Append-only)
@@ -1,8 +1,57 @@
 """
 Data Validator Module - Ensures Data Quality
 Validates market data from OANDA before use in trading decisions.
+Candle checks are vectorized over NumPy OHLC arrays (validate_candle_arrays), so the
+same code validates a 20-candle cycle or a multi-million-row backfill.
 """
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+
+# Bad-row reason flags returned by validate_candle_arrays (OR-ed together per row)
+BAD_OHLC = 1  # low > open/close or high < open/close
+NON_POSITIVE = 2  # any price <= 0 (or NaN)
+BAD_TIMESTAMP = 4  # duplicate or earlier than the previous candle
+GAP = 8  # missing candles before this row (weekend closes excused)
+JUMP = 16  # open/close moved more than max_jump from the previous close
+
+GRANULARITY_SECONDS = {"M1": 60, "M5": 300, "M15": 900, "M30": 1800, "H1": 3600, "H4": 14400, "D": 86400}
+WEEKEND_CLOSE_SECONDS = 49 * 3600  # Friday close -> Sunday open, with an hour of DST slack
+
+
+def describe_reasons(flags: int, values: Tuple[float, ...] = ()) -> List[str]:
+    """Readable labels for one row's flag bits (`values` = its OHLC, to tell NaN from <= 0)."""
+    labels = []
+    if flags & BAD_OHLC:
+        labels.append("Invalid OHLC")
+    if flags & NON_POSITIVE:
+        labels.append("NaN price" if any(np.isnan(v) for v in values) else "Zero price")
+    if flags & BAD_TIMESTAMP:
+        labels.append("Out-of-order timestamp")
+    if flags & GAP:
+        labels.append("Gap")
+    if flags & JUMP:
+        labels.append("Price jump")
+    return labels
+
+
+def _malformed_index(candles: List[Dict[str, Any]]) -> int:
+    for i, c in enumerate(candles):
+        try:
+            [float(c[k]) for k in ("open", "high", "low", "close")]
+        except (KeyError, TypeError, ValueError):
+            return i
+    return 0
+
+
+def candles_to_arrays(candles: List[Dict[str, Any]], with_time: bool = True) -> Dict[str, np.ndarray]:
+    """Column arrays from get_candles() dicts: time as datetime64[s], OHLC as float64."""
+    arrays = {key: np.fromiter((c[key] for c in candles), dtype=float, count=len(candles))
+              for key in ("open", "high", "low", "close")}
+    if with_time and candles and "time" in candles[0]:
+        # OANDA RFC3339 ("...000000000Z"); numpy parses it without the zone suffix
+        arrays["time"] = np.array([str(c["time"]).rstrip("Z") for c in candles], dtype="datetime64[ns]")
+        arrays["time"] = arrays["time"].astype("datetime64[s]")
+    return arrays
 
 class DataValidator:
     """Validates market data quality."""
@@ -37,30 +86,91 @@ class DataValidator:
     @staticmethod
     def validate_candles(candles: List[Dict[str, Any]]) -> Tuple[bool, str]:
         """Validate historical candle data."""
+        if isinstance(candles, dict) and "error" in candles:
+            return False, f"Candle error: {candles['error']}"
+        
         if not candles:
             return False, "No candles returned"
         
         if len(candles) < DataValidator.MIN_CANDLES:
             return False, f"Insufficient candles: {len(candles)} (min: {DataValidator.MIN_CANDLES})"
         
-        # Check for corrupt candles
-        for i, candle in enumerate(candles):
-            try:
-                o, h, l, c = candle['open'], candle['high'], candle['low'], candle['close']
-                
-                # Basic OHLC validation
-                if not (l <= o <= h and l <= c <= h):
-                    return False, f"Invalid OHLC at index {i}: O={o}, H={h}, L={l}, C={c}"
-                
-                # Check for zero prices
-                if any(p <= 0 for p in [o, h, l, c]):
-                    return False, f"Zero price detected at index {i}"
-                    
-            except (KeyError, TypeError) as e:
-                return False, f"Malformed candle at index {i}: {str(e)}"
+        try:
+            arrays = candles_to_arrays(candles, with_time=False)
+        except (KeyError, TypeError, ValueError) as e:
+            return False, f"Malformed candle at index {_malformed_index(candles)}: {str(e)}"
+        
+        # Price checks only: cycle candles may legitimately repeat/skip times or move sharply
+        _, reasons = DataValidator.validate_candle_arrays(
+            arrays["open"], arrays["high"], arrays["low"], arrays["close"], max_jump=None
+        )
+        bad_rows = np.flatnonzero(reasons)
+        if bad_rows.size:
+            i = int(bad_rows[0])
+            values = tuple(arrays[k][i] for k in ("open", "high", "low", "close"))
+            c = candles[i]
+            return False, (f"{' + '.join(describe_reasons(int(reasons[i]), values))} at index {i}: "
+                           f"O={c['open']}, H={c['high']}, L={c['low']}, C={c['close']} "
+                           f"({bad_rows.size} bad candles)")
         
         return True, f"{len(candles)} candles valid"
     
+    @staticmethod
+    def validate_candle_arrays(
+        open_: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        time: Optional[np.ndarray] = None,
+        granularity: Optional[str] = None,
+        max_jump: Optional[float] = 0.02,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized candle checks over equal-length arrays.
+        
+        `time` (datetime64 or integer epoch seconds) enables the timestamp checks;
+        `granularity` (e.g. "M5") additionally enables gap detection. `max_jump` is the
+        largest allowed relative move from the previous close (None disables it).
+        Returns (bad_mask, reasons) where reasons holds the OR-ed flag bits per row.
+        """
+        o, h, l, c = (np.asarray(a, dtype=np.float64) for a in (open_, high, low, close))
+        n = o.shape[0]
+        reasons = np.zeros(n, dtype=np.uint8)
+        
+        # OHLC consistency (NaN compares False, so it is caught by the positivity check)
+        reasons[(l > o) | (l > c) | (h < o) | (h < c)] |= BAD_OHLC
+        positive = (o > 0) & (h > 0) & (l > 0) & (c > 0)
+        reasons[~positive] |= NON_POSITIVE
+        
+        if n > 1 and max_jump is not None:
+            prev_close = c[:-1]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                move = np.maximum(np.abs(o[1:] - prev_close), np.abs(c[1:] - prev_close)) / prev_close
+            # Only judge a jump against a sane previous close
+            jump = (move > max_jump) & positive[:-1]
+            reasons[1:][jump] |= JUMP
+        
+        if time is not None and n > 1:
+            t = np.asarray(time)
+            if np.issubdtype(t.dtype, np.datetime64):
+                t = t.astype("datetime64[s]").astype(np.int64)
+            else:
+                t = t.astype(np.int64)
+            # Compare with the latest time seen so far, so one stray row doesn't flag its neighbours
+            latest = np.maximum.accumulate(t)[:-1]
+            step = t[1:] - latest
+            reasons[1:][step <= 0] |= BAD_TIMESTAMP
+            
+            if granularity:
+                expected = GRANULARITY_SECONDS[granularity]
+                gap = step > expected
+                # Weekend close: previous candle on Friday (1970-01-01 was a Thursday -> Monday = 0)
+                weekday = ((latest // 86400) + 3) % 7
+                weekend = (weekday == 4) & (step <= WEEKEND_CLOSE_SECONDS + expected)
+                reasons[1:][gap & ~weekend] |= GAP
+        
+        return reasons != 0, reasons
+    
     @staticmethod
     def validate_technical_indicators(tech_data: Dict[str, Any]) -> Tuple[bool, str]:
         """Validate calculated technical indicators."""
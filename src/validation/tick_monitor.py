@@ -0,0 +1,194 @@
+"""
+Tick Monitor - Streaming Quote Anomaly Detection
+Keeps O(1) rolling statistics per instrument (EWMA of spread and of mid-price return
+variance per second) from the quotes the process already fetches, and flags stale
+quotes, spread spikes and price jumps relative to recent volatility.
+"""
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+STALE = "STALE_QUOTE"
+SPREAD_SPIKE = "SPREAD_SPIKE"
+PRICE_JUMP = "PRICE_JUMP"
+
+
+def quote_epoch(ts: Any) -> Optional[float]:
+    """Epoch seconds from an OANDA RFC3339 time (nanosecond fraction allowed) or a number."""
+    if ts is None:
+        return None
+    if isinstance(ts, (int, float)):
+        return float(ts)
+    if isinstance(ts, datetime):
+        return ts.replace(tzinfo=ts.tzinfo or timezone.utc).timestamp()
+    text = str(ts).rstrip("Z")
+    main, _, fraction = text.partition(".")
+    try:
+        seconds = datetime.fromisoformat(main).replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return None
+    return seconds + (float(f"0.{fraction}") if fraction.isdigit() else 0.0)
+
+
+class EwmaStats:
+    """Exponentially weighted mean/variance; constant time and memory per update."""
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+
+    def update(self, x: float):
+        if self.count == 0:
+            self.mean = x
+        else:
+            delta = x - self.mean
+            self.mean += self.alpha * delta
+            self.var = (1 - self.alpha) * (self.var + self.alpha * delta * delta)
+        self.count += 1
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.var)
+
+
+class _InstrumentState:
+    def __init__(self, alpha: float):
+        self.spread = EwmaStats(alpha)
+        self.return_var = EwmaStats(alpha)  # Mean of r^2 / dt -> variance per second
+        self.last_mid: Optional[float] = None
+        self.last_time: Optional[float] = None
+        self.last_flags: List[str] = []
+        self.last_message = "No ticks yet"
+        self.anomalies = 0
+
+
+class TickAnomalyDetector:
+    """Per-instrument streaming checks fed with {"bid", "ask", "timestamp"} quotes."""
+
+    def __init__(
+        self,
+        stale_seconds: float = 60,
+        spread_sigmas: float = 6.0,
+        spread_ratio: float = 2.5,
+        jump_sigmas: float = 6.0,
+        min_jump: float = 0.0015,
+        warmup_ticks: int = 15,
+        alpha: float = 0.05,
+    ):
+        self.stale_seconds = stale_seconds
+        self.spread_sigmas = spread_sigmas
+        self.spread_ratio = spread_ratio  # A spike must also be this multiple of the mean spread
+        self.jump_sigmas = jump_sigmas
+        self.min_jump = min_jump  # Relative move always tolerated (0.15% ~ 16 pips on EUR/USD)
+        self.warmup_ticks = warmup_ticks
+        self.alpha = alpha
+        self._states: Dict[str, _InstrumentState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, pair: str) -> _InstrumentState:
+        state = self._states.get(pair)
+        if state is None:
+            state = self._states[pair] = _InstrumentState(self.alpha)
+        return state
+
+    def seed_returns(self, pair: str, closes: List[float], interval_seconds: float):
+        """
+        Warm the volatility estimate from candle closes the cycle already fetched, so
+        the jump check works from the first tick. No-op once warmed up.
+        """
+        with self._lock:
+            state = self._state(pair)
+            if state.return_var.count >= self.warmup_ticks:
+                return
+            for prev, cur in zip(closes, closes[1:]):
+                if prev > 0 and cur > 0:
+                    state.return_var.update(math.log(cur / prev) ** 2 / interval_seconds)
+
+    def observe(self, pair: str, quote: Dict[str, Any], now: Optional[float] = None) -> Tuple[bool, str]:
+        """Check one quote against the instrument's recent behaviour, then fold it in."""
+        bid, ask = quote.get("bid"), quote.get("ask")
+        if not bid or not ask or bid <= 0 or ask <= 0:
+            return False, f"Unusable quote for {pair}: bid={bid}, ask={ask}"
+
+        now = time.time() if now is None else now
+        tick_time = quote_epoch(quote.get("timestamp"))
+        mid, spread = (bid + ask) / 2, ask - bid
+        flags, details = [], []
+
+        with self._lock:
+            state = self._state(pair)
+
+            # --- Stale: old quote, or time going backwards ---
+            if tick_time is not None:
+                age = now - tick_time
+                if age > self.stale_seconds:
+                    flags.append(STALE)
+                    details.append(f"quote is {age:.0f}s old")
+                elif state.last_time is not None and tick_time < state.last_time:
+                    flags.append(STALE)
+                    details.append("quote time went backwards")
+
+            # --- Spread spike vs the rolling spread ---
+            if state.spread.count >= self.warmup_ticks:
+                limit = max(state.spread.mean + self.spread_sigmas * state.spread.std,
+                            state.spread.mean * self.spread_ratio)
+                if spread > limit:
+                    flags.append(SPREAD_SPIKE)
+                    details.append(f"spread {spread:.5f} > {limit:.5f}")
+
+            # --- Jump vs volatility scaled to the time since the last tick ---
+            ret = None
+            if state.last_mid is not None:
+                ret = math.log(mid / state.last_mid)
+                dt = max((tick_time or now) - (state.last_time or now), 1.0)
+                if state.return_var.count >= self.warmup_ticks:
+                    limit = max(self.jump_sigmas * math.sqrt(state.return_var.mean * dt), self.min_jump)
+                    if abs(ret) > limit:
+                        flags.append(PRICE_JUMP)
+                        details.append(f"mid moved {ret * 100:+.3f}% (limit {limit * 100:.3f}%)")
+
+            # --- Fold in (anomalous values clipped so one bad tick can't poison the stats) ---
+            if SPREAD_SPIKE not in flags:
+                state.spread.update(spread)
+            if ret is not None and STALE not in flags:
+                squared = min(ret * ret, self.min_jump ** 2) if PRICE_JUMP in flags else ret * ret
+                state.return_var.update(squared / dt)
+            if STALE not in flags:
+                state.last_mid, state.last_time = mid, tick_time or now
+
+            state.last_flags = flags
+            state.last_message = (f"{pair} tick anomaly: {', '.join(flags)} ({'; '.join(details)})"
+                                  if flags else f"{pair} tick OK")
+            state.anomalies += bool(flags)
+            return not flags, state.last_message
+
+    def last_verdict(self, pair: str) -> Tuple[bool, str]:
+        """Result of the most recent observe() for `pair`."""
+        with self._lock:
+            state = self._states.get(pair)
+            if state is None:
+                return True, "No ticks yet"
+            return not state.last_flags, state.last_message
+
+    def get_status(self) -> Dict:
+        """Rolling statistics per instrument."""
+        with self._lock:
+            return {
+                pair: {
+                    "ticks": s.spread.count,
+                    "spread_mean": s.spread.mean,
+                    "spread_std": s.spread.std,
+                    "vol_per_sqrt_second": math.sqrt(s.return_var.mean),
+                    "anomalies": s.anomalies,
+                    "last_flags": list(s.last_flags),
+                }
+                for pair, s in self._states.items()
+            }
+
+
+# Global instance
+tick_monitor = TickAnomalyDetector()
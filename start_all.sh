@@ -19,6 +19,16 @@ sleep 5
   done
 ) &
 
+# Event-driven exit tracker (OANDA transaction stream) with the same restart protection
+(
+  while true; do
+    echo "[$(date)] Exit tracker starting..."
+    PYTHONPATH=. python src/monitoring/transaction_stream.py
+    echo "[$(date)] Exit tracker exited with code $?. Restarting in 10 seconds..."
+    sleep 10
+  done
+) &
+
 # Start the Streamlit Dashboard in the foreground
 echo "Starting Dashboard..."
 PYTHONPATH=. streamlit run src/dashboard/app.py --server.port $PORT --server.address 0.0.0.0
@@ -0,0 +1,101 @@
+"""
+Test Suite for the Vectorized Candle Validator
+Each check flags exactly the rows it should, and the dict-based wrapper keeps its messages.
+"""
+import unittest
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.validation.data_validator import (
+    DataValidator, candles_to_arrays, BAD_OHLC, NON_POSITIVE, BAD_TIMESTAMP, GAP, JUMP
+)
+
+def series(n, start="2024-01-01T00:00", step_minutes=5):
+    """Clean M5 candles in a gentle uptrend."""
+    close = 1.08 + np.arange(n) * 1e-5
+    open_ = np.r_[close[0], close[:-1]]
+    time = np.datetime64(start) + np.arange(n) * np.timedelta64(step_minutes, "m")
+    return {"open": open_, "high": np.maximum(open_, close) + 2e-5, "low": np.minimum(open_, close) - 2e-5,
+            "close": close, "time": time}
+
+def check(d, **kwargs):
+    return DataValidator.validate_candle_arrays(d["open"], d["high"], d["low"], d["close"], **kwargs)
+
+class TestCandleArrays(unittest.TestCase):
+    
+    def test_clean_series(self):
+        mask, reasons = check(series(1000), time=series(1000)["time"], granularity="M5")
+        self.assertFalse(mask.any())
+    
+    def test_price_checks(self):
+        d = series(100)
+        d["high"][10] = d["low"][10] - 1e-4  # High below low
+        d["close"][20] = 0.0
+        d["open"][30] = np.nan
+        mask, reasons = check(d)
+        self.assertEqual(set(np.flatnonzero(mask)), {10, 20, 30})  # 21: no jump judged against a zero close
+        self.assertTrue(reasons[10] & BAD_OHLC)
+        self.assertTrue(reasons[20] & NON_POSITIVE)
+        self.assertTrue(reasons[30] & NON_POSITIVE)
+    
+    def test_jump(self):
+        d = series(100)
+        d["close"][50] = d["high"][50] = 1.20  # +11% spike
+        mask, reasons = check(d)
+        self.assertTrue(reasons[50] & JUMP)
+        self.assertTrue(reasons[51] & JUMP)  # And straight back
+        self.assertFalse(check(d, max_jump=None)[0].any())
+    
+    def test_timestamps_and_gaps(self):
+        d = series(100)
+        t = d["time"].copy()
+        t[10] = t[9]  # Duplicate (the 10th slot's candle is missing)
+        t[20] = t[5]  # Out of order
+        t[40:] += np.timedelta64(30, "m")  # Six missing M5 candles before row 40
+        mask, reasons = check(d, time=t, granularity="M5")
+        self.assertEqual(list(np.flatnonzero(reasons & BAD_TIMESTAMP)), [10, 20])
+        self.assertEqual(list(np.flatnonzero(reasons & GAP)), [11, 21, 40])
+        self.assertFalse(check(d, time=t)[1][40] & GAP)  # No granularity -> no gap check
+    
+    def test_weekend_gap_excused(self):
+        # Friday 2024-01-05 21:55 UTC -> Sunday 2024-01-07 22:00 UTC
+        t = np.array(["2024-01-05T21:50", "2024-01-05T21:55", "2024-01-07T22:00", "2024-01-07T22:05"],
+                     dtype="datetime64[s]")
+        d = series(4)
+        self.assertFalse(check(d, time=t, granularity="M5")[0].any())
+        # The same gap mid-week is flagged
+        t_midweek = t - np.timedelta64(3, "D")
+        self.assertTrue(check(d, time=t_midweek, granularity="M5")[1][2] & GAP)
+    
+    def test_candles_to_arrays(self):
+        candles = [{"time": "2024-01-05T21:50:00.000000000Z", "open": 1.1, "high": 1.2, "low": 1.0, "close": 1.15}]
+        arrays = candles_to_arrays(candles)
+        self.assertEqual(arrays["time"][0], np.datetime64("2024-01-05T21:50:00"))
+        self.assertEqual(arrays["high"].dtype, np.float64)
+    
+    def test_dict_wrapper_reports_first_bad_and_count(self):
+        candles = [{"open": 1.05, "high": 1.06, "low": 1.04, "close": 1.055}] * 12
+        candles[3] = {"open": 1.05, "high": 1.04, "low": 1.06, "close": 1.055}
+        candles[7] = {"open": 0.0, "high": 1.06, "low": 0.0, "close": 1.055}
+        ok, message = DataValidator.validate_candles(candles)
+        self.assertFalse(ok)
+        self.assertIn("Invalid OHLC at index 3", message)
+        self.assertIn("2 bad candles", message)
+        candles[3] = {"open": 1.05, "high": 1.06}
+        self.assertIn("Malformed candle at index 3", DataValidator.validate_candles(candles)[1])
+    
+    def test_dict_wrapper_reason_messages(self):
+        candles = [{"open": 1.05, "high": 1.06, "low": 1.04, "close": 1.055}] * 12
+        candles[5] = {"open": 1.09, "high": 1.095, "low": 1.085, "close": 1.09}  # ~3% move: a real market, not bad data
+        self.assertTrue(DataValidator.validate_candles(candles)[0])
+        candles[7] = {"open": 0.0, "high": 1.06, "low": 0.0, "close": 1.055}
+        self.assertIn("Zero price at index 7", DataValidator.validate_candles(candles)[1])
+        candles[7] = {"open": float("nan"), "high": 1.06, "low": 1.04, "close": 1.055}
+        self.assertIn("NaN price at index 7", DataValidator.validate_candles(candles)[1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Test Suite for the Candle Scheduler
+Validates candle-close alignment, unchanged-input skipping and jitter tracking.
+"""
+import unittest
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scheduling.candle_scheduler import CandleScheduler
+from src.validation.tick_monitor import TickAnomalyDetector
+
+class FakeClock:
+    """Deterministic clock whose sleep() advances time (plus optional oversleep)."""
+    
+    def __init__(self, start: float, oversleep: float = 0.0):
+        self.now = start
+        self.oversleep = oversleep
+    
+    def time(self) -> float:
+        return self.now
+    
+    def sleep(self, seconds: float):
+        self.now += seconds + self.oversleep
+
+class TestCandleScheduler(unittest.TestCase):
+    """Test candle-aligned scheduling."""
+    
+    def test_next_close_is_aligned(self):
+        """Next close should land on the next 15-minute boundary."""
+        clock = FakeClock(start=3600 * 10 + 7 * 60 + 13)  # 10:07:13
+        scheduler = CandleScheduler("M15", clock=clock.time, sleep=clock.sleep)
+        self.assertEqual(scheduler.next_close(), 3600 * 10 + 15 * 60)
+    
+    def test_no_drift_from_cycle_duration(self):
+        """Wake-ups stay on boundaries regardless of how long a cycle took."""
+        clock = FakeClock(start=1000.0)
+        scheduler = CandleScheduler("M5", settle_seconds=2.0, clock=clock.time, sleep=clock.sleep)
+        
+        scheduler.wait_for_next_close()
+        self.assertEqual(clock.now, 1200 + 2.0)
+        
+        clock.now += 97  # Simulated cycle duration
+        scheduler.wait_for_next_close()
+        self.assertEqual(clock.now, 1500 + 2.0)
+    
+    def test_closed_granularities(self):
+        """Top-of-hour boundary closes M5, M15 and H1 together."""
+        self.assertEqual(CandleScheduler.closed_granularities(7200), ["M5", "M15", "H1"])
+        self.assertEqual(CandleScheduler.closed_granularities(7200 + 900), ["M5", "M15"])
+        self.assertEqual(CandleScheduler.closed_granularities(7200 + 300), ["M5"])
+    
+    def test_skips_unchanged_inputs(self):
+        """Same candle timestamps twice in a row should skip the second cycle."""
+        scheduler = CandleScheduler("M15")
+        stamps = {"H1": "2024-01-26T21:00:00Z", "M15": "2024-01-26T21:45:00Z"}
+        
+        self.assertTrue(scheduler.inputs_changed(stamps))
+        scheduler.record_cycle(stamps)
+        self.assertFalse(scheduler.inputs_changed(dict(stamps)))
+        newer = {**stamps, "M15": "2024-01-26T22:00:00Z"}
+        self.assertTrue(scheduler.inputs_changed(newer))
+        scheduler.record_cycle(newer)
+        
+        status = scheduler.get_status()
+        self.assertEqual(status["cycles_run"], 2)
+        self.assertEqual(status["cycles_skipped"], 1)
+    
+    def test_failed_cycle_is_retried(self):
+        """Inputs of a cycle that never completed still count as changed."""
+        scheduler = CandleScheduler("M15")
+        stamps = {"H1": "2024-01-26T21:00:00Z", "M15": "2024-01-26T21:45:00Z"}
+        self.assertTrue(scheduler.inputs_changed(stamps))
+        # Graph raised - record_cycle() never called
+        self.assertTrue(scheduler.inputs_changed(stamps))
+        self.assertEqual(scheduler.get_status()["cycles_run"], 0)
+    
+    def test_jitter_reporting(self):
+        """Oversleeping should be reported as schedule jitter."""
+        clock = FakeClock(start=10.0, oversleep=0.25)
+        scheduler = CandleScheduler("M5", settle_seconds=0.0, clock=clock.time, sleep=clock.sleep)
+        scheduler.wait_for_next_close()
+        
+        status = scheduler.get_status()
+        self.assertAlmostEqual(status["last_jitter_ms"], 250.0, places=1)
+        self.assertAlmostEqual(status["max_jitter_ms"], 250.0, places=1)
+
+class TestCycleCandleTimestamps(unittest.TestCase):
+    """fetch_live_market_data only reads candle times from validated candle lists."""
+    
+    def fetch(self, m15):
+        from src import main
+        candles = [{"time": f"2024-01-24T{h:02d}:00:00Z", "open": 1.085, "high": 1.086, "low": 1.084,
+                    "close": 1.0855} for h in range(20)]
+        client = SimpleNamespace(get_cycle_data=lambda *a, **k: {
+            "price": {"bid": 1.0850, "ask": 1.0851, "timestamp": "2024-01-24T19:00:00Z"},
+            "candles": {"H1": candles, "M15": m15, "M5": candles}})
+        with patch("src.main.get_oanda_client", return_value=client), \
+                patch.object(main, "tick_monitor", TickAnomalyDetector()):
+            return main.fetch_live_market_data()
+    
+    def test_failed_m15_fetch_is_a_validation_error(self):
+        """An {"error": ...} result raises a clean ValueError instead of a KeyError."""
+        with self.assertRaises(ValueError) as ctx:
+            self.fetch({"error": "Candle fetch failed"})
+        self.assertIn("(M15): Candle error: Candle fetch failed", str(ctx.exception))
+    
+    def test_timestamps_from_last_candles(self):
+        state = self.fetch([{"time": "2024-01-24T18:45:00Z", "open": 1.085, "high": 1.086, "low": 1.084,
+                             "close": 1.0855}] * 12)
+        self.assertEqual(state["candle_timestamps"]["M15"], "2024-01-24T18:45:00Z")
+        self.assertEqual(state["candle_timestamps"]["M5"], "2024-01-24T19:00:00Z")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+"""
+Test Suite for Shared Circuit Breakers
+Cross-process state, half-open probing and the OANDA fail-fast guard.
+"""
+import unittest
+import os
+import sys
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.safety.circuit_breaker import (
+    CircuitBreaker, SharedBreakerStore, MemoryBreakerStore, guarded, CLOSED, OPEN, HALF_OPEN
+)
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+class TestSharedState(unittest.TestCase):
+    """Two breakers with the same name and file are the same breaker."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "breakers.db")
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def _breaker(self, **kwargs):
+        return CircuitBreaker(max_consecutive_failures=3, name="oanda_pricing",
+                              store=SharedBreakerStore(self.path), **kwargs)
+    
+    def test_state_visible_across_instances(self):
+        agent, dashboard = self._breaker(), self._breaker()
+        for _ in range(3):
+            agent.record_failure()
+        self.assertTrue(dashboard.is_open)
+        self.assertEqual(dashboard.get_status()["failure_count"], 3)
+        dashboard.record_success()  # e.g. the Settings reset button
+        self.assertTrue(agent.can_attempt())
+        self.assertEqual(agent.state, CLOSED)
+    
+    def test_failures_from_other_processes_count(self):
+        """Concurrent increments from separate processes are not lost."""
+        code = (
+            "import sys; sys.path.insert(0, sys.argv[2]);"
+            "from src.safety.circuit_breaker import CircuitBreaker, SharedBreakerStore;"
+            "cb = CircuitBreaker(max_consecutive_failures=1000, name='oanda_pricing', store=SharedBreakerStore(sys.argv[1]));"
+            "[cb.record_failure() for _ in range(25)]"
+        )
+        procs = [subprocess.Popen([sys.executable, "-c", code, self.path, ROOT]) for _ in range(4)]
+        for p in procs:
+            self.assertEqual(p.wait(timeout=60), 0)
+        self.assertEqual(self._breaker().failure_count, 100)
+
+    def test_lock_contention_is_waited_out(self):
+        """A writer holding the file briefly delays the update instead of forcing a fallback."""
+        cb = self._breaker()
+        cb.record_failure()  # Creates the file and table
+        holder = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        holder.execute("BEGIN IMMEDIATE")
+        release = threading.Timer(0.3, lambda: holder.execute("COMMIT"))
+        release.start()
+        cb.record_failure()
+        release.join()
+        holder.close()
+        self.assertFalse(cb._degraded)
+        self.assertEqual(self._breaker().failure_count, 2)
+
+class FlakyStore(MemoryBreakerStore):
+    """Fails the next `failures` calls, like a transient 'database is locked'."""
+    
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+    
+    def update(self, name, mutate):
+        if self.failures:
+            self.failures -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return super().update(name, mutate)
+
+class TestFallback(unittest.TestCase):
+    """A failing shared store is bypassed for that call only."""
+    
+    def test_transient_error_does_not_detach_breaker(self):
+        store = FlakyStore(failures=1)
+        cb = CircuitBreaker(max_consecutive_failures=5, name="oanda_pricing", store=store)
+        cb.record_failure()  # Lands in process-local state
+        self.assertIs(cb._store, store)
+        cb.record_failure()
+        cb.record_failure()
+        self.assertEqual(store.read("oanda_pricing")["failure_count"], 2)  # Shared state used again
+        self.assertFalse(cb._degraded)
+
+class TestHalfOpen(unittest.TestCase):
+    """After the cooldown exactly one probe goes through."""
+    
+    def setUp(self):
+        self.store = MemoryBreakerStore()
+        self.cb = CircuitBreaker(max_consecutive_failures=2, name="gemini", store=self.store, cooldown_seconds=0.05)
+        self.cb.record_failure()
+        self.cb.record_failure()
+    
+    def test_fails_fast_then_single_probe(self):
+        self.assertFalse(self.cb.can_attempt())
+        time.sleep(0.06)
+        other_process = CircuitBreaker(max_consecutive_failures=2, name="gemini", store=self.store,
+                                       cooldown_seconds=0.05)
+        self.assertTrue(self.cb.can_attempt())
+        self.assertEqual(self.cb.state, HALF_OPEN)
+        self.assertFalse(other_process.can_attempt())
+    
+    def test_probe_success_closes(self):
+        time.sleep(0.06)
+        self.assertTrue(self.cb.can_attempt())
+        self.cb.record_success()
+        self.assertEqual(self.cb.state, CLOSED)
+        self.assertEqual(self.cb.failure_count, 0)
+    
+    def test_probe_failure_reopens(self):
+        time.sleep(0.06)
+        self.assertTrue(self.cb.can_attempt())
+        self.cb.record_failure()
+        self.assertEqual(self.cb.state, OPEN)
+        self.assertFalse(self.cb.can_attempt())
+    
+    def test_call_raises_while_open(self):
+        with self.assertRaises(RuntimeError):
+            self.cb.call(lambda: "never runs")
+
+class TestGuard(unittest.TestCase):
+    """The OandaClient decorator counts the right failures."""
+    
+    def test_pricing_errors_trip_and_fail_fast(self):
+        cb = CircuitBreaker(max_consecutive_failures=2, name="oanda_pricing", cooldown_seconds=60)
+        calls = []
+        
+        @guarded(cb)
+        def get_price():
+            calls.append(1)
+            return {"error": "503"}
+        
+        get_price()
+        get_price()
+        self.assertEqual(get_price(), {"error": "Circuit open: oanda_pricing"})
+        self.assertEqual(len(calls), 2)
+    
+    def test_order_rejections_do_not_trip(self):
+        cb = CircuitBreaker(max_consecutive_failures=2, name="oanda_orders")
+        
+        @guarded(cb, count_error_results=False)
+        def place_order(fail):
+            if fail:
+                raise ConnectionError("reset")
+            return {"error": "INSUFFICIENT_MARGIN"}
+        
+        for _ in range(5):
+            place_order(False)
+        self.assertEqual(cb.state, CLOSED)
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                place_order(True)
+        self.assertEqual(cb.state, OPEN)
+    
+    def test_order_outages_trip(self):
+        """5xx results count as failures even where 4xx rejections don't."""
+        cb = CircuitBreaker(max_consecutive_failures=2, name="oanda_orders")
+        
+        @guarded(cb, count_error_results=False)
+        def place_order(status):
+            return {"error": "Service unavailable" if status >= 500 else "Rejected", "status": status}
+        
+        place_order(400)
+        self.assertEqual(cb.failure_count, 0)
+        place_order(503)
+        place_order(500)
+        self.assertEqual(cb.state, OPEN)
+        self.assertEqual(place_order(400), {"error": "Circuit open: oanda_orders"})
+    
+    def test_unusable_state_file_falls_back(self):
+        cb = CircuitBreaker(name="x", store=SharedBreakerStore(os.path.join(ROOT, "no-such-dir", "s.db")))
+        self.assertTrue(cb.can_attempt())
+        cb.record_failure()
+        self.assertEqual(cb.failure_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,7 +14,7 @@ def test_complete_chain():
     print("=" * 60 + "\n")
     
     # Create graph
-    graph = create_graph()
+    graph = create_graph(use_pre_screen=False)  # Synthetic state has no live price data
     
     # Mock input data (bullish setup)
     initial_state = {
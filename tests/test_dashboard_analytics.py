@@ -0,0 +1,105 @@
+"""
+Test Suite for the Admin Dashboard SQL Analytics
+Checks SQL aggregates, histogram bins and the windowed equity curve against
+plain Python on an in-memory database.
+"""
+import unittest
+import os
+import sys
+import random
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database.models import Trade, Base
+from src.dashboard import analytics
+
+class TestDashboardAnalytics(unittest.TestCase):
+    """SQL results must match the previous Python-loop calculations."""
+    
+    def setUp(self):
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(bind=engine)()
+        
+        rng = random.Random(3)
+        start = datetime(2024, 1, 1)
+        self.pnls = []
+        for i in range(1200):
+            status = "OPEN" if i % 10 == 0 else "CLOSED"
+            pnl = round(rng.uniform(-50, 80), 2) if status == "CLOSED" else None
+            if pnl is not None:
+                self.pnls.append(pnl)
+            self.db.add(Trade(timestamp=start + timedelta(minutes=i), pair="EUR_USD",
+                              action="BUY" if i % 2 else "SELL", entry_price=1.085, stop_loss=1.083,
+                              take_profit=1.089, lot_size=0.1, status=status, pnl=pnl))
+        # WAIT rows are reasoning logs, never part of the metrics
+        self.db.add(Trade(pair="EURUSD", action="WAIT", entry_price=1.085, stop_loss=0.0,
+                          take_profit=0.0, lot_size=0.0, status="CLOSED", pnl=1000.0))
+        self.db.commit()
+    
+    def tearDown(self):
+        self.db.close()
+    
+    def test_performance_summary(self):
+        """Counts, win rate and averages match Python aggregation."""
+        summary = analytics.performance_summary(self.db)
+        wins = [p for p in self.pnls if p > 0]
+        losses = [p for p in self.pnls if p < 0]
+        self.assertEqual(summary["total_trades"], 1200)
+        self.assertEqual(summary["wins"], len(wins))
+        self.assertAlmostEqual(summary["win_rate"], len(wins) / len(self.pnls) * 100)
+        self.assertAlmostEqual(summary["total_pnl"], sum(self.pnls), places=6)
+        self.assertAlmostEqual(summary["avg_loss"], sum(losses) / len(losses), places=6)
+    
+    def test_performance_summary_counts_filled_trades_only(self):
+        """Rejected, cancelled and unfilled orders are not trades."""
+        for status in ("REJECTED", "CANCELLED", "PENDING", "SUBMITTING"):
+            self.db.add(Trade(pair="EUR_USD", action="BUY", entry_price=1.085, stop_loss=1.083,
+                              take_profit=1.089, lot_size=0.1, status=status, pnl=None))
+        self.db.commit()
+        summary = analytics.performance_summary(self.db)
+        self.assertEqual(summary["total_trades"], 1200)
+        self.assertEqual(summary["closed"], len(self.pnls))
+        self.assertAlmostEqual(summary["total_pnl"], sum(self.pnls), places=6)
+    
+    def test_histogram_covers_every_trade(self):
+        """Bin counts add up to the closed trades; the maximum lands in the last bin."""
+        bins = analytics.pnl_histogram(self.db, bins=20)
+        self.assertLessEqual(len(bins), 20)
+        self.assertEqual(sum(b["count"] for b in bins), len(self.pnls))
+        self.assertAlmostEqual(bins[-1]["end"], max(self.pnls), places=6)
+    
+    def test_equity_curve_is_downsampled_running_sum(self):
+        """Window-function balance equals the cumulative sum; size is bounded."""
+        curve = analytics.equity_curve(self.db, start_balance=10000, max_points=100)
+        self.assertLessEqual(len(curve), 101)
+        self.assertAlmostEqual(curve[-1]["Balance"], 10000 + sum(self.pnls), places=6)
+        
+        full = analytics.equity_curve(self.db, start_balance=10000, max_points=10**6)
+        running, expected = 10000, []
+        for p in self.pnls:
+            running += p
+            expected.append(running)
+        self.assertEqual(len(full), len(self.pnls))
+        self.assertAlmostEqual(full[500]["Balance"], expected[500], places=6)
+    
+    def test_recent_trades_filters_in_sql(self):
+        """Filters and limit are applied by the query."""
+        rows = analytics.recent_trades(self.db, status="OPEN", action="SELL", sort_by="Timestamp", limit=5)
+        self.assertEqual(len(rows), 5)
+        self.assertTrue(all(t.status == "OPEN" and t.action == "SELL" for t in rows))
+        self.assertGreater(rows[0].timestamp, rows[-1].timestamp)
+    
+    def test_empty_database(self):
+        """No trades -> zeros and empty series."""
+        self.db.query(Trade).delete()
+        self.db.commit()
+        self.assertEqual(analytics.performance_summary(self.db)["win_rate"], 0.0)
+        self.assertEqual(analytics.pnl_histogram(self.db), [])
+        self.assertEqual(analytics.equity_curve(self.db, 10000), [])
+
+if __name__ == '__main__':
+    unittest.main()
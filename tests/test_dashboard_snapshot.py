@@ -0,0 +1,148 @@
+"""
+Test Suite for the Live War Room Snapshot Service
+Checks snapshot contents and that many concurrent viewers share one refresher.
+"""
+import unittest
+import os
+import sys
+import threading
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database.models import Trade, Heartbeat, Base
+import time
+from unittest.mock import patch
+from src.dashboard.snapshot import build_snapshot, probe_changes, SnapshotService
+from src.safety.circuit_breaker import set_breaker_store, shared_store, MemoryBreakerStore, gemini_breaker
+
+class _Summary:
+    balance = "101234.5"
+
+class _FakeClient:
+    def __init__(self):
+        self.calls = 0
+    
+    def get_current_price(self, pair):
+        self.calls += 1
+        return {"bid": 1.0850, "ask": 1.0852}
+    
+    def get_account_summary(self):
+        return _Summary()
+
+class TestBuildSnapshot(unittest.TestCase):
+    """One build reads broker + DB into plain, read-only data."""
+    
+    def setUp(self):
+        set_breaker_store(MemoryBreakerStore())
+        self.addCleanup(set_breaker_store, shared_store)
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        self.Session = sessionmaker(bind=engine)
+        db = self.Session()
+        now = datetime.utcnow()
+        db.add(Trade(timestamp=now, pair="EUR_USD", action="BUY", entry_price=1.085, stop_loss=1.083,
+                     take_profit=1.089, lot_size=0.1, status="OPEN", reasoning_trace=["trend up"]))
+        db.add(Trade(timestamp=now, pair="EUR_USD", action="SELL", entry_price=1.085, stop_loss=1.087,
+                     take_profit=1.081, lot_size=0.1, status="CLOSED", pnl=-12.5))
+        db.add(Heartbeat(timestamp=now, last_message="Cycle starting"))
+        db.commit()
+        db.close()
+    
+    def test_contents(self):
+        snap = build_snapshot(_FakeClient(), session_factory=self.Session)
+        self.assertEqual((snap["bid"], snap["ask"], snap["balance"]), (1.0850, 1.0852, 101234.5))
+        self.assertEqual((snap["daily_pnl"], snap["trades_today"], snap["open_count"]), (-12.5, 1, 1))
+        self.assertEqual(len(snap["recent_trades"]), 2)
+        self.assertEqual(snap["last_heartbeat"]["last_message"], "Cycle starting")
+        self.assertEqual(snap["errors"], ())
+    
+    def test_safety_state_in_snapshot(self):
+        """Kill switch and breaker states come from the snapshot, not per-viewer reads."""
+        with patch("src.dashboard.snapshot.is_trading_enabled", return_value=True):
+            snap = build_snapshot(None, session_factory=self.Session)
+        self.assertTrue(snap["trading_enabled"])
+        self.assertEqual([b["name"] for b in snap["breakers"] if b["is_open"]], [])
+        
+        token = probe_changes(self.Session)
+        for _ in range(gemini_breaker.max_failures):
+            gemini_breaker.record_failure()
+        self.assertNotEqual(token, probe_changes(self.Session))  # A trip triggers a rebuild
+        snap = build_snapshot(None, session_factory=self.Session)
+        self.assertEqual([b["name"] for b in snap["breakers"] if b["is_open"]], ["gemini"])
+    
+    def test_immutable(self):
+        snap = build_snapshot(None, session_factory=self.Session)
+        with self.assertRaises(TypeError):
+            snap["bid"] = 2.0
+        with self.assertRaises(TypeError):
+            snap["recent_trades"][0]["status"] = "CLOSED"
+    
+    def test_broker_error_keeps_db_data(self):
+        class _Down:
+            def get_current_price(self, pair):
+                raise ConnectionError("down")
+        snap = build_snapshot(_Down(), session_factory=self.Session)
+        self.assertEqual(snap["bid"], 0.0)
+        self.assertEqual(snap["open_count"], 1)
+        self.assertTrue(snap["errors"][0].startswith("broker"))
+
+    def test_probe_sees_fill_close_and_heartbeat(self):
+        """Every write the War Room shows changes the probe token."""
+        token = probe_changes(self.Session)
+        self.assertEqual(token, probe_changes(self.Session))
+        db = self.Session()
+        trade = db.query(Trade).filter(Trade.status == "OPEN").one()
+        trade.status, trade.closed_at, trade.pnl = "CLOSED", datetime.utcnow(), 8.0
+        db.commit()
+        closed = probe_changes(self.Session)
+        self.assertNotEqual(token, closed)
+        db.add(Heartbeat(last_message="Cycle starting"))
+        db.commit()
+        db.close()
+        self.assertNotEqual(closed, probe_changes(self.Session))
+
+class TestSnapshotService(unittest.TestCase):
+    """Readers never trigger their own queries."""
+    
+    def test_load_independent_of_viewers(self):
+        builds = []
+        service = SnapshotService(lambda: builds.append(1) or {"n": len(builds)}, interval=60).start()
+        try:
+            results = []
+            readers = [threading.Thread(target=lambda: results.append(service.get())) for _ in range(50)]
+            for r in readers:
+                r.start()
+            for r in readers:
+                r.join()
+            self.assertEqual(len(results), 50)
+            self.assertEqual(len(builds), 1)
+        finally:
+            service.stop()
+    
+    def test_change_triggers_rebuild_before_interval(self):
+        """A probe change rebuilds within one probe tick, not the full interval."""
+        token = [0]
+        builds = []
+        service = SnapshotService(lambda: builds.append(1) or {}, interval=60,
+                                  probe=lambda: token[0], probe_interval=0.02).start()
+        try:
+            service.get()
+            time.sleep(0.1)
+            self.assertEqual(len(builds), 1)  # Unchanged probe -> no rebuilds
+            token[0] = 1
+            time.sleep(0.1)
+            self.assertEqual(len(builds), 2)
+        finally:
+            service.stop()
+    
+    def test_get_without_thread_builds_once(self):
+        service = SnapshotService(lambda: {"ok": True})
+        self.assertTrue(service.get()["ok"])
+        self.assertEqual(service.get_status()["refresh_count"], 1)
+        self.assertFalse(service.get_status()["running"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Test Suite for Chart Downsampling
+Validates the LTTB and min/max-per-bucket point budgets.
+"""
+import unittest
+import os
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.dashboard.downsample import downsample, lttb_indices, minmax_indices
+
+class TestLTTB(unittest.TestCase):
+    """Test largest-triangle-three-buckets."""
+    
+    def test_budget_and_endpoints(self):
+        """Exactly `threshold` points, first and last kept, in order."""
+        y = np.sin(np.linspace(0, 20, 100_000))
+        idx = lttb_indices(np.arange(len(y)), y, 800)
+        self.assertEqual(len(idx), 800)
+        self.assertEqual((idx[0], idx[-1]), (0, len(y) - 1))
+        self.assertTrue(np.all(np.diff(idx) > 0))
+    
+    def test_keeps_spike(self):
+        """A single spike in a flat series is selected."""
+        y = np.zeros(10_000)
+        y[4321] = 50.0
+        self.assertIn(4321, lttb_indices(np.arange(len(y)), y, 100))
+    
+    def test_small_series_untouched(self):
+        """Series under budget are returned as-is."""
+        self.assertEqual(list(lttb_indices([0, 1, 2], [1, 2, 3], 800)), [0, 1, 2])
+
+class TestMinMax(unittest.TestCase):
+    """Test min/max-per-bucket."""
+    
+    def test_keeps_every_dip(self):
+        """Outages (zeros) in a mostly-active series all survive within budget."""
+        y = np.ones(5000)
+        y[[10, 2500, 4990]] = 0
+        idx = minmax_indices(y, 100)
+        self.assertLessEqual(len(idx), 202)
+        self.assertTrue({10, 2500, 4990} <= set(idx.tolist()))
+
+class TestDownsamplePoints(unittest.TestCase):
+    """Test the dict-list helper used by the Admin charts."""
+    
+    def test_datetime_x(self):
+        """Datetime x values work and the budget is respected."""
+        start = datetime(2024, 1, 1)
+        points = [{"Date": start + timedelta(minutes=i), "Balance": 10000 + (i % 37)} for i in range(20_000)]
+        self.assertEqual(len(downsample(points, "Date", "Balance", budget=500)), 500)
+        self.assertLessEqual(len(downsample(points, "Date", "Balance", budget=500, method="minmax")), 502)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+Test Suite for Execution Quality Analytics
+Validates slippage sign conventions and latency/slippage aggregation.
+"""
+import unittest
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.execution.execution_quality import slippage_pips, summarize
+
+class TestSlippage(unittest.TestCase):
+    """Test slippage in pips."""
+    
+    def test_buy_filled_higher_is_adverse(self):
+        """BUY filled above the requested price -> positive slippage."""
+        self.assertEqual(slippage_pips("BUY", 1.08500, 1.08520), 2.0)
+    
+    def test_sell_filled_higher_is_favourable(self):
+        """SELL filled above the requested price -> negative slippage."""
+        self.assertEqual(slippage_pips("SELL", 1.08500, 1.08520), -2.0)
+
+class TestSummarize(unittest.TestCase):
+    """Test aggregation for the Admin view."""
+    
+    def test_only_measured_trades_counted(self):
+        """Legacy rows without timing are ignored."""
+        trades = [
+            SimpleNamespace(decision_latency_ms=1000.0, fill_latency_ms=120.0, slippage_pips=0.5),
+            SimpleNamespace(decision_latency_ms=3000.0, fill_latency_ms=80.0, slippage_pips=1.5),
+            SimpleNamespace(decision_latency_ms=None, fill_latency_ms=None, slippage_pips=None),
+        ]
+        summary = summarize(trades)
+        self.assertEqual(summary["trades"], 2)
+        self.assertEqual(summary["avg_decision_latency_ms"], 2000.0)
+        self.assertEqual(summary["max_fill_latency_ms"], 120.0)
+        self.assertEqual(summary["avg_slippage_pips"], 1.0)
+    
+    def test_empty(self):
+        """No measured fills -> None aggregates."""
+        summary = summarize([])
+        self.assertEqual(summary["trades"], 0)
+        self.assertIsNone(summary["avg_slippage_pips"])
+
+if __name__ == '__main__':
+    unittest.main()
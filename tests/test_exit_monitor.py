@@ -0,0 +1,112 @@
+"""
+Test Suite for the Trade Exit Monitor
+Validates trade-level reconciliation against a fake OANDA client.
+"""
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from src.database import models
+from src.database.models import Trade, Base
+from src.monitoring.exit_monitor import TradeExitMonitor
+
+class FakeOandaClient:
+    """Answers the two reconciliation calls from in-memory data and counts requests."""
+    
+    def __init__(self, open_trades, closed_trades):
+        self.open_trades = open_trades
+        self.closed_trades = closed_trades
+        self.calls = 0
+    
+    def get_open_trades(self):
+        self.calls += 1
+        return {tid: {"instrument": "EUR_USD"} for tid in self.open_trades}
+    
+    def get_trades_by_ids(self, trade_ids):
+        self.calls += 1
+        return {tid: self.closed_trades[tid] for tid in trade_ids if tid in self.closed_trades}
+
+class TestTradeLevelReconciliation(unittest.TestCase):
+    """Several trades on one instrument must be reconciled individually."""
+    
+    def setUp(self):
+        """In-memory database with 200 open EUR_USD trades."""
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        self.original_engine = models._engine
+        models.set_engine(engine)
+        
+        db = models.SessionLocal()
+        for i in range(200):
+            db.add(Trade(pair="EUR_USD", action="BUY", entry_price=1.0850, stop_loss=1.0830,
+                         take_profit=1.0890, lot_size=0.1, status="OPEN", oanda_trade_id=str(1000 + i)))
+        db.commit()
+        db.close()
+    
+    def tearDown(self):
+        """Point SessionLocal back at the previous engine."""
+        models.set_engine(self.original_engine)
+    
+    def test_closes_only_closed_trades_with_own_fill(self):
+        """Only the two closed trades are updated, each with its own fill; constant API calls."""
+        open_ids = [str(1000 + i) for i in range(2, 200)]
+        closed = {
+            "1000": {"state": "CLOSED", "averageClosePrice": 1.0890, "realizedPL": 40.0},
+            "1001": {"state": "CLOSED", "averageClosePrice": 1.0830, "realizedPL": -20.0},
+        }
+        client = FakeOandaClient(open_ids, closed)
+        TradeExitMonitor(client=client).check_and_update_exits()
+        
+        db = models.SessionLocal()
+        rows = {t.oanda_trade_id: t for t in db.query(Trade).filter(Trade.status == "CLOSED").all()}
+        open_count = db.query(Trade).filter(Trade.status == "OPEN").count()
+        db.close()
+        
+        self.assertEqual(set(rows), {"1000", "1001"})
+        self.assertAlmostEqual(rows["1000"].exit_price, 1.0890)
+        self.assertAlmostEqual(rows["1001"].pnl, -20.0)
+        self.assertEqual(open_count, 198)
+        self.assertEqual(client.calls, 2)
+    
+    def test_api_error_closes_nothing(self):
+        """A failed open-trades request must not be read as 'everything closed'."""
+        client = FakeOandaClient([], {})
+        client.get_open_trades = lambda: None
+        TradeExitMonitor(client=client).check_and_update_exits()
+        
+        db = models.SessionLocal()
+        self.assertEqual(db.query(Trade).filter(Trade.status == "OPEN").count(), 200)
+        db.close()
+    
+    def test_failed_details_lookup_closes_nothing(self):
+        """Trades missing from list_open stay OPEN when their details could not be fetched."""
+        client = FakeOandaClient([str(1000 + i) for i in range(2, 200)], {})
+        client.get_trades_by_ids = lambda trade_ids: None
+        monitor = TradeExitMonitor(client=client)
+        monitor.check_and_update_exits()
+        
+        db = models.SessionLocal()
+        self.assertEqual(db.query(Trade).filter(Trade.status == "OPEN").count(), 200)
+        db.close()
+        self.assertTrue(monitor._sweep_error)
+    
+    def test_only_explicitly_closed_trades_are_closed(self):
+        """A trade with no details or a non-CLOSED state is left OPEN for the next sweep."""
+        open_ids = [str(1000 + i) for i in range(3, 200)]
+        closed = {
+            "1000": {"state": "CLOSED", "averageClosePrice": 1.0890, "realizedPL": 40.0},
+            "1001": {"state": "OPEN"},
+            # "1002" missing from the details response
+        }
+        TradeExitMonitor(client=FakeOandaClient(open_ids, closed)).check_and_update_exits()
+        
+        db = models.SessionLocal()
+        closed_ids = {t.oanda_trade_id for t in db.query(Trade).filter(Trade.status == "CLOSED").all()}
+        db.close()
+        self.assertEqual(closed_ids, {"1000"})
+
+if __name__ == '__main__':
+    unittest.main()
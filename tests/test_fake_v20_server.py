@@ -0,0 +1,127 @@
+"""
+Test Suite for the Fake v20 Server
+Runs the real OandaClient, executor and exit monitor against the offline stand-in.
+"""
+import unittest
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from src.database import models
+from src.database.models import Trade, Base
+from src.execution.fake_v20_server import FakeV20Server, FakeV20State
+from src.execution.oanda_client import OandaClient
+from src.execution.oanda_executor import oanda_executor_node
+from src.monitoring.exit_monitor import TradeExitMonitor
+from src.safety.circuit_breaker import set_breaker_store, shared_store, MemoryBreakerStore
+
+class TestFakeV20Server(unittest.TestCase):
+    """OandaClient round trips over HTTP, no credentials or network."""
+    
+    def setUp(self):
+        self.server = FakeV20Server(state=FakeV20State(seed=7)).start()
+        self.env = patch.dict(os.environ, self.server.env())
+        self.env.start()
+        self.client = OandaClient()
+        set_breaker_store(MemoryBreakerStore())  # Injected errors must not trip the real shared breakers
+        self.trading = patch("src.execution.oanda_executor.is_trading_enabled", return_value=True)
+        self.trading.start()
+        
+        engine = create_engine('sqlite://', connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.original_engine = models._engine
+        models.set_engine(engine)
+    
+    def tearDown(self):
+        self.trading.stop()
+        set_breaker_store(shared_store)
+        models.set_engine(self.original_engine)
+        self.env.stop()
+        self.server.stop()
+    
+    def test_market_data(self):
+        """Account, batched prices and complete candles parse through the v20 bindings."""
+        self.assertEqual(float(self.client.get_account_summary().balance), 100000.0)
+        prices = self.client.get_prices(["EUR_USD", "USD_JPY"])
+        self.assertLess(prices["EUR_USD"]["bid"], prices["EUR_USD"]["ask"])
+        candles = self.client.get_candles("EUR_USD", granularity="M15", count=20)
+        self.assertEqual(len(candles), 20)
+        self.assertTrue(all(c["low"] <= c["close"] <= c["high"] for c in candles))
+    
+    def test_executor_and_exit_monitor_offline(self):
+        """An executed order is closed by the exit monitor once price hits TP."""
+        state = {
+            "risk_assessment": {"approved": True, "lot_size": 0.1},
+            "order_details": {"action": "BUY", "entry_price": 1.0850, "stop_loss": 1.0800, "take_profit": 1.0900},
+            "candle_timestamps": {"M5": "2024-01-26T10:05:00Z"},
+            "reasoning_trace": [],
+        }
+        with patch("src.execution.oanda_executor.get_oanda_client", return_value=self.client):
+            result = oanda_executor_node(state)
+        self.assertTrue(result["execution_result"]["executed"], result["execution_result"])
+        
+        self.server.state.set_price("EUR_USD", 1.0950)
+        summary = TradeExitMonitor(client=self.client).check_and_update_exits()
+        
+        db = models.SessionLocal()
+        trade = db.query(Trade).one()
+        db.close()
+        self.assertEqual(summary["closed"], 1)
+        self.assertEqual(trade.status, "CLOSED")
+        self.assertAlmostEqual(trade.exit_price, 1.0900)
+    
+    def test_legacy_rows_reconcile_by_instrument(self):
+        """Rows without an OANDA trade ID stay OPEN while the instrument has a position, close once flat."""
+        self.client.place_market_order("EUR_USD", 10000, stop_loss=1.0800, take_profit=1.0900)
+        db = models.SessionLocal()
+        db.add(Trade(pair="EUR_USD", action="BUY", entry_price=1.0850, stop_loss=1.0800,
+                     take_profit=1.0900, lot_size=0.1, status="OPEN"))
+        db.commit()
+        db.close()
+        monitor = TradeExitMonitor(client=self.client)
+        
+        self.assertIn("EUR_USD", monitor.get_open_positions_from_oanda())
+        summary = monitor.check_and_update_exits()
+        self.assertEqual((summary["closed"], summary["api_error"]), (0, False))
+        
+        self.server.fail_next = 1
+        self.assertTrue(monitor.check_and_update_exits()["api_error"])
+        
+        self.server.state.set_price("EUR_USD", 1.0950)  # TP hit -> position flat
+        self.assertEqual(monitor.check_and_update_exits()["closed"], 1)
+        db = models.SessionLocal()
+        self.assertEqual(db.query(Trade).one().status, "CLOSED")
+        db.close()
+    
+    def test_error_injection(self):
+        """Injected faults surface as client errors; the exit monitor flags them for backoff."""
+        db = models.SessionLocal()
+        db.add(Trade(pair="EUR_USD", action="BUY", entry_price=1.0850, stop_loss=1.0800,
+                     take_profit=1.0900, lot_size=0.1, status="OPEN", oanda_trade_id="1"))
+        db.commit()
+        db.close()
+        
+        self.server.fail_next = 1
+        summary = TradeExitMonitor(client=self.client).check_and_update_exits()
+        self.assertTrue(summary["api_error"])
+        
+        self.server.fail_next = 1
+        self.assertIn("error", self.client.get_current_price("EUR_USD"))
+        self.assertEqual(self.client.get_latency_stats()["get_current_price"]["errors"], 1)
+    
+    def test_latency_injection_parallel_fetch(self):
+        """With 100 ms per request, a 4-request cycle fetch takes about one round trip."""
+        self.server.latency_ms = 100
+        started = time.perf_counter()
+        data = self.client.get_cycle_data("EUR_USD")
+        elapsed = time.perf_counter() - started
+        self.assertNotIn("error", data["price"])
+        self.assertLess(elapsed, 0.35)
+
+if __name__ == '__main__':
+    unittest.main()
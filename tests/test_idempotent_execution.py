@@ -0,0 +1,235 @@
+"""
+Test Suite for Idempotent Order Execution
+Validates client order IDs, the SUBMITTING outbox, lookup-before-retry and
+resting LIMIT/STOP entry orders.
+"""
+import unittest
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from src.database import models
+from src.database.models import Trade, Base
+from src.execution.oanda_executor import oanda_executor_node, make_client_order_id, reconcile_submitting
+
+class FakeOandaClient:
+    """Fills FOK market orders in memory; optionally times out after filling."""
+    
+    def __init__(self, timeout_after_fill=False):
+        self.timeout_after_fill = timeout_after_fill
+        self.trades = {}  # client_order_id -> trade
+        self.orders = {}  # client_order_id -> resting/cancelled order
+        self.orders_sent = 0
+        self.entry_orders = []
+    
+    def place_market_order(self, pair, units, stop_loss=None, take_profit=None, client_order_id=None):
+        self.orders_sent += 1
+        trade_id = str(5000 + len(self.trades))
+        self.trades[client_order_id] = {"id": trade_id, "price": 1.08512, "state": "OPEN"}
+        if self.timeout_after_fill:
+            raise TimeoutError("read timeout")
+        return SimpleNamespace(id="9001", price="1.08512", tradeOpened=SimpleNamespace(tradeID=trade_id))
+    
+    def place_entry_order(self, pair, units, price, order_type="LIMIT", stop_loss=None,
+                          take_profit=None, expiry_minutes=30, client_order_id=None):
+        self.entry_orders.append((order_type, price, expiry_minutes))
+        self.orders[client_order_id] = {"id": "8001", "state": "PENDING"}
+        return {"order_id": "8001", "fill_price": None, "trade_id": None}
+    
+    def get_trade_by_client_id(self, client_order_id):
+        return self.trades.get(client_order_id)
+    
+    def get_order_by_client_id(self, client_order_id):
+        return self.orders.get(client_order_id)
+
+def approved_state(candle="2024-01-26T10:05:00Z"):
+    return {
+        "risk_assessment": {"approved": True, "lot_size": 0.1},
+        "order_details": {"action": "BUY", "entry_price": 1.0850, "stop_loss": 1.0830, "take_profit": 1.0890},
+        "candle_timestamps": {"M5": candle},
+        "reasoning_trace": ["[Tactical]: EXECUTE"],
+    }
+
+class TestIdempotentExecution(unittest.TestCase):
+    """Exactly one Trade row and one OANDA order per decision."""
+    
+    def setUp(self):
+        engine = create_engine('sqlite://', connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        self.original_engine = models._engine
+        models.set_engine(engine)
+        self.trading = patch("src.execution.oanda_executor.is_trading_enabled", return_value=True)
+        self.trading.start()
+    
+    def tearDown(self):
+        self.trading.stop()
+        models.set_engine(self.original_engine)
+    
+    def run_node(self, client, state):
+        with patch("src.execution.oanda_executor.get_oanda_client", return_value=client):
+            return oanda_executor_node(state)
+    
+    def rows(self):
+        db = models.SessionLocal()
+        rows = db.query(Trade).all()
+        db.close()
+        return rows
+    
+    def test_client_order_id_is_stable_per_decision(self):
+        """Same candle -> same ID; a new candle or action -> a new ID."""
+        a = make_client_order_id("EUR_USD", "BUY", "2024-01-26T10:05:00Z")
+        self.assertEqual(a, make_client_order_id("EUR_USD", "BUY", "2024-01-26T10:05:00Z"))
+        self.assertNotEqual(a, make_client_order_id("EUR_USD", "BUY", "2024-01-26T10:10:00Z"))
+        self.assertNotEqual(a, make_client_order_id("EUR_USD", "SELL", "2024-01-26T10:05:00Z"))
+        self.assertLessEqual(len(a), 64)
+    
+    def test_retry_does_not_duplicate(self):
+        """A graph retry of the same decision sends no second order."""
+        client = FakeOandaClient()
+        first = self.run_node(client, approved_state())
+        second = self.run_node(client, approved_state())
+        
+        self.assertTrue(first["execution_result"]["executed"])
+        self.assertIn("Duplicate", second["execution_result"]["reason"])
+        self.assertEqual(client.orders_sent, 1)
+        rows = self.rows()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0].status, "OPEN")
+        self.assertEqual(rows[0].oanda_trade_id, "5000")
+    
+    def test_kill_switch_checked_before_submit(self):
+        """A halt engaged mid-cycle stops the order before any outbox row or API call."""
+        client = FakeOandaClient()
+        with patch("src.execution.oanda_executor.is_trading_enabled", return_value=False):
+            result = self.run_node(client, approved_state())
+        
+        self.assertFalse(result["execution_result"]["executed"])
+        self.assertIn("kill switch", result["execution_result"]["reason"])
+        self.assertEqual(client.orders_sent, 0)
+        self.assertEqual(self.rows(), [])
+    
+    def test_timeout_after_fill_is_recovered(self):
+        """Submission times out but OANDA filled it: lookup records the fill, no resubmit."""
+        client = FakeOandaClient(timeout_after_fill=True)
+        result = self.run_node(client, approved_state())
+        
+        self.assertTrue(result["execution_result"]["executed"])
+        self.assertEqual(client.orders_sent, 1)
+        row = self.rows()[0]
+        self.assertEqual(row.status, "OPEN")
+        self.assertAlmostEqual(row.entry_price, 1.08512)
+        self.assertAlmostEqual(row.slippage_pips, 1.2)
+    
+    def test_reconcile_submitting_rows(self):
+        """Left-over outbox rows become OPEN if OANDA has the trade, else REJECTED."""
+        client = FakeOandaClient()
+        client.trades["fa-filled"] = {"id": "7000", "price": 1.0851, "state": "OPEN"}
+        db = models.SessionLocal()
+        for cid in ("fa-filled", "fa-lost"):
+            db.add(Trade(pair="EUR_USD", action="BUY", entry_price=1.0850, stop_loss=1.0830,
+                         take_profit=1.0890, lot_size=0.1, status="SUBMITTING",
+                         client_order_id=cid, requested_price=1.0850))
+        db.commit()
+        
+        self.assertEqual(reconcile_submitting(db, client), 2)
+        statuses = {t.client_order_id: (t.status, t.oanda_trade_id) for t in db.query(Trade).all()}
+        db.close()
+        self.assertEqual(statuses["fa-filled"], ("OPEN", "7000"))
+        self.assertEqual(statuses["fa-lost"], ("REJECTED", None))
+
+class TestRestingEntryOrders(TestIdempotentExecution):
+    """LIMIT/STOP entries rest at the key zone as PENDING rows."""
+    
+    def limit_state(self, zone=1.0830, current=1.0850, action="BUY", order_type="LIMIT",
+                    stop_loss=None, take_profit=None):
+        """Tactical asks to rest an entry; the Architect's key zone sets the price."""
+        state = approved_state()
+        direction = 1 if action == "BUY" else -1
+        stop_loss = stop_loss or round(zone - direction * 0.0020, 5)
+        take_profit = take_profit or round(zone + direction * 0.0040, 5)
+        state["order_details"] = dict(state["order_details"], action=action, entry_price=current,
+                                      stop_loss=stop_loss, take_profit=take_profit, order_type=order_type)
+        state["key_zone"] = {"price": zone, "type": "ORDER_BLOCK"}
+        state["technical_indicators"] = {"Current_Price": current}
+        return state
+    
+    def test_limit_order_rests_as_pending(self):
+        """A LIMIT decision sends one GTD entry order at the key zone and records a PENDING row."""
+        client = FakeOandaClient()
+        result = self.run_node(client, self.limit_state())
+        
+        self.assertTrue(result["execution_result"]["pending"])
+        self.assertEqual(client.orders_sent, 0)
+        self.assertEqual(client.entry_orders, [("LIMIT", 1.0830, 30)])
+        row = self.rows()[0]
+        self.assertEqual((row.status, row.order_type, row.requested_price), ("PENDING", "LIMIT", 1.0830))
+        self.assertAlmostEqual(row.lot_size, 0.5)  # 1% of 10k over the 20-pip SL from the zone
+    
+    def test_resting_entry_revalidated_at_zone(self):
+        """SL/TP approved at market must still hold at the zone, else nothing is placed."""
+        cases = [
+            ("BUY", 1.0860, 1.0810, 1.0870),   # TP 10 pips away, SL 50 -> R/R 0.2
+            ("SELL", 1.0870, 1.0830, 1.0810),  # SL below a SELL entry
+        ]
+        for action, zone, sl, tp in cases:
+            with self.subTest(action=action, zone=zone):
+                client = FakeOandaClient()
+                state = self.limit_state(zone=zone, action=action, stop_loss=sl, take_profit=tp)
+                state["candle_timestamps"] = {"M5": f"{action}-{zone}"}
+                result = self.run_node(client, state)
+                self.assertFalse(result["execution_result"]["executed"])
+                self.assertIn("Resting entry rejected", result["execution_result"]["reason"])
+                self.assertEqual((client.entry_orders, client.orders_sent), ([], 0))
+        self.assertEqual(self.rows(), [])
+    
+    def test_order_type_follows_side_and_zone(self):
+        """BUY below / SELL above price rests as LIMIT, the other way round as STOP, whatever the LLM said."""
+        cases = [
+            ("BUY", 1.0830, "STOP", "LIMIT"),
+            ("BUY", 1.0870, "LIMIT", "STOP"),
+            ("SELL", 1.0870, "STOP", "LIMIT"),
+            ("SELL", 1.0830, "LIMIT", "STOP"),
+        ]
+        for action, zone, requested, expected in cases:
+            with self.subTest(action=action, zone=zone):
+                client = FakeOandaClient()
+                state = self.limit_state(zone=zone, action=action, order_type=requested)
+                state["candle_timestamps"] = {"M5": f"{action}-{zone}"}  # Distinct decision IDs
+                self.run_node(client, state)
+                self.assertEqual(client.entry_orders, [(expected, zone, 30)])
+    
+    def test_entry_at_price_becomes_market(self):
+        """A key zone within a pip of price is sent as a market order."""
+        client = FakeOandaClient()
+        self.run_node(client, self.limit_state(zone=1.08505, current=1.0850))
+        self.assertEqual(client.orders_sent, 1)
+        self.assertEqual(client.entry_orders, [])
+    
+    def test_pending_rows_reconciled(self):
+        """PENDING rows become OPEN once OANDA has the trade, CANCELLED once the GTD expired."""
+        client = FakeOandaClient()
+        self.run_node(client, self.limit_state())
+        cid = self.rows()[0].client_order_id
+        
+        db = models.SessionLocal()
+        self.assertEqual(reconcile_submitting(db, client), 0)  # Still resting
+        client.trades[cid] = {"id": "5100", "price": 1.0830, "state": "OPEN"}
+        self.assertEqual(reconcile_submitting(db, client), 1)
+        row = db.query(Trade).one()
+        self.assertEqual((row.status, row.oanda_trade_id, row.slippage_pips), ("OPEN", "5100", 0.0))
+        
+        row.status = "PENDING"
+        db.commit()
+        del client.trades[cid]
+        client.orders[cid]["state"] = "CANCELLED"
+        reconcile_submitting(db, client)
+        self.assertEqual(db.query(Trade).one().status, "CANCELLED")
+        db.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Test Suite for Tiered Layer Evaluation
+Validates that upper-layer nodes are only re-invoked when their candle changes.
+"""
+import unittest
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.graph.layer_cache import LayerCache, cached_layer
+
+class TestLayerCache(unittest.TestCase):
+    """Test candle-keyed reuse of layer outputs."""
+    
+    def setUp(self):
+        """Create a fresh cache and a counting fake node."""
+        self.cache = LayerCache()
+        self.calls = 0
+        
+        def fake_strategist(state):
+            self.calls += 1
+            return {"current_bias": "BIAS_LONG", "reasoning_trace": ["[Strategist (Gemini)]: Bullish"]}
+        
+        self.node = cached_layer("Strategist", "H1", fake_strategist, cache=self.cache)
+    
+    def test_reuses_output_within_candle(self):
+        """Same H1 candle should not call the node again."""
+        state = {"candle_timestamps": {"H1": "2024-01-26T10:00:00Z", "M15": "2024-01-26T10:15:00Z"}}
+        self.node(state)
+        result = self.node({"candle_timestamps": {"H1": "2024-01-26T10:00:00Z", "M15": "2024-01-26T10:30:00Z"}})
+        
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(result["current_bias"], "BIAS_LONG")
+        self.assertIn("Cached H1", result["reasoning_trace"][0])
+    
+    def test_new_candle_invalidates(self):
+        """A new H1 candle should trigger a fresh evaluation."""
+        self.node({"candle_timestamps": {"H1": "2024-01-26T10:00:00Z"}})
+        self.node({"candle_timestamps": {"H1": "2024-01-26T11:00:00Z"}})
+        self.assertEqual(self.calls, 2)
+    
+    def test_dependency_change_invalidates(self):
+        """Architect output must be recomputed when the upstream bias flips."""
+        calls = []
+        node = cached_layer("Architect", "M15", lambda s: calls.append(1) or {"reasoning_trace": []},
+                            depends_on=("current_bias",), cache=self.cache)
+        stamps = {"M15": "2024-01-26T10:15:00Z"}
+        node({"candle_timestamps": stamps, "current_bias": "BIAS_LONG"})
+        node({"candle_timestamps": stamps, "current_bias": "BIAS_LONG"})
+        node({"candle_timestamps": stamps, "current_bias": "BIAS_SHORT"})
+        self.assertEqual(len(calls), 2)
+    
+    def test_fallback_not_cached(self):
+        """Fallback answers should be retried on the next cycle."""
+        calls = []
+        node = cached_layer("Strategist", "H1",
+                            lambda s: calls.append(1) or {"reasoning_trace": ["[Strategist (Fallback)]: AI Error"]},
+                            cache=self.cache)
+        state = {"candle_timestamps": {"H1": "2024-01-26T10:00:00Z"}}
+        node(state)
+        node(state)
+        self.assertEqual(len(calls), 2)
+
+if __name__ == '__main__':
+    unittest.main()
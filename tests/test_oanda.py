@@ -5,12 +5,20 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.execution.oanda_client import OandaClient
+from src.execution.fake_v20_server import FakeV20Server
 
 def test_oanda_connection():
     print("="*40)
     print("OANDA CONNECTIVITY TEST")
     print("="*40)
     
+    # No credentials -> run the same checks against the local fake v20 server
+    server = None
+    if not os.getenv("OANDA_API_KEY"):
+        server = FakeV20Server().start()
+        os.environ.update(server.env())
+        print(f"(No credentials - using fake v20 server at {server.url})")
+    
     try:
         client = OandaClient()
         
@@ -54,6 +62,11 @@ def test_oanda_connection():
 
     except Exception as e:
         print(f"\nCRITICAL ERROR: {e}")
+    finally:
+        if server:
+            server.stop()
+            for key in server.env():
+                os.environ.pop(key, None)
 
 if __name__ == "__main__":
     test_oanda_connection()
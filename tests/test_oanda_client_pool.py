@@ -0,0 +1,136 @@
+"""
+Test Suite for the Shared OANDA Client
+Validates the process-wide factory, keep-alive pool and latency stats (no network).
+"""
+import unittest
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.execution import oanda_client
+from src.execution.oanda_client import get_oanda_client, reset_oanda_client, POOL_SIZE
+from src.safety.circuit_breaker import set_breaker_store, shared_store, MemoryBreakerStore
+
+FAKE_ENV = {
+    "OANDA_API_KEY": "test-token",
+    "OANDA_ACCOUNT_ID": "101-001-0000000-001",
+    "OANDA_URL": "https://api-fxpractice.oanda.com",
+}
+
+class FakeResponse:
+    def __init__(self, status, body=None):
+        self.status = status
+        self.body = body or {}
+
+class FakePricing:
+    def __init__(self, status):
+        self.status = status
+
+    def get(self, account_id, instruments):
+        return FakeResponse(self.status, {"errorMessage": "Unavailable"})
+
+class FakeContext:
+    def __init__(self, status):
+        self.pricing = FakePricing(status)
+
+class FakeBatchPricing:
+    """Answers one request for a comma-separated instrument list."""
+    def __init__(self):
+        self.calls = []
+
+    def get(self, account_id, instruments):
+        self.calls.append(instruments)
+        prices = [
+            SimpleNamespace(instrument=i, time="2024-01-26T10:00:00Z",
+                            bids=[SimpleNamespace(price=1.0850)], asks=[SimpleNamespace(price=1.0851)])
+            for i in instruments.split(",")
+        ]
+        return SimpleNamespace(status=200, body={}, get=lambda key, status: prices)
+
+class SlowInstrument:
+    """Each candle request takes `delay` seconds."""
+    def __init__(self, delay):
+        self.delay = delay
+
+    def candles(self, pair, granularity, count):
+        time.sleep(self.delay)
+        candle = SimpleNamespace(complete=True, time=f"{granularity}-close", volume=100,
+                                 mid=SimpleNamespace(o=1.0, h=1.1, l=0.9, c=1.05))
+        return SimpleNamespace(status=200, body={}, get=lambda key, status: [candle])
+
+class TestSharedOandaClient(unittest.TestCase):
+    """Test the client factory."""
+    
+    def setUp(self):
+        reset_oanda_client()
+        set_breaker_store(MemoryBreakerStore())
+        self.env = patch.dict(os.environ, FAKE_ENV)
+        self.env.start()
+    
+    def tearDown(self):
+        self.env.stop()
+        reset_oanda_client()
+        set_breaker_store(shared_store)
+    
+    def test_same_instance_across_threads(self):
+        """Every thread gets the one shared client."""
+        seen = []
+        threads = [threading.Thread(target=lambda: seen.append(get_oanda_client())) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len({id(c) for c in seen}), 1)
+        self.assertIs(seen[0], get_oanda_client())
+    
+    def test_keep_alive_pool_mounted(self):
+        """The v20 session keeps a pool sized for concurrent callers."""
+        adapter = get_oanda_client().client._session.get_adapter("https://api-fxpractice.oanda.com")
+        self.assertEqual(adapter._pool_maxsize, POOL_SIZE)
+    
+    def test_latency_stats_record_errors(self):
+        """Each call is timed; error responses are counted."""
+        client = get_oanda_client()
+        client.client = FakeContext(status=503)
+        client.get_current_price("EUR_USD")
+        client.get_current_price("EUR_USD")
+        stats = client.get_latency_stats()["get_current_price"]
+        self.assertEqual(stats["calls"], 2)
+        self.assertEqual(stats["errors"], 2)
+        self.assertGreaterEqual(stats["max_ms"], stats["avg_ms"])
+    
+    def test_batch_prices_one_request(self):
+        """get_prices() fetches every instrument in a single call."""
+        client = get_oanda_client()
+        pricing = FakeBatchPricing()
+        client.client = SimpleNamespace(pricing=pricing)
+        prices = client.get_prices(["EUR_USD", "GBP_USD", "USD_JPY"])
+        self.assertEqual(pricing.calls, ["EUR_USD,GBP_USD,USD_JPY"])
+        self.assertEqual(set(prices), {"EUR_USD", "GBP_USD", "USD_JPY"})
+        self.assertEqual(prices["GBP_USD"]["ask"], 1.0851)
+    
+    def test_cycle_data_fetched_in_parallel(self):
+        """Price + 3 candle series take about one round trip, not four."""
+        client = get_oanda_client()
+        client.client = SimpleNamespace(pricing=FakeBatchPricing(), instrument=SlowInstrument(0.2))
+        started = time.perf_counter()
+        data = client.get_cycle_data("EUR_USD", granularities=("H1", "M15", "M5"))
+        elapsed = time.perf_counter() - started
+        self.assertEqual(data["candles"]["M15"][0]["time"], "M15-close")
+        self.assertEqual(data["price"]["bid"], 1.0850)
+        self.assertLess(elapsed, 0.5)
+    
+    def test_reset_rebuilds(self):
+        """reset_oanda_client() forces a new instance."""
+        first = get_oanda_client()
+        reset_oanda_client()
+        self.assertIsNot(first, get_oanda_client())
+        self.assertIsNotNone(oanda_client._shared_client)
+
+if __name__ == '__main__':
+    unittest.main()
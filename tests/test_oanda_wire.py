@@ -0,0 +1,112 @@
+"""
+Test Suite for OANDA Request Encoding
+Validates what OandaClient actually puts on the wire (no network).
+"""
+import unittest
+import os
+import sys
+import json
+from unittest.mock import patch
+from urllib.parse import urlparse, parse_qs
+
+import requests
+from requests.adapters import HTTPAdapter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.execution.oanda_client import OandaClient
+from src.safety.circuit_breaker import set_breaker_store, shared_store, MemoryBreakerStore
+
+FAKE_ENV = {
+    "OANDA_API_KEY": "test-token",
+    "OANDA_ACCOUNT_ID": "101-001-0000000-001",
+    "OANDA_URL": "https://api-fxpractice.oanda.com",
+}
+
+class RecordingAdapter(HTTPAdapter):
+    """Captures prepared requests and answers each with a canned JSON body."""
+    
+    def __init__(self, status=200, body=None):
+        super().__init__()
+        self.status = status
+        self.body = body or {}
+        self.sent = []
+    
+    def send(self, request, **kwargs):
+        self.sent.append(request)
+        response = requests.Response()
+        response.status_code = self.status
+        response._content = json.dumps(self.body).encode()
+        response.headers["Content-Type"] = "application/json"
+        response.url = request.url
+        response.request = request
+        return response
+
+def make_client(status=200, body=None):
+    with patch.dict(os.environ, FAKE_ENV):
+        client = OandaClient()
+    adapter = RecordingAdapter(status, body)
+    client.client._session.mount("https://", adapter)
+    return client, adapter
+
+class TestWireEncoding(unittest.TestCase):
+    """Test request paths, query strings and bodies."""
+    
+    def setUp(self):
+        set_breaker_store(MemoryBreakerStore())
+    
+    def tearDown(self):
+        set_breaker_store(shared_store)
+    
+    def test_trade_ids_are_comma_joined(self):
+        """ids must be sent as "1,2,3", not the str() of a Python list."""
+        client, adapter = make_client(body={"trades": []})
+        client.get_trades_by_ids([101, "102", 103])
+        
+        query = parse_qs(urlparse(adapter.sent[0].url).query)
+        self.assertEqual(query["ids"], ["101,102,103"])
+        self.assertEqual(query["state"], ["ALL"])
+        self.assertEqual(query["count"], ["3"])
+    
+    def test_trade_ids_are_batched(self):
+        """One request per batch of IDs."""
+        client, adapter = make_client(body={"trades": []})
+        client.get_trades_by_ids([str(i) for i in range(5)], batch_size=2)
+        
+        batches = [parse_qs(urlparse(r.url).query)["ids"][0] for r in adapter.sent]
+        self.assertEqual(batches, ["0,1", "2,3", "4"])
+    
+    def test_failed_trade_batch_reported(self):
+        """A non-200 batch returns None rather than a partial dict."""
+        client, adapter = make_client(status=500, body={"errorMessage": "boom"})
+        self.assertIsNone(client.get_trades_by_ids([str(i) for i in range(5)], batch_size=2))
+        self.assertEqual(len(adapter.sent), 1)
+    
+    def test_market_order_body_keeps_every_field(self):
+        """Units, SL/TP and client extensions must all reach OANDA."""
+        fill = {"id": "7", "type": "ORDER_FILL", "instrument": "EUR_USD", "units": "1000", "price": "1.08500"}
+        client, adapter = make_client(status=201, body={"orderFillTransaction": fill})
+        result = client.place_market_order("EUR_USD", 1000, stop_loss=1.08, take_profit=1.09,
+                                           client_order_id="fa-EUR_USD-BUY-abc")
+        
+        request = adapter.sent[0]
+        self.assertEqual(request.method, "POST")
+        self.assertTrue(request.url.endswith(f"/v3/accounts/{FAKE_ENV['OANDA_ACCOUNT_ID']}/orders"))
+        order = json.loads(request.body)["order"]
+        self.assertEqual(order["type"], "MARKET")
+        self.assertEqual(order["instrument"], "EUR_USD")
+        self.assertEqual(order["units"], "1000")
+        self.assertEqual(order["timeInForce"], "FOK")
+        self.assertEqual(order["stopLossOnFill"], {"price": "1.08"})
+        self.assertEqual(order["takeProfitOnFill"], {"price": "1.09"})
+        self.assertEqual(order["clientExtensions"]["id"], "fa-EUR_USD-BUY-abc")
+        self.assertEqual(order["tradeClientExtensions"]["id"], "fa-EUR_USD-BUY-abc")
+        self.assertEqual(str(result.id), "7")
+    def test_order_error_carries_status(self):
+        """Order errors report the HTTP status so the breaker can tell outages from rejections."""
+        client, _ = make_client(status=503, body={"errorMessage": "Service unavailable"})
+        result = client.place_market_order("EUR_USD", 1000)
+        self.assertEqual(result, {"error": "Service unavailable", "status": 503})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -22,7 +22,7 @@ def test_risk_off_scenario():
         "reasoning_trace": []
     }
     
-    graph = create_graph()
+    graph = create_graph(use_pre_screen=False)  # Synthetic state has no live price data
     result = graph.invoke(state)
     
     print(f"Bias: {result.get('current_bias')}")
@@ -53,7 +53,7 @@ def test_bias_long_scenario():
         "reasoning_trace": []
     }
     
-    graph = create_graph()
+    graph = create_graph(use_pre_screen=False)  # Synthetic state has no live price data
     result = graph.invoke(state)
     
     print(f"Bias: {result.get('current_bias')}")
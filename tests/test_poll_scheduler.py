@@ -0,0 +1,56 @@
+"""
+Test Suite for the Adaptive Poll Scheduler
+Validates exit-monitor interval selection and the ATR helper.
+"""
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.monitoring.poll_scheduler import AdaptivePollScheduler, average_true_range
+
+class TestAdaptivePollScheduler(unittest.TestCase):
+    """Test interval selection."""
+    
+    def setUp(self):
+        self.scheduler = AdaptivePollScheduler(idle_seconds=300, base_seconds=60, near_seconds=5,
+                                               near_atr_multiple=1.0, backoff_base_seconds=30,
+                                               backoff_max_seconds=120)
+    
+    def test_idle_when_flat(self):
+        """No open trades -> long sleep."""
+        self.assertEqual(self.scheduler.next_interval(open_trades=0), 300)
+        self.assertEqual(self.scheduler.last_mode, "IDLE")
+    
+    def test_tightens_near_exit(self):
+        """Price within N ATR of SL/TP -> short sleep; otherwise base."""
+        self.assertEqual(self.scheduler.next_interval(open_trades=2, min_distance_atr=0.4), 5)
+        self.assertEqual(self.scheduler.next_interval(open_trades=2, min_distance_atr=3.0), 60)
+        self.assertEqual(self.scheduler.next_interval(open_trades=2, min_distance_atr=None), 60)
+    
+    def test_backoff_on_errors(self):
+        """Consecutive API errors back off exponentially up to the cap, then reset."""
+        intervals = [self.scheduler.next_interval(open_trades=1, api_error=True) for _ in range(4)]
+        self.assertEqual(intervals, [30, 60, 120, 120])
+        self.scheduler.next_interval(open_trades=1)
+        self.assertEqual(self.scheduler.consecutive_errors, 0)
+
+class TestAverageTrueRange(unittest.TestCase):
+    """Test the ATR helper."""
+    
+    def test_atr_uses_gaps(self):
+        """True range includes gaps from the previous close."""
+        candles = [
+            {"high": 1.0860, "low": 1.0840, "close": 1.0850},
+            {"high": 1.0880, "low": 1.0870, "close": 1.0875},  # TR = 1.0880 - 1.0850
+        ]
+        self.assertAlmostEqual(average_true_range(candles), 0.0030)
+    
+    def test_atr_insufficient_data(self):
+        """Fewer than two candles (or an error dict) -> None."""
+        self.assertIsNone(average_true_range([]))
+        self.assertIsNone(average_true_range({"error": "Candle fetch failed"}))
+
+if __name__ == '__main__':
+    unittest.main()
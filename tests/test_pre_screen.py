@@ -0,0 +1,98 @@
+"""
+Test Suite for the Pre-Screen Gate
+Validates the deterministic checks that skip the LLM chain.
+"""
+import unittest
+import os
+import sys
+from datetime import datetime
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.nodes.pre_screen import evaluate_pre_screen, is_market_open, PreScreenStats
+from src.config import risk_config
+
+WEDNESDAY_NOON = datetime(2024, 1, 24, 12, 0)
+
+def make_state(price=1.0850, spread=0.00012, high=1.0860, low=1.0800):
+    """Minimal live-style state as produced by fetch_live_market_data."""
+    return {
+        "technical_indicators": {
+            "Current_Price": price,
+            "H1_Trend": "BULLISH",
+            "H1_Close": price,
+            "H1_High": high,
+            "H1_Low": low,
+        },
+        "risk_environment": {"Spread": spread},
+    }
+
+class TestPreScreen(unittest.TestCase):
+    """Test pre-LLM gate decisions."""
+    
+    def test_passes_tradeable_market(self):
+        """Tight spread near the H1 high during the week should pass."""
+        passed, reason = evaluate_pre_screen(make_state(), now=WEDNESDAY_NOON)
+        self.assertTrue(passed, reason)
+    
+    def test_market_hours(self):
+        """Weekend hours should be closed, weekdays open."""
+        self.assertFalse(is_market_open(datetime(2024, 1, 26, 22, 0)))  # Friday late
+        self.assertFalse(is_market_open(datetime(2024, 1, 27, 12, 0)))  # Saturday
+        self.assertFalse(is_market_open(datetime(2024, 1, 28, 20, 0)))  # Sunday before open
+        self.assertTrue(is_market_open(datetime(2024, 1, 28, 22, 0)))   # Sunday after open
+        self.assertTrue(is_market_open(WEDNESDAY_NOON))
+    
+    def test_skips_wide_spread(self):
+        """Spread above the entry limit should skip."""
+        passed, reason = evaluate_pre_screen(make_state(spread=0.0005), now=WEDNESDAY_NOON)
+        self.assertFalse(passed)
+        self.assertIn("Spread too wide", reason)
+    
+    def test_skips_far_from_levels(self):
+        """Price in the middle of a wide range should skip."""
+        state = make_state(price=1.0900, high=1.1000, low=1.0800)
+        passed, reason = evaluate_pre_screen(state, now=WEDNESDAY_NOON)
+        self.assertFalse(passed)
+        self.assertIn("from nearest level", reason)
+    
+    def test_skips_while_entry_order_rests(self):
+        """A resting LIMIT/STOP entry makes the LLM chain redundant."""
+        state = make_state()
+        state["resting_orders"] = 1
+        passed, reason = evaluate_pre_screen(state, now=WEDNESDAY_NOON)
+        self.assertFalse(passed)
+        self.assertIn("Entry order resting", reason)
+    
+    def test_skips_tick_anomaly(self):
+        """A quote flagged by the tick monitor should skip before any other check."""
+        state = make_state()
+        state["risk_environment"]["Tick_Anomaly"] = "EUR_USD tick anomaly: SPREAD_SPIKE"
+        passed, reason = evaluate_pre_screen(state, now=WEDNESDAY_NOON)
+        self.assertFalse(passed)
+        self.assertIn("Quote anomaly", reason)
+    
+    def test_skips_invalid_indicators(self):
+        """Missing indicator fields should skip via DataValidator."""
+        passed, reason = evaluate_pre_screen({"technical_indicators": {}}, now=WEDNESDAY_NOON)
+        self.assertFalse(passed)
+        self.assertIn("Indicator data invalid", reason)
+    
+    def test_stats_report_quota_saved(self):
+        """Skip rate and saved LLM calls should be tracked per day."""
+        stats = PreScreenStats()
+        stats.record(False, "Market closed (Sat 12:00 UTC)", now=WEDNESDAY_NOON)
+        stats.record(True, "Pre-screen passed", now=WEDNESDAY_NOON)
+        
+        status = stats.get_status()
+        self.assertEqual(status["skip_rate"], 50.0)
+        self.assertEqual(status["llm_calls_saved"], risk_config.LLM_CALLS_PER_CYCLE)
+        self.assertEqual(status["reasons"], {"Market closed": 1})
+        
+        # New UTC day resets the counters
+        stats.record(True, "Pre-screen passed", now=datetime(2024, 1, 25, 0, 5))
+        self.assertEqual(stats.get_status()["skipped"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Test Suite for the Prompt Codec
+Validates compact, schema-stable serialization of technical indicators.
+"""
+import unittest
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.nodes.prompt_codec import compact_indicators, format_value, estimate_tokens
+
+class TestPromptCodec(unittest.TestCase):
+    """Test compact prompt serialization."""
+    
+    def test_rounds_prices(self):
+        """Floats should be rounded to 5 decimals without trailing zeros."""
+        self.assertEqual(format_value(1.0852300000000001), "1.08523")
+        self.assertEqual(format_value(1.09), "1.09")
+        self.assertEqual(format_value(0.00001234), "0.00001")
+        self.assertEqual(format_value(28), "28")
+    
+    def test_stable_key_order(self):
+        """Output must not depend on dict insertion order."""
+        a = {"H1_Low": 1.08, "Current_Price": 1.085, "H1_Trend": "BULLISH", "Extra": 1}
+        b = {"Extra": 1, "H1_Trend": "BULLISH", "Current_Price": 1.085, "H1_Low": 1.08}
+        self.assertEqual(compact_indicators(a), compact_indicators(b))
+        self.assertTrue(compact_indicators(a).startswith("price=1.085\nh1_trend=BULLISH"))
+    
+    def test_drops_internal_keys_and_flattens(self):
+        """Mode is dropped; nested sections become dotted keys."""
+        text = compact_indicators({"Mode": "Lightweight", "15M_Technicals": {"Structure": "HH"}})
+        self.assertEqual(text, "m15.Structure=HH")
+    
+    def test_tabular_candles(self):
+        """Candle lists should be encoded as a header plus one row per candle."""
+        candles = [
+            {"time": "2024-01-26T21:00:00.000000000Z", "open": 1.0850, "high": 1.0860,
+             "low": 1.0840, "close": 1.0855, "volume": 1200},
+        ]
+        self.assertEqual(compact_indicators({"Candles": candles}),
+                         "Candles[1]:\nt,o,h,l,c\n01-26T21:00,1.085,1.086,1.084,1.0855")
+    
+    def test_smaller_than_repr(self):
+        """Compact form must be smaller than the Python repr it replaces."""
+        payload = {"Mode": "Lightweight_calculated", "H1_Trend": "BULLISH", "H1_Momentum": "UP",
+                   "Current_Price": 1.0852300000000001, "H1_Close": 1.08501,
+                   "H1_Low": 1.0801099999999999, "H1_High": 1.0903}
+        self.assertLess(estimate_tokens(compact_indicators(payload)), estimate_tokens(str(payload)))
+    
+    def test_non_dict_passthrough(self):
+        """Placeholder strings (e.g. 'No Data') are passed through unchanged."""
+        self.assertEqual(compact_indicators("No Data"), "No Data")
+    
+    def test_prompts_use_encoded_key_names(self):
+        """System prompts must describe inputs by the short keys the codec sends."""
+        from src.nodes import architect, strategist, tactical
+        from src.nodes.prompt_codec import KEY_ALIASES
+        for node in (architect, strategist, tactical):
+            for raw_key in KEY_ALIASES:
+                self.assertNotIn(raw_key, node.SYSTEM_PROMPT, f"{node.__name__} prompt names {raw_key}")
+        self.assertIn("**m15**", architect.SYSTEM_PROMPT)
+        self.assertIn("`h1_trend`", strategist.SYSTEM_PROMPT)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Test Suite for the Admin SQL Console Sandbox
+Writes must fail, results must be capped and long queries must time out.
+"""
+import unittest
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, text
+from src.database.models import Base
+from src.dashboard import query_sandbox
+
+class TestQuerySandbox(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmp.name, 'sandbox.db')}")
+        Base.metadata.create_all(self.engine)
+        with self.engine.begin() as conn:
+            for i in range(50):
+                conn.execute(text("INSERT INTO heartbeats (status, last_message) VALUES ('ALIVE', :m)"), {"m": f"beat {i}"})
+    
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp.cleanup()
+    
+    def _count(self):
+        with self.engine.connect() as conn:
+            return conn.execute(text("SELECT COUNT(*) FROM heartbeats")).scalar()
+    
+    def test_validation(self):
+        self.assertTrue(query_sandbox.validate_query("  -- note\n select 1;")[0])
+        self.assertTrue(query_sandbox.validate_query("WITH x AS (SELECT 1) SELECT * FROM x")[0])
+        self.assertFalse(query_sandbox.validate_query("DELETE FROM heartbeats")[0])
+        self.assertFalse(query_sandbox.validate_query("SELECT 1; DROP TABLE heartbeats")[0])
+        with self.assertRaises(ValueError):
+            query_sandbox.run_query(self.engine, "UPDATE heartbeats SET status = 'X'")
+    
+    def test_row_cap(self):
+        result = query_sandbox.run_query(self.engine, "SELECT id, last_message FROM heartbeats", row_limit=20)
+        self.assertEqual(result["columns"], ["id", "last_message"])
+        self.assertEqual(len(result["rows"]), 20)
+        self.assertTrue(result["truncated"])
+        full = query_sandbox.run_query(self.engine, "SELECT id FROM heartbeats", row_limit=50)
+        self.assertFalse(full["truncated"])
+    
+    def test_read_only_connection(self):
+        """A write smuggled into a SELECT-shaped statement is refused by the database."""
+        with self.assertRaises(Exception):
+            query_sandbox.run_query(self.engine, "WITH d AS (SELECT 1) DELETE FROM heartbeats")
+        self.assertEqual(self._count(), 50)
+        # The pooled connection is writable again for normal users
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM heartbeats WHERE id = 1"))
+        self.assertEqual(self._count(), 49)
+    
+    def test_timeout(self):
+        slow = ("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 100000000) "
+                "SELECT COUNT(*) FROM n")
+        with self.assertRaises(Exception):
+            query_sandbox.run_query(self.engine, slow, timeout_ms=100)
+    
+    def test_explain(self):
+        plan = query_sandbox.explain(self.engine, "SELECT * FROM heartbeats WHERE id = 3")
+        self.assertTrue(any("heartbeats" in line for line in plan))
+
+if __name__ == '__main__':
+    unittest.main()
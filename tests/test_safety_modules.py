@@ -3,6 +3,9 @@ Test Suite for Safety Modules
 Validates kill switch, circuit breaker, and data validator functionality.
 """
 import unittest
+import importlib.util
+import tempfile
+import time
 import os
 import sys
 from datetime import datetime
@@ -10,7 +13,7 @@ from datetime import datetime
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.safety.kill_switch import is_trading_enabled, enable_trading, disable_trading
+from src.safety.kill_switch import is_trading_enabled, enable_trading, disable_trading, FLAG_FILE, KillSwitch
 from src.safety.circuit_breaker import CircuitBreaker
 from src.validation.data_validator import DataValidator
 
@@ -33,14 +36,58 @@ class TestKillSwitch(unittest.TestCase):
         """Should create flag file and enable trading."""
         enable_trading()
         self.assertTrue(is_trading_enabled())
-        self.assertTrue(os.path.exists("TRADING_ENABLED.flag"))
+        self.assertTrue(os.path.exists(FLAG_FILE))
     
     def test_disable_trading(self):
         """Should remove flag file and disable trading."""
         enable_trading()
         disable_trading()
         self.assertFalse(is_trading_enabled())
-        self.assertFalse(os.path.exists("TRADING_ENABLED.flag"))
+        self.assertFalse(os.path.exists(FLAG_FILE))
+
+class TestKillSwitchWatcher(unittest.TestCase):
+    """Flag changes made by another process reach the cached flag quickly."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.flag = os.path.join(self.tmp.name, "TRADING_ENABLED.flag")
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def _wait_for(self, switch, expected, timeout=2.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline and switch.is_enabled() != expected:
+            time.sleep(0.005)
+        return switch.is_enabled() == expected
+    
+    def _check_external_flip(self, switch):
+        seen = []
+        switch.add_listener(seen.append)
+        mode = switch.start().mode
+        try:
+            self.assertFalse(switch.is_enabled())
+            with open(self.flag, "w") as f:  # Written by "another process"
+                f.write("on")
+            self.assertTrue(self._wait_for(switch, True))
+            os.remove(self.flag)
+            self.assertTrue(self._wait_for(switch, False))
+            self.assertEqual(seen, [True, False])
+        finally:
+            switch.stop()
+        return mode
+    
+    @unittest.skipUnless(importlib.util.find_spec("watchdog"), "watchdog not installed")
+    def test_notifications(self):
+        self.assertEqual(self._check_external_flip(KillSwitch(self.flag)), "NOTIFY")
+    
+    def test_polling_fallback(self):
+        switch = KillSwitch(self.flag, poll_seconds=0.02)
+        switch._start_notifications = lambda: False
+        self.assertEqual(self._check_external_flip(switch), "POLL")
+    
+    def test_flag_path_is_absolute(self):
+        self.assertTrue(os.path.isabs(FLAG_FILE))
 
 class TestCircuitBreaker(unittest.TestCase):
     """Test circuit breaker functionality."""
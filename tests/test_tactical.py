@@ -0,0 +1,37 @@
+"""
+Test Suite for the Tactical Node
+Validates how LLM decisions are passed on (no network).
+"""
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.nodes.tactical import tactical_node
+
+STATE = {"current_bias": "BULLISH", "market_structure": "BOS", "technical_indicators": {}}
+
+class TestTacticalDecision(unittest.TestCase):
+    """Test the decision timestamp on LLM responses."""
+    
+    def run_node(self, response):
+        with patch.dict(os.environ, {"GOOGLE_API_KEY": "test-key"}), \
+             patch("src.nodes.tactical.gemini_breaker.call", return_value=response):
+            return tactical_node(STATE)
+    
+    def test_wait_without_order_details(self):
+        """WAIT with a null order must not crash the node."""
+        result = self.run_node({"decision": "WAIT", "order_details": None, "reasoning": "No tap yet"})
+        self.assertEqual(result["trade_decision"], "WAIT")
+        self.assertIsNone(result["order_details"])
+    
+    def test_execute_is_timestamped(self):
+        """EXECUTE orders carry decided_at for the decision-to-submit latency."""
+        order = {"action": "BUY", "entry_price": 1.05, "stop_loss": 1.048, "take_profit": 1.055}
+        result = self.run_node({"decision": "EXECUTE", "order_details": order, "reasoning": "Tap"})
+        self.assertIn("decided_at", result["order_details"])
+
+if __name__ == '__main__':
+    unittest.main()
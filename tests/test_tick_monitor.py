@@ -0,0 +1,167 @@
+"""
+Test Suite for the Tick Monitor
+Validates the streaming stale / spread spike / jump checks on quotes.
+"""
+import unittest
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.validation.tick_monitor import (
+    TickAnomalyDetector, EwmaStats, quote_epoch, STALE, SPREAD_SPIKE, PRICE_JUMP
+)
+
+T0 = 1_706_090_400.0  # 2024-01-24 10:00:00 UTC
+
+
+def quote(mid, spread=0.00012, t=T0):
+    return {"bid": mid - spread / 2, "ask": mid + spread / 2, "timestamp": t}
+
+
+class TestTickMonitor(unittest.TestCase):
+    """Test per-instrument anomaly detection on a quote stream."""
+
+    def setUp(self):
+        self.monitor = TickAnomalyDetector(warmup_ticks=10)
+
+    def feed_normal(self, pair="EUR_USD", n=30, start=T0):
+        """Quiet market: ~0.2 pip wiggles one second apart, steady spread."""
+        mid = 1.0850
+        for i in range(n):
+            mid += 0.00002 if i % 2 else -0.00002
+            ok, msg = self.monitor.observe(pair, quote(mid, t=start + i), now=start + i)
+            self.assertTrue(ok, msg)
+        return mid, start + n
+
+    def flags(self, pair="EUR_USD"):
+        return self.monitor.get_status()[pair]["last_flags"]
+
+    def test_quote_epoch_parses_oanda_times(self):
+        """RFC3339 with nanoseconds, plain Z and numbers should all parse to UTC epoch."""
+        self.assertAlmostEqual(quote_epoch("2024-01-24T10:00:00.500000000Z"), T0 + 0.5)
+        self.assertEqual(quote_epoch("2024-01-24T10:00:00Z"), T0)
+        self.assertEqual(quote_epoch(T0), T0)
+        self.assertIsNone(quote_epoch("not a time"))
+
+    def test_ewma_tracks_mean_and_variance(self):
+        """Constant input has zero variance; a shift moves the mean."""
+        stats = EwmaStats(alpha=0.1)
+        for _ in range(50):
+            stats.update(2.0)
+        self.assertAlmostEqual(stats.mean, 2.0)
+        self.assertAlmostEqual(stats.std, 0.0)
+        stats.update(3.0)
+        self.assertAlmostEqual(stats.mean, 2.1)
+        self.assertGreater(stats.std, 0)
+
+    def test_flags_spread_spike(self):
+        """A spread several times the rolling mean should be flagged, then stats recover."""
+        mid, t = self.feed_normal()
+        ok, msg = self.monitor.observe("EUR_USD", quote(mid, spread=0.0010, t=t), now=t)
+        self.assertFalse(ok)
+        self.assertEqual(self.flags(), [SPREAD_SPIKE])
+        self.assertIn("SPREAD_SPIKE", msg)
+        # The spike was not folded into the baseline
+        self.assertAlmostEqual(self.monitor.get_status()["EUR_USD"]["spread_mean"], 0.00012, places=7)
+        ok, _ = self.monitor.observe("EUR_USD", quote(mid, t=t + 1), now=t + 1)
+        self.assertTrue(ok)
+
+    def test_flags_price_jump(self):
+        """A move far beyond recent volatility should be flagged."""
+        mid, t = self.feed_normal()
+        ok, msg = self.monitor.observe("EUR_USD", quote(mid * 1.005, t=t), now=t)
+        self.assertFalse(ok)
+        self.assertEqual(self.flags(), [PRICE_JUMP])
+
+    def test_small_moves_below_floor_pass(self):
+        """Moves under min_jump never flag, even in a dead-quiet market."""
+        mid, t = self.feed_normal()
+        ok, msg = self.monitor.observe("EUR_USD", quote(mid * 1.001, t=t), now=t)
+        self.assertTrue(ok, msg)
+
+    def test_jump_threshold_scales_with_elapsed_time(self):
+        """The same move is normal after an hour between quotes but not after a second."""
+        for gap, expected in ((3600, True), (1, False)):
+            self.monitor = TickAnomalyDetector(warmup_ticks=10, min_jump=0.0)
+            mid, t = self.feed_normal()
+            t += gap - 1
+            ok, msg = self.monitor.observe("EUR_USD", quote(mid * 1.0006, t=t), now=t)
+            self.assertEqual(ok, expected, msg)
+
+    def test_flags_stale_and_backwards_quotes(self):
+        """Old quotes and quotes older than the last one seen are stale."""
+        mid, t = self.feed_normal()
+        ok, _ = self.monitor.observe("EUR_USD", quote(mid, t=t - 300), now=t)
+        self.assertFalse(ok)
+        self.assertEqual(self.flags(), [STALE])
+        ok, _ = self.monitor.observe("EUR_USD", quote(mid, t=t - 5), now=t)
+        self.assertFalse(ok)
+        self.assertIn("backwards", self.monitor.last_verdict("EUR_USD")[1])
+
+    def test_no_flags_during_warmup(self):
+        """Spread/jump checks wait for enough history."""
+        self.monitor.observe("EUR_USD", quote(1.0850, t=T0), now=T0)
+        ok, msg = self.monitor.observe("EUR_USD", quote(1.0950, spread=0.0010, t=T0 + 1), now=T0 + 1)
+        self.assertTrue(ok, msg)
+
+    def test_seed_enables_jump_check_immediately(self):
+        """Candle closes warm the volatility estimate so the first ticks are checked."""
+        closes = [1.0850 + (0.0002 if i % 2 else 0.0) for i in range(20)]
+        self.monitor.seed_returns("EUR_USD", closes, interval_seconds=300)
+        self.monitor.observe("EUR_USD", quote(1.0850, t=T0), now=T0)
+        ok, _ = self.monitor.observe("EUR_USD", quote(1.0950, t=T0 + 900), now=T0 + 900)
+        self.assertFalse(ok)
+        self.assertEqual(self.flags(), [PRICE_JUMP])
+
+    def test_instruments_are_independent(self):
+        """JPY-scale quotes don't disturb EUR_USD statistics."""
+        self.feed_normal("EUR_USD")
+        for i in range(30):
+            self.monitor.observe("USD_JPY", quote(148.50, spread=0.015, t=T0 + i), now=T0 + i)
+        status = self.monitor.get_status()
+        self.assertAlmostEqual(status["EUR_USD"]["spread_mean"], 0.00012, places=7)
+        self.assertAlmostEqual(status["USD_JPY"]["spread_mean"], 0.015, places=5)
+        self.assertEqual(self.monitor.last_verdict("GBP_USD"), (True, "No ticks yet"))
+
+    def test_rejects_unusable_quote(self):
+        """Missing/zero prices are reported without touching the stats."""
+        ok, msg = self.monitor.observe("EUR_USD", {"bid": 0, "ask": 1.0851})
+        self.assertFalse(ok)
+        self.assertNotIn("EUR_USD", self.monitor.get_status())
+
+
+class TestCycleSeeding(unittest.TestCase):
+    """fetch_live_market_data seeds the monitor from the cycle's M5 candles."""
+    
+    def cycle(self, m5):
+        candles = [{"time": f"2024-01-24T{h:02d}:00:00Z", "open": 1.085, "high": 1.086, "low": 1.084,
+                    "close": 1.0855} for h in range(20)]
+        price = {"bid": 1.0850, "ask": 1.0851, "timestamp": T0}
+        client = SimpleNamespace(get_cycle_data=lambda *a, **k: {
+            "price": price, "candles": {"H1": candles, "M15": candles, "M5": m5}})
+        return patch("src.main.get_oanda_client", return_value=client)
+    
+    def test_failed_m5_fetch_does_not_crash_seeding(self):
+        """An {"error": ...} M5 result is a clean validation error, not a TypeError while seeding."""
+        from src import main
+        with self.cycle({"error": "Candle fetch failed"}), \
+                patch.object(main, "tick_monitor", TickAnomalyDetector()) as monitor:
+            with self.assertRaises(ValueError):
+                main.fetch_live_market_data()
+            self.assertEqual(monitor.get_status(), {})
+    
+    def test_valid_m5_candles_seed_volatility(self):
+        from src import main
+        m5 = [{"time": f"2024-01-24T09:{m:02d}:00Z", "open": 1.085, "high": 1.086, "low": 1.084,
+               "close": 1.085 + (0.0002 if m % 10 else 0.0)} for m in range(0, 60, 5)]
+        with self.cycle(m5), patch.object(main, "tick_monitor", TickAnomalyDetector()) as monitor:
+            state = main.fetch_live_market_data()
+            self.assertGreater(monitor.get_status()["EUR_USD"]["vol_per_sqrt_second"], 0)
+        self.assertIsNone(state["risk_environment"]["Tick_Anomaly"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Test Suite for the Trade History Browser
+Checks keyset pagination against a plain sorted list and the chunked exports.
+"""
+import unittest
+import os
+import sys
+import io
+import csv
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+from src.database.models import Trade, Base
+from src.dashboard import trade_history
+
+class TestTradeHistory(unittest.TestCase):
+    """Pages must tile the filtered result exactly, newest first."""
+    
+    def setUp(self):
+        self.engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        start = datetime(2024, 1, 1)
+        for i in range(230):
+            # Pairs of rows share a timestamp so ties must be broken by id
+            self.db.add(Trade(timestamp=start + timedelta(hours=i // 2), pair="EUR_USD" if i % 3 else "GBP_USD",
+                              action=["BUY", "SELL", "WAIT"][i % 3], entry_price=1.085, stop_loss=1.083,
+                              take_profit=1.089, lot_size=0.1, status="CLOSED" if i % 4 else "OPEN",
+                              pnl=float(i % 7 - 3), reasoning_trace=["step a", "step b"]))
+        self.db.commit()
+    
+    def tearDown(self):
+        self.db.close()
+    
+    def _expected(self, **where):
+        trades = [t for t in self.db.query(Trade).all() if all(getattr(t, k) == v for k, v in where.items())]
+        return [t.id for t in sorted(trades, key=lambda t: (t.timestamp, t.id), reverse=True)]
+    
+    def _walk(self, page_size, **filters):
+        ids, cursor = [], None
+        while True:
+            rows, cursor = trade_history.trade_page(self.db, cursor, page_size, **filters)
+            self.assertLessEqual(len(rows), page_size)
+            ids.extend(r.id for r in rows)
+            if cursor is None:
+                return ids
+    
+    def test_pages_tile_result(self):
+        """No duplicates or gaps across pages, including timestamp ties."""
+        self.assertEqual(self._walk(17), self._expected())
+        self.assertEqual(self._walk(230), self._expected())
+    
+    def test_filters(self):
+        self.assertEqual(self._walk(20, pair="GBP_USD", status="OPEN"),
+                         self._expected(pair="GBP_USD", status="OPEN"))
+        start, end = datetime(2024, 1, 2), datetime(2024, 1, 3)
+        ids = self._walk(20, start=start, end=end)
+        self.assertEqual(len(ids), 48)  # 24 hours x 2 rows
+    
+    def test_csv_export(self):
+        out = io.StringIO()
+        count = trade_history.write_csv(self.db, out, action="BUY")
+        rows = list(csv.reader(io.StringIO(out.getvalue())))
+        self.assertEqual(rows[0], list(trade_history.HISTORY_COLUMNS))
+        self.assertEqual(count, len(rows) - 1)
+        self.assertEqual([int(r[0]) for r in rows[1:]], self._expected(action="BUY"))
+        self.assertEqual(rows[1][-1], "step a > step b")
+    
+    def test_export_is_chunked(self):
+        chunks = list(trade_history.iter_trade_chunks(self.db, chunk_size=50))
+        self.assertEqual([len(c) for c in chunks], [50, 50, 50, 50, 30])
+    
+    def test_export_row_limit(self):
+        """Exports stop at max_rows, keeping the newest rows."""
+        chunks = list(trade_history.iter_trade_chunks(self.db, chunk_size=50, max_rows=120))
+        self.assertEqual([len(c) for c in chunks], [50, 50, 20])
+        with trade_history.export_file(self.db, "csv", max_rows=30, action="SELL") as export:
+            rows = list(csv.reader(io.TextIOWrapper(export, encoding="utf-8", newline="")))
+        self.assertEqual([int(r[0]) for r in rows[1:]], self._expected(action="SELL")[:30])
+    
+    def test_parquet_export(self):
+        import pyarrow.parquet as pq
+        export = trade_history.export_file(self.db, "parquet", status="OPEN")
+        table = pq.read_table(export)
+        self.assertEqual(table.column("id").to_pylist(), self._expected(status="OPEN"))
+    
+    def test_keyset_index_exists(self):
+        names = {ix["name"] for ix in inspect(self.engine).get_indexes("trades")}
+        self.assertIn("ix_trades_timestamp_id", names)
+
+if __name__ == '__main__':
+    unittest.main()
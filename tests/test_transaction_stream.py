@@ -0,0 +1,138 @@
+"""
+Test Suite for the Transaction Stream Exit Tracker
+Replays recorded v20 transactions offline against an in-memory database.
+"""
+import unittest
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.database.models import Trade, Base
+from src.monitoring.transaction_stream import TransactionExitTracker, ReplayTransactionStream
+
+REPLAY_FILE = os.path.join(os.path.dirname(__file__), "fixtures", "transactions_replay.jsonl")
+
+class TestTransactionExitTracker(unittest.TestCase):
+    """Test event-driven exit updates."""
+    
+    def setUp(self):
+        """Fresh in-memory database with two open trades linked to OANDA trade IDs."""
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        self.Session = sessionmaker(bind=engine)
+        
+        db = self.Session()
+        db.add_all([
+            Trade(pair="EUR_USD", action="BUY", entry_price=1.0850, stop_loss=1.0830,
+                  take_profit=1.0870, lot_size=0.1, status="OPEN", oanda_trade_id="6002"),
+            Trade(pair="EUR_USD", action="SELL", entry_price=1.0635, stop_loss=1.0650,
+                  take_profit=1.0605, lot_size=0.1, status="OPEN", oanda_trade_id="6003"),
+        ])
+        db.commit()
+        db.close()
+        
+        self.tracker = TransactionExitTracker(session_factory=self.Session)
+    
+    def test_replay_closes_trades_with_actual_fills(self):
+        """TP and SL fills should close the matching rows with broker prices and P&L."""
+        self.tracker.consume(ReplayTransactionStream(REPLAY_FILE))
+        
+        db = self.Session()
+        tp_trade = db.query(Trade).filter(Trade.oanda_trade_id == "6002").one()
+        sl_trade = db.query(Trade).filter(Trade.oanda_trade_id == "6003").one()
+        db.close()
+        
+        self.assertEqual(tp_trade.status, "CLOSED")
+        self.assertAlmostEqual(tp_trade.exit_price, 1.0870)
+        self.assertAlmostEqual(tp_trade.pnl, 20.0)
+        self.assertEqual(tp_trade.exit_reason, "TAKE_PROFIT_ORDER")
+        
+        self.assertEqual(sl_trade.status, "CLOSED")
+        self.assertAlmostEqual(sl_trade.pnl, -15.0)
+        self.assertEqual(sl_trade.exit_reason, "STOP_LOSS_ORDER")
+        
+        status = self.tracker.get_status()
+        self.assertEqual(status["trades_closed"], 2)
+        self.assertEqual(status["last_transaction_id"], "6012")
+    
+    def test_partial_close_keeps_trade_open(self):
+        """A tradeReduced fill books P&L but leaves the row OPEN."""
+        self.tracker.handle_transaction({
+            "id": "7000", "type": "ORDER_FILL", "reason": "MARKET_ORDER", "price": "1.0860",
+            "tradeReduced": {"tradeID": "6002", "units": "-5000", "realizedPL": "5.0"}
+        })
+        
+        db = self.Session()
+        trade = db.query(Trade).filter(Trade.oanda_trade_id == "6002").one()
+        db.close()
+        self.assertEqual(trade.status, "OPEN")
+        self.assertAlmostEqual(trade.pnl, 5.0)
+    
+    def test_resting_entry_fill_and_expiry(self):
+        """ORDER_FILL opening a trade for a PENDING row marks it OPEN; ORDER_CANCEL expires another."""
+        db = self.Session()
+        db.add_all([
+            Trade(pair="EUR_USD", action="BUY", entry_price=1.0830, stop_loss=1.0810, take_profit=1.0870,
+                  lot_size=0.1, status="PENDING", client_order_id="fa-limit-1", requested_price=1.0830),
+            Trade(pair="EUR_USD", action="SELL", entry_price=1.0900, stop_loss=1.0920, take_profit=1.0860,
+                  lot_size=0.1, status="PENDING", client_order_id="fa-limit-2", requested_price=1.0900),
+        ])
+        db.commit()
+        db.close()
+        
+        self.tracker.handle_transaction({
+            "id": "7100", "type": "ORDER_FILL", "reason": "LIMIT_ORDER", "price": "1.08298",
+            "clientOrderID": "fa-limit-1", "tradeOpened": {"tradeID": "6100", "units": "10000"}
+        })
+        self.tracker.handle_transaction({
+            "id": "7101", "type": "ORDER_CANCEL", "reason": "TIME_IN_FORCE_EXPIRED", "clientOrderID": "fa-limit-2"
+        })
+        
+        db = self.Session()
+        filled = db.query(Trade).filter(Trade.client_order_id == "fa-limit-1").one()
+        expired = db.query(Trade).filter(Trade.client_order_id == "fa-limit-2").one()
+        db.close()
+        self.assertEqual((filled.status, filled.oanda_trade_id), ("OPEN", "6100"))
+        self.assertAlmostEqual(filled.slippage_pips, -0.2)
+        self.assertEqual((expired.status, expired.exit_reason), ("CANCELLED", "TIME_IN_FORCE_EXPIRED"))
+        self.assertEqual(self.tracker.get_status()["entries_filled"], 1)
+    
+    def test_entry_fill_that_also_closes_opposite_trade(self):
+        """A resting SELL entry filling against open BUY #6002 opens one row and closes the other."""
+        db = self.Session()
+        db.add(Trade(pair="EUR_USD", action="SELL", entry_price=1.0900, stop_loss=1.0920, take_profit=1.0860,
+                     lot_size=0.2, status="PENDING", client_order_id="fa-limit-3", requested_price=1.0900))
+        db.commit()
+        db.close()
+        
+        updated = self.tracker.handle_transaction({
+            "id": "7200", "type": "ORDER_FILL", "reason": "LIMIT_ORDER", "price": "1.0900",
+            "clientOrderID": "fa-limit-3", "tradeOpened": {"tradeID": "6200", "units": "-10000"},
+            "tradesClosed": [{"tradeID": "6002", "price": "1.0900", "realizedPL": "50.0"}]
+        })
+        
+        db = self.Session()
+        entry = db.query(Trade).filter(Trade.client_order_id == "fa-limit-3").one()
+        closed = db.query(Trade).filter(Trade.oanda_trade_id == "6002").one()
+        db.close()
+        self.assertEqual((entry.status, entry.oanda_trade_id), ("OPEN", "6200"))
+        self.assertEqual(closed.status, "CLOSED")
+        self.assertAlmostEqual(closed.pnl, 50.0)
+        self.assertCountEqual(updated, [entry.id, closed.id])
+        status = self.tracker.get_status()
+        self.assertEqual((status["entries_filled"], status["trades_closed"]), (1, 1))
+    
+    def test_ignores_unrelated_transactions(self):
+        """Fills for unknown trades and non-fill transactions change nothing."""
+        updated = self.tracker.handle_transaction({
+            "id": "7001", "type": "ORDER_FILL", "reason": "STOP_LOSS_ORDER",
+            "tradesClosed": [{"tradeID": "9999", "price": "1.0", "realizedPL": "1.0"}]
+        })
+        self.assertEqual(updated, [])
+        self.assertEqual(self.tracker.handle_transaction({"id": "7002", "type": "DAILY_FINANCING"}), [])
+
+if __name__ == '__main__':
+    unittest.main()